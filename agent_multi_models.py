@@ -8,41 +8,39 @@
 # 4. Estimation du temps avant analyse
 # ===============================================================
 
-import os, re, time
-from typing import Optional, List, Dict
+import os, sys, time
+from typing import List, Dict
 from datetime import datetime
 
+from analyseur.latex import Section
+from analyseur.manuscrit import Manuscrit, charger_manuscrit
+from analyseur.rapport_latex import RapportLatex
+from analyseur.logger import Logger
+from analyseur.estimation import HistoriqueAppels
+from analyseur.progression import Progression
+from analyseur.echeance import Echeance
+from analyseur.fournisseurs import Fournisseurs
+# Agents : prompts, budgets de sortie, reprises, continuations et basculement communs à v3.2
+from analyseur.pipeline import (Statistiques, agent_scientifique, agent_style, agent_plan, agent_synthese,
+                                planifier_appels)
+
 # ===============================================================
 # CONFIGURATION DES APIS
 # ===============================================================
 
-# Configuration OpenAI
-try:
-    from openai import OpenAI, APIError, APITimeoutError
-    openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    OPENAI_AVAILABLE = True
-except Exception as e:
-    print(f"⚠️ OpenAI non disponible : {e}")
-    OPENAI_AVAILABLE = False
-
-# Configuration Anthropic (Claude)
-try:
-    import anthropic
-    claude_client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-    CLAUDE_AVAILABLE = True
-except Exception as e:
-    print(f"⚠️ Claude non disponible : {e}")
-    CLAUDE_AVAILABLE = False
+# Clients construits au premier appel : importer ce script ne contacte aucune API.
+# Les SDK ne refont aucune tentative : safe_call_unified gère reprises et délais d'appel
+MODELES_V21 = {"claude": "claude-sonnet-4-20250514", "openai": "gpt-4o", "gemini": "gemini-1.5-pro"}
+fournisseurs = Fournisseurs(modeles_gemini=(MODELES_V21["gemini"],), modeles=MODELES_V21)
 
-# Configuration Google Gemini
-try:
-    import google.generativeai as genai
-    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-    gemini_model = genai.GenerativeModel('gemini-1.5-pro')
-    GEMINI_AVAILABLE = True
-except Exception as e:
-    print(f"⚠️ Gemini non disponible : {e}")
-    GEMINI_AVAILABLE = False
+def echeance_option() -> Echeance:
+    """Échéance donnée par '--deadline HH:MM|+45m|...' (aucune par défaut)"""
+    for i, arg in enumerate(sys.argv):
+        if arg.startswith("--deadline="):
+            return Echeance.parser(arg.split("=", 1)[1])
+        if arg == "--deadline" and i + 1 < len(sys.argv):
+            return Echeance.parser(sys.argv[i + 1])
+    return Echeance(None)
 
 # ===============================================================
 # MODES D'ANALYSE
@@ -101,6 +99,11 @@ class ModeAnalyse:
             return ModeAnalyse.DETAILLE
         else:
             return ModeAnalyse.NORMAL
+    
+    @staticmethod
+    def sections_retenues(manuscrit: Manuscrit, mode: Dict) -> List[Section]:
+        """Sections du mode ayant au moins min_mots mots (lecture de l'index, sans re-analyse)"""
+        return manuscrit.sections(mode, imbrique=True)
 
 # ===============================================================
 # CONFIGURATION DES MODÈLES PAR TÂCHE
@@ -223,273 +226,25 @@ class GestionnaireDossiers:
             f.write(f"\nMot minimum par section : {mode['min_mots']}\n")
             f.write("\n" + "="*60 + "\n")
 
-# ===============================================================
-# WRAPPER UNIFIÉ POUR LES 3 APIS
-# ===============================================================
-
-def safe_call_unified(system_prompt: str, user_prompt: str, temperature: float = 0.3, model: str = "claude") -> Optional[str]:
-    """Appel unifié pour Claude, Gemini ou OpenAI avec retry"""
-    
-    for attempt in range(3):
-        try:
-            if model == "claude" and CLAUDE_AVAILABLE:
-                response = claude_client.messages.create(
-                    model="claude-sonnet-4-20250514",
-                    max_tokens=4000,
-                    temperature=temperature,
-                    system=system_prompt,
-                    messages=[{"role": "user", "content": user_prompt}]
-                )
-                return response.content[0].text
-            
-            elif model == "gemini" and GEMINI_AVAILABLE:
-                full_prompt = f"{system_prompt}\n\n{user_prompt}"
-                response = gemini_model.generate_content(
-                    full_prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=temperature,
-                        max_output_tokens=4000
-                    )
-                )
-                return response.text
-            
-            elif model == "openai" and OPENAI_AVAILABLE:
-                response = openai_client.chat.completions.create(
-                    model="gpt-4o",
-                    temperature=temperature,
-                    max_tokens=4000,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ]
-                )
-                return response.choices[0].message.content
-            
-            else:
-                print(f"❌ Modèle '{model}' non disponible ou non configuré.")
-                return None
-                
-        except Exception as e:
-            print(f"⚠️ Tentative {attempt+1}/3 échouée ({type(e).__name__}): {str(e)[:100]}")
-            time.sleep(5)
-    
-    print("❌ Abandon après 3 tentatives.")
-    return None
-
-# ===============================================================
-# AGENTS SPÉCIALISÉS
-# ===============================================================
-
-def agent_scientifique(section_text: str, model: str = "claude") -> str:
-    """Agent 1️⃣ — Analyse scientifique et mathématique"""
-    system = "Tu es un expert en mathématiques appliquées et modélisation numérique."
-    prompt = f"""
-Analyse scientifique d'un mémoire en mathématiques appliquées :
-- Vérifie la cohérence théorique et la rigueur mathématique.
-- Identifie les erreurs symboliques, incohérences, omissions.
-- Suggère des améliorations précises et reformulations.
-
-Texte :
-{section_text[:4000]}
-"""
-    result = safe_call_unified(system, prompt, temperature=0.2, model=model)
-    return result or "Analyse scientifique non disponible."
-
-def agent_style(section_text: str, model: str = "gemini") -> str:
-    """Agent 2️⃣ — Style académique et rédactionnel"""
-    system = "Tu es un relecteur académique spécialisé dans la rédaction scientifique."
-    prompt = f"""
-Améliore le style académique du texte suivant :
-- Corrige grammaire, syntaxe, ponctuation et style scientifique.
-- Supprime les redondances et lourdeurs.
-- Clarifie les phrases trop longues.
-
-Texte :
-{section_text[:4000]}
-"""
-    result = safe_call_unified(system, prompt, temperature=0.4, model=model)
-    return result or "Amélioration stylistique non disponible."
-
-def agent_plan(plan_text: str, model: str = "claude") -> str:
-    """Agent 3️⃣ — Structure et organisation du document"""
-    system = "Tu es un rapporteur de thèse spécialisé dans la structuration académique."
-    prompt = f"""
-Analyse la structure du mémoire :
-- Détecte les redondances entre sections.
-- Propose un plan restructuré complet (chapitres, sections, sous-sections).
-- Indique les fusions, suppressions et intégrations à prévoir.
-- Suggère un nombre de pages par section.
-
-Plan détecté :
-{plan_text[:4000]}
-"""
-    result = safe_call_unified(system, prompt, temperature=0.3, model=model)
-    return result or "Analyse du plan non disponible."
-
-def agent_synthese(chapitre: str, analyses: list, model: str = "claude") -> str:
-    """Agent 4️⃣ — Synthèse globale par chapitre"""
-    system = "Tu es un examinateur scientifique rédigeant un rapport de synthèse."
-    joined = "\n\n".join(analyses)
-    prompt = f"""
-Rédige une synthèse critique complète du chapitre intitulé « {chapitre} » :
-- Résume les points forts et faiblesses scientifiques et rédactionnels.
-- Intègre les remarques de fond, de forme et de structure.
-- Propose des reformulations et des suggestions concrètes.
-- Présente le tout en paragraphes structurés et fluides (2 à 3 pages équivalentes).
-
-Analyses des agents précédents :
-{joined[:8000]}
-"""
-    result = safe_call_unified(system, prompt, temperature=0.4, model=model)
-    return result or "Synthèse non disponible."
-
 # ===============================================================
 # UTILITAIRES LATEX - VERSION AMÉLIORÉE
 # ===============================================================
 
-def lire_latex(fichier: str) -> str:
-    """Lit un fichier LaTeX"""
-    with open(fichier, "r", encoding="utf-8") as f:
-        return f.read()
-
-def compter_mots(texte: str) -> int:
-    """Compte le nombre de mots dans un texte"""
-    # Enlève les commandes LaTeX pour un compte plus précis
-    texte_nettoye = re.sub(r'\\[a-zA-Z]+\{[^}]*\}', '', texte)
-    texte_nettoye = re.sub(r'\\[a-zA-Z]+', '', texte_nettoye)
-    mots = texte_nettoye.split()
-    return len(mots)
-
-def extraire_chapitres_optimise(contenu: str, mode: Dict) -> List[Dict]:
-    """
-    Extrait les chapitres/sections selon le mode choisi
-    Groupe les sous-sections avec leur section parente
-    """
-    # Extraction de toutes les structures
-    pattern = re.compile(r'\\(chapter|section|subsection)\{([^}]*)\}')
-    positions = [(m.start(), m.group(1), m.group(2)) for m in pattern.finditer(contenu)]
-    
-    niveaux_autorises = mode['niveaux']
-    min_mots = mode['min_mots']
-    
-    chapitres = []
-    
-    i = 0
-    while i < len(positions):
-        pos, niveau, titre = positions[i]
-        
-        # Si ce niveau n'est pas autorisé, on skip
-        if niveau not in niveaux_autorises:
-            i += 1
-            continue
-        
-        # Trouver la fin de cette section
-        start = pos
-        end = len(contenu)
-        
-        # Chercher la prochaine section de même niveau ou supérieur
-        for j in range(i + 1, len(positions)):
-            next_pos, next_niveau, _ = positions[j]
-            
-            # Hiérarchie : chapter > section > subsection
-            niveau_hierarchie = {"chapter": 1, "section": 2, "subsection": 3}
-            
-            if niveau_hierarchie[next_niveau] <= niveau_hierarchie[niveau]:
-                end = next_pos
-                break
-        
-        texte = contenu[start:end]
-        nb_mots = compter_mots(texte)
-        
-        # Filtrer les sections trop petites
-        if nb_mots >= min_mots:
-            chapitres.append({
-                "type": niveau,
-                "titre": titre.strip(),
-                "texte": texte,
-                "nb_mots": nb_mots
-            })
-        
-        i += 1
-    
-    return chapitres
-
-def estimer_duree(nb_sections: int, config: ConfigModeles) -> str:
+def estimer_duree(chapitres: List[Section], config: ConfigModeles) -> str:
     """Estime la durée de l'analyse"""
-    # Estimation: ~1-2 min par section en moyenne
-    duree_min = nb_sections * 1
-    duree_max = nb_sections * 2
+    # Estimation: ~40-80 s de base par section, plus le temps lié au volume
+    # (texte tronqué à ~600 mots par agent) ; nb_mots vient de l'index des mots
+    secondes = sum(40 + 0.1 * min(ch.nb_mots, 600) for ch in chapitres)
+    duree_min = round(secondes / 60)
+    duree_max = round(2 * secondes / 60)
     return f"{duree_min}-{duree_max} minutes"
 
-def ecrire_rapport_latex(chapitres: list, syntheses: list, plan_restructure: str, 
-                         dossiers: GestionnaireDossiers, config: ConfigModeles, mode: Dict):
-    """Génère le rapport final en LaTeX"""
-    chemin_rapport = dossiers.chemin_rapport(config)
-    
-    with open(chemin_rapport, "w", encoding="utf-8") as f:
-        f.write(r"""\documentclass[12pt,a4paper]{report}
-\usepackage[utf8]{inputenc}
-\usepackage[french]{babel}
-\usepackage{geometry}
-\usepackage{xcolor}
-\geometry{margin=2.5cm}
-\begin{document}
-\title{Rapport d'analyse multi-agent}
-\author{Généré par IA multi-modèles}
-\date{\today}
-\maketitle
-
-\section*{Configuration utilisée}
-""")
-        f.write(f"Mode d'analyse : {mode['nom']}\n\n")
-        f.write("Modèles IA par tâche :\n\\begin{itemize}\n")
-        for tache, modele in config.modeles.items():
-            f.write(f"\\item {tache.capitalize()} : {modele.upper()}\n")
-        f.write("\\end{itemize}\n\n")
-        
-        f.write(r"\tableofcontents" + "\n\\newpage\n")
-        f.write(r"\chapter*{Rapport global d'analyse du mémoire}" + "\n")
-        
-        for ch, syn in zip(chapitres, syntheses):
-            f.write(f"\\section*{{{ch['titre']} ({ch['nb_mots']} mots)}}\n")
-            texte_escape = syn.replace("_", "\\_").replace("%", "\\%").replace("&", "\\&").replace("#", "\\#")
-            f.write(texte_escape + "\n\n")
-        
-        f.write(r"\chapter*{Proposition de plan restructuré}" + "\n")
-        plan_escape = plan_restructure.replace("_", "\\_").replace("%", "\\%").replace("&", "\\&").replace("#", "\\#")
-        f.write(plan_escape + "\n\n")
-        f.write(r"\end{document}")
-    
-    print(f"✅ Rapport LaTeX : {chemin_rapport}")
-
-# ===============================================================
-# LOGGER
-# ===============================================================
-
-class Logger:
-    """Enregistre les étapes de l'analyse"""
-    
-    def __init__(self, chemin: str):
-        self.chemin = chemin
-        self.debut = time.time()
-        with open(self.chemin, "w", encoding="utf-8") as f:
-            f.write("="*60 + "\n")
-            f.write("LOG D'ANALYSE MULTI-AGENT\n")
-            f.write("="*60 + "\n\n")
-            f.write(f"Début : {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-    
-    def log(self, message: str):
-        """Ajoute une entrée au log"""
-        with open(self.chemin, "a", encoding="utf-8") as f:
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            f.write(f"[{timestamp}] {message}\n")
-    
-    def fin(self):
-        """Marque la fin de l'analyse"""
-        duree = time.time() - self.debut
-        with open(self.chemin, "a", encoding="utf-8") as f:
-            f.write(f"\nFin : {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Durée totale : {duree:.1f} secondes ({duree/60:.1f} minutes)\n")
+def ouvrir_rapport_latex(dossiers: GestionnaireDossiers, config: ConfigModeles, mode: Dict) -> RapportLatex:
+    """Crée le rapport LaTeX ; les synthèses y sont ajoutées au fil de l'analyse"""
+    rapport = RapportLatex(dossiers.chemin_rapport(config))
+    rapport.configuration(mode['nom'], config.modeles)
+    rapport.partie("Rapport global d'analyse du mémoire")
+    return rapport
 
 # ===============================================================
 # ORCHESTRATION PRINCIPALE
@@ -504,6 +259,14 @@ if __name__ == "__main__":
     print("  • Groupement par chapitre")
     print("  • Filtrage sections courtes")
     print("  • Estimation du temps")
+    for nom, dispo in fournisseurs.disponibilites().items():
+        if not dispo:
+            print(f"⚠️ {nom} non disponible : {fournisseurs.erreurs.get(nom)}")
+    
+    # Chaque appel est borné par delai_appel(fournisseur, tâche, échéance)
+    echeance = echeance_option()
+    if echeance.active():
+        print(f"⏰ Échéance : {echeance}")
     
     # Choix du mode d'analyse
     mode = ModeAnalyse.choisir_mode()
@@ -521,23 +284,32 @@ if __name__ == "__main__":
         print(f"❌ Fichier '{fichier}' introuvable.")
         exit(1)
     
-    # Extraction optimisée
-    contenu = lire_latex(fichier)
-    chapitres = extraire_chapitres_optimise(contenu, mode)
-    
-    # Affichage du résumé
-    print(f"\n📊 Résumé de l'analyse :")
-    print(f"   • Mode : {mode['nom']}")
-    print(f"   • Sections à analyser : {len(chapitres)}")
-    total_mots = sum(ch['nb_mots'] for ch in chapitres)
-    print(f"   • Mots totaux : {total_mots:,}")
-    print(f"   • Durée estimée : {estimer_duree(len(chapitres), config)}")
+    # Extraction optimisée : une seule analyse du source, puis lecture de l'index
+    manuscrit = charger_manuscrit(fichier)
+    if manuscrit.manquants:
+        print(f"⚠️ Fichiers inclus introuvables : {', '.join(manuscrit.manquants)}")
     
-    # Confirmation
-    continuer = input("\nContinuer avec cette analyse ? [O/n] : ").strip().lower()
-    if continuer in ['n', 'non', 'no']:
-        print("❌ Analyse annulée.")
-        exit(0)
+    while True:
+        chapitres = ModeAnalyse.sections_retenues(manuscrit, mode)
+        
+        # Affichage du résumé
+        print(f"\n📊 Résumé de l'analyse :")
+        print(f"   • Mode : {mode['nom']}")
+        print(f"   • Fichiers sources : {len(manuscrit.fichiers)}")
+        print(f"   • Sections à analyser : {len(chapitres)}")
+        total_mots = sum(ch.nb_mots for ch in chapitres)
+        print(f"   • Mots totaux : {total_mots:,}")
+        print(f"   • Durée estimée : {estimer_duree(chapitres, config)}")
+        
+        # Confirmation (ou changement de mode, sans relire le document)
+        continuer = input("\nContinuer avec cette analyse ? [O/n/m=changer de mode] : ").strip().lower()
+        if continuer in ['m', 'mode']:
+            mode = ModeAnalyse.choisir_mode()
+            continue
+        if continuer in ['n', 'non', 'no']:
+            print("❌ Analyse annulée.")
+            exit(0)
+        break
     
     # Création de la structure de dossiers
     dossiers = GestionnaireDossiers(fichier, mode)
@@ -548,37 +320,60 @@ if __name__ == "__main__":
     logger.log(f"Analyse du fichier : {fichier}")
     logger.log(f"Mode : {mode['nom']}, {len(chapitres)} sections")
     
+    # Appels journalisés (jetons, durées) ; l'historique calibre les estimations suivantes
+    historique = HistoriqueAppels()
+    stats = Statistiques(os.path.join(dossiers.dossier_logs, "appels.jsonl"), historique=historique)
+    
     # Analyse du plan global
     print("\n🧭 Génération du plan restructuré global...")
-    plan_text = "\n".join([f"{c['type']}: {c['titre']} ({c['nb_mots']} mots)" for c in chapitres])
+    plan_text = "\n".join([f"{c.type}: {c.titre} ({c.nb_mots} mots)" for c in chapitres])
     logger.log(f"Analyse du plan avec {config.modeles['plan'].upper()}")
-    plan_restructure = agent_plan(plan_text, model=config.modeles['plan'])
+    plan_restructure = agent_plan(plan_text, model=config.modeles['plan'], stats=stats, mode=mode,
+                                  echeance=echeance, fournisseurs=fournisseurs)
     
-    # Analyse chapitre par chapitre
-    syntheses = []
+    # Analyse chapitre par chapitre, chaque synthèse rejoint aussitôt le rapport LaTeX
+    rapport = ouvrir_rapport_latex(dossiers, config, mode)
+    print(f"📝 Rapport LaTeX (compilable en cours de route) : {rapport.chemin}")
     temps_debut_analyse = time.time()
     
+    # Temps restant : max_tokens réellement demandés par chaque appel prévu (texte entier, non
+    # compacté, comme envoyé ici), durée par jeton corrigée par les jetons_sortie de chaque appel
+    travaux = [[] for _ in chapitres]
+    for appel in planifier_appels(chapitres, config.modeles, mode, historique, compaction=False):
+        travaux[appel["indice"]].append(appel)
+    progression = stats.progression = Progression(travaux, historique)
+    
+    def appel_mesure(indice: int, tache: str, agent, *args, **kwargs) -> str:
+        resultat = agent(*args, stats=stats, **kwargs)
+        progression.terminer(indice, tache)
+        return resultat
+    
     for i, ch in enumerate(chapitres, 1):
         temps_debut_section = time.time()
-        print(f"\n🔎 Analyse {i}/{len(chapitres)} : {ch['titre'][:60]}... ({ch['nb_mots']} mots)")
-        logger.log(f"Début analyse chapitre {i}: {ch['titre']}")
+        print(f"\n🔎 Analyse {i}/{len(chapitres)} : {ch.titre[:60]}... ({ch.nb_mots} mots)")
+        logger.log(f"Début analyse chapitre {i}: {ch.titre}")
         
         print(f"   → Agent scientifique ({config.modeles['scientifique'].upper()})...")
-        sci = agent_scientifique(ch["texte"], model=config.modeles['scientifique'])
+        texte = ch.texte
+        sci = appel_mesure(i - 1, "scientifique", agent_scientifique, texte, model=config.modeles['scientifique'],
+                           mode=mode, nb_mots=ch.nb_mots, echeance=echeance, fournisseurs=fournisseurs)
         
         print(f"   → Agent stylistique ({config.modeles['style'].upper()})...")
-        sty = agent_style(ch["texte"], model=config.modeles['style'])
+        sty = appel_mesure(i - 1, "style", agent_style, texte, model=config.modeles['style'], mode=mode,
+                           nb_mots=ch.nb_mots, echeance=echeance, fournisseurs=fournisseurs)
         
         print(f"   → Synthèse finale ({config.modeles['synthese'].upper()})...")
-        syn = agent_synthese(ch["titre"], [sci, sty], model=config.modeles['synthese'])
-        syntheses.append(syn)
+        syn = appel_mesure(i - 1, "synthese", agent_synthese, ch.titre, [sci, sty],
+                           model=config.modeles['synthese'], mode=mode, echeance=echeance,
+                           fournisseurs=fournisseurs)
+        rapport.section(f"{ch.titre} ({ch.nb_mots} mots)", syn)
         
         # Sauvegarde individuelle
         chemin_synthese = dossiers.chemin_synthese(i, config)
         with open(chemin_synthese, "w", encoding="utf-8") as f:
             f.write(f"{'='*60}\n")
-            f.write(f"CHAPITRE {i} : {ch['titre']}\n")
-            f.write(f"Type : {ch['type']} | Mots : {ch['nb_mots']}\n")
+            f.write(f"CHAPITRE {i} : {ch.titre}\n")
+            f.write(f"Type : {ch.type} | Mots : {ch.nb_mots} | Fichier : {os.path.basename(ch.fichier)}\n")
             f.write(f"{'='*60}\n\n")
             f.write(f"--- ANALYSE SCIENTIFIQUE ({config.modeles['scientifique'].upper()}) ---\n{sci}\n\n")
             f.write(f"--- ANALYSE STYLISTIQUE ({config.modeles['style'].upper()}) ---\n{sty}\n\n")
@@ -586,15 +381,18 @@ if __name__ == "__main__":
         
         temps_fin_section = time.time()
         duree_section = temps_fin_section - temps_debut_section
-        temps_restant = (len(chapitres) - i) * duree_section
+        progression.terminer_section(i - 1)
         
-        print(f"   ✅ Sauvegardé ({duree_section:.1f}s) | Temps restant estimé: {temps_restant/60:.1f} min")
-        logger.log(f"Chapitre {i} terminé en {duree_section:.1f}s")
-    
-    # Génération du rapport final
-    print("\n📝 Génération du rapport final...")
-    ecrire_rapport_latex(chapitres, syntheses, plan_restructure, dossiers, config, mode)
+        print(f"   ✅ Sauvegardé ({duree_section:.1f}s) | {progression}")
+        logger.log(f"Chapitre {i} terminé en {duree_section:.1f}s", **progression.estimation())
+    
+    # Clôture du rapport final
+    rapport.partie("Proposition de plan restructuré")
+    rapport.paragraphe(plan_restructure)
+    rapport.fermer()
+    print(f"✅ Rapport LaTeX : {rapport.chemin}")
     logger.log("Rapport LaTeX généré")
+    historique.sauvegarder()
     
     # Statistiques finales
     temps_total = time.time() - temps_debut_analyse
@@ -7,84 +7,41 @@
 # 2. HTML professionnel
 # 3. JSON structuré
 # 4. Script autonome et robuste
+# 5. Cœur importable : analyseur/pipeline.py (ce script n'ajoute que menus et CLI)
+# 6. Mode serve : API HTTP locale de soumission d'analyses (analyseur/service.py)
+# 7. File SQLite partagée : commandes submit et worker (analyseur/file_travaux.py)
+# 8. --similar : reprise des analyses de sections quasi identiques (analyseur/similarite.py)
+# 9. Texte des sections compacté avant les prompts (analyseur/compaction.py, --no-compaction)
 # ===============================================================
 
-import os, re, time, sys, json, struct
+import os, sys, sqlite3
 from typing import Optional, List, Dict
-from datetime import datetime
-from pathlib import Path
 
-# ===============================================================
-# CONFIGURATION DES APIS
-# ===============================================================
-
-# --- OpenAI ---
-try:
-    from openai import OpenAI
-    openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-    OPENAI_AVAILABLE = True
-except Exception as e:
-    print(f"⚠️ OpenAI non disponible : {e}")
-    OPENAI_AVAILABLE = False
-
-# --- Claude ---
-try:
-    import anthropic
-    claude_client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
-    CLAUDE_AVAILABLE = True
-except Exception as e:
-    print(f"⚠️ Claude non disponible : {e}")
-    CLAUDE_AVAILABLE = False
-
-# --- Gemini ---
-try:
-    import google.generativeai as genai
-    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-    # Essayer les modèles dans cet ordre : nouveau → ancien
-    gemini_models_to_try = ["gemini-2.0-flash", "gemini-1.5-flash", "gemini-1.5-pro"]
-    gemini_model = None
-    for model_name in gemini_models_to_try:
-        try:
-            test_model = genai.GenerativeModel(model_name=model_name)
-            gemini_model = test_model
-            print(f"✅ Gemini initialisé ({model_name})")
-            GEMINI_AVAILABLE = True
-            break
-        except Exception:
-            continue
-
-    if not gemini_model:
-        raise Exception("Aucun modèle Gemini disponible parmi : " + ", ".join(gemini_models_to_try))
-except Exception as e:
-    print(f"⚠️ Gemini non disponible : {e}")
-    GEMINI_AVAILABLE = False
+from analyseur.latex import Section
+from analyseur.manuscrit import Manuscrit
+from analyseur.echeance import Echeance
+from analyseur.traces import OTLP_DEFAUT
+from analyseur.metriques import ServeurMetriques
+from analyseur.profilage import Profileur
+from analyseur.estimation import fourchette
+from analyseur.file_travaux import FileTravaux, FICHIER_FILE
+from analyseur.service import Ouvrier, Service, PORT_SERVICE, parser_limites
+from analyseur.similarite import IndexSimilarite, parser_seuils
+from analyseur.pipeline import (Pipeline, FOURNISSEURS_DEFAUT, MODE_RAPIDE, MODE_NORMAL, MODE_DETAILLE, MODES,
+                                modeles_par_defaut)
+
+# Clients API construits au premier appel (analyseur/fournisseurs.py) : l'import ne fait aucun appel réseau
+fournisseurs = FOURNISSEURS_DEFAUT
+NOMS_FOURNISSEURS = {"claude": "Claude", "gemini": "Gemini", "openai": "OpenAI"}
 
 # ===============================================================
 # MODES D'ANALYSE
 # ===============================================================
 
 class ModeAnalyse:
-    RAPIDE = {
-        "nom": "Rapide",
-        "description": "Analyse uniquement les chapitres principaux (chapter)",
-        "niveaux": ["chapter"],
-        "min_mots": 100,
-        "duree_estimee": "5–10 min"
-    }
-    NORMAL = {
-        "nom": "Normal",
-        "description": "Analyse chapitres + sections principales",
-        "niveaux": ["chapter", "section"],
-        "min_mots": 50,
-        "duree_estimee": "10–20 min"
-    }
-    DETAILLE = {
-        "nom": "Détaillé",
-        "description": "Analyse complète (chapitres, sections, sous-sections)",
-        "niveaux": ["chapter", "section", "subsection"],
-        "min_mots": 20,
-        "duree_estimee": "20–40 min"
-    }
+    RAPIDE = MODE_RAPIDE
+    NORMAL = MODE_NORMAL
+    DETAILLE = MODE_DETAILLE
 
     @staticmethod
     def choisir_mode(auto: bool = False):
@@ -97,6 +54,14 @@ class ModeAnalyse:
         choix = input("Choix [1-3, défaut=2] : ").strip()
         return ModeAnalyse.RAPIDE if choix == "1" else ModeAnalyse.DETAILLE if choix == "3" else ModeAnalyse.NORMAL
 
+    @staticmethod
+    def apercu(manuscrit: Manuscrit):
+        """Volume retenu par chaque mode, calculé sur l'index des mots"""
+        print("📐 Aperçu des modes :")
+        for m in MODES:
+            nb_sections, nb_mots = manuscrit.compter(m)
+            print(f"   • {m['nom']:9s} → {nb_sections} sections, {nb_mots} mots")
+
 # ===============================================================
 # CONFIGURATION DES MODÈLES
 # ===============================================================
@@ -104,20 +69,11 @@ class ModeAnalyse:
 class ConfigModeles:
     def __init__(self):
         # Configuration par défaut intelligente basée sur la disponibilité
-        self.modeles = {
-            "scientifique": "claude",
-            "style": "gemini" if GEMINI_AVAILABLE else "openai" if OPENAI_AVAILABLE else "claude",
-            "plan": "claude",
-            "synthese": "claude"
-        }
+        self.modeles = modeles_par_defaut(fournisseurs)
 
     def afficher_config(self):
         print("\n📋 Configuration des modèles :")
-        model_status = {
-            "claude": "✅" if CLAUDE_AVAILABLE else "❌",
-            "gemini": "✅" if GEMINI_AVAILABLE else "❌",
-            "openai": "✅" if OPENAI_AVAILABLE else "❌"
-        }
+        model_status = {nom: "✅" if dispo else "❌" for nom, dispo in fournisseurs.disponibilites().items()}
         for tache, modele in self.modeles.items():
             status = model_status.get(modele, "?")
             print(f"  • {tache.capitalize():15s} → {status} {modele.upper()}")
@@ -125,22 +81,23 @@ class ConfigModeles:
     def configurer_interactive(self, auto: bool = False):
         if auto:
             print("⚙️  Configuration automatique intelligente")
-            print(f"   (Claude: {CLAUDE_AVAILABLE}, OpenAI: {OPENAI_AVAILABLE}, Gemini: {GEMINI_AVAILABLE})")
+            dispo = fournisseurs.disponibilites()
+            print(f"   (Claude: {dispo['claude']}, OpenAI: {dispo['openai']}, Gemini: {dispo['gemini']})")
             self.afficher_config()
             return
         print("\n=== CONFIGURATION DES MODÈLES ===")
         print("Modèles disponibles:")
-        if CLAUDE_AVAILABLE: print("  ✅ claude-3-5-sonnet (Claude)")
-        if OPENAI_AVAILABLE: print("  ✅ gpt-4o (OpenAI)")
-        if GEMINI_AVAILABLE: print("  ✅ gemini (Google)")
+        if fournisseurs.disponible("claude"): print("  ✅ claude-3-5-sonnet (Claude)")
+        if fournisseurs.disponible("openai"): print("  ✅ gpt-4o (OpenAI)")
+        if fournisseurs.disponible("gemini"): print("  ✅ gemini (Google)")
         print("\n💡 Recommandé : Claude (analyse), OpenAI/Gemini (style)")
         choix = input("Utiliser la config par défaut ? [O/n] : ").strip().lower()
         if choix in ['n', 'non']:
             for tache in self.modeles.keys():
                 modeles_dispo = []
-                if CLAUDE_AVAILABLE: modeles_dispo.append("claude")
-                if OPENAI_AVAILABLE: modeles_dispo.append("openai")
-                if GEMINI_AVAILABLE: modeles_dispo.append("gemini")
+                if fournisseurs.disponible("claude"): modeles_dispo.append("claude")
+                if fournisseurs.disponible("openai"): modeles_dispo.append("openai")
+                if fournisseurs.disponible("gemini"): modeles_dispo.append("gemini")
                 choix_modele = "/".join(modeles_dispo)
                 val = input(f"{tache.capitalize()} [{choix_modele}, défaut={self.modeles[tache]}] : ").strip().lower()
                 if val in modeles_dispo:
@@ -148,463 +105,170 @@ class ConfigModeles:
         self.afficher_config()
 
 # ===============================================================
-# STATISTIQUES GLOBALES
-# ===============================================================
-
-class Statistiques:
-    def __init__(self):
-        self.debut = time.time()
-        self.nb_appels = 0
-        self.nb_erreurs = 0
-        self.nb_fallbacks = 0
-        self.temps_par_api = {"claude": [], "gemini": [], "openai": []}
-        self.resultats = []
-
-    def ajouter_appel(self, api: str, temps: float, succes: bool):
-        self.nb_appels += 1
-        if succes:
-            self.temps_par_api[api].append(temps)
-        else:
-            self.nb_erreurs += 1
-
-    def ajouter_resultat(self, chapitre: str, scientifique: str, style: str, synthese: str):
-        self.resultats.append({
-            "chapitre": chapitre,
-            "scientifique": scientifique,
-            "style": style,
-            "synthese": synthese
-        })
-
-    def obtenir_rapport(self) -> Dict:
-        temps_total = time.time() - self.debut
-        nb_appels_reussis = self.nb_appels - self.nb_erreurs
-        return {
-            "temps_total_sec": round(temps_total, 2),
-            "temps_total_min": round(temps_total / 60, 2),
-            "nb_appels": self.nb_appels,
-            "nb_erreurs": self.nb_erreurs,
-            "nb_fallbacks": self.nb_fallbacks,
-            "taux_succes": round(100 * (1 - self.nb_erreurs / max(self.nb_appels, 1)), 1),
-            "temps_moyen_appel_sec": round(sum(sum(v) for v in self.temps_par_api.values()) / max(nb_appels_reussis, 1), 2) if nb_appels_reussis > 0 else 0
-        }
-
-# ===============================================================
-# FONCTION UNIFIÉE D'APPEL API
-# ===============================================================
-
-def safe_call_unified(system_prompt: str, user_prompt: str,
-                      temperature: float = 0.3, model: str = "claude",
-                      fallback: bool = True, stats: Optional[Statistiques] = None) -> Optional[str]:
-    """Appel unifié avec basculement automatique entre modèles"""
-    for attempt in range(3):
-        t_debut = time.time()
-        try:
-            if model == "claude" and CLAUDE_AVAILABLE:
-                response = claude_client.messages.create(
-                    model="claude-3-5-sonnet-20241022",
-                    max_tokens=4000,
-                    temperature=temperature,
-                    system=system_prompt,
-                    messages=[{"role": "user", "content": user_prompt}]
-                )
-                if stats:
-                    stats.ajouter_appel("claude", time.time() - t_debut, True)
-                return response.content[0].text
-
-            elif model == "gemini" and GEMINI_AVAILABLE:
-                response = gemini_model.generate_content(
-                    contents=f"{system_prompt}\n\n{user_prompt}",
-                    generation_config=genai.GenerationConfig(
-                        temperature=temperature,
-                        max_output_tokens=4000
-                    )
-                )
-                if stats:
-                    stats.ajouter_appel("gemini", time.time() - t_debut, True)
-                return response.text
-
-            elif model == "openai" and OPENAI_AVAILABLE:
-                response = openai_client.chat.completions.create(
-                    model="gpt-4o",
-                    temperature=temperature,
-                    max_tokens=4000,
-                    messages=[
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": user_prompt}
-                    ]
-                )
-                if stats:
-                    stats.ajouter_appel("openai", time.time() - t_debut, True)
-                return response.choices[0].message.content
-
-            else:
-                raise ValueError(f"Modèle {model} non disponible.")
-
-        except Exception as e:
-            print(f"⚠️ Tentative {attempt+1}/3 échouée ({model}): {str(e)[:120]}")
-            if stats:
-                stats.ajouter_appel(model, time.time() - t_debut, False)
-            time.sleep(3)
-
-    # Si tout échoue, basculement automatique intelligent
-    if fallback:
-        # Basculement stratégique : preferer les modèles dispo
-        fallback_preferences = {
-            "claude": "openai" if OPENAI_AVAILABLE else "gemini",
-            "gemini": "claude",
-            "openai": "claude"
-        }
-        alt = fallback_preferences.get(model, "claude")
-
-        # Verifier que le modèle de fallback est disponible
-        model_available = {
-            "claude": CLAUDE_AVAILABLE,
-            "gemini": GEMINI_AVAILABLE,
-            "openai": OPENAI_AVAILABLE
-        }
-
-        if model_available.get(alt, False):
-            print(f"🔄 Basculement de {model.upper()} vers {alt.upper()}...")
-            if stats:
-                stats.nb_fallbacks += 1
-            return safe_call_unified(system_prompt, user_prompt, temperature, model=alt, fallback=False, stats=stats)
-        else:
-            print(f"⚠️ Modèle de secours {alt.upper()} également indisponible.")
-
-    print(f"❌ Abandon ({model}) après 3 tentatives.")
-    return None
-
-# ===============================================================
-# AGENTS
+# AFFICHAGE
 # ===============================================================
 
-def agent_scientifique(txt: str, model="claude", stats=None):
-    system = "Tu es un expert en mathématiques appliquées et modélisation numérique."
-    prompt = f"Analyse la rigueur scientifique du texte suivant :\n\n{txt[:4000]}"
-    return safe_call_unified(system, prompt, 0.25, model, stats=stats) or "Analyse scientifique indisponible."
-
-def agent_style(txt: str, model="gemini", stats=None):
-    system = "Tu es un relecteur académique spécialisé en rédaction scientifique."
-    prompt = f"Améliore le style et la clarté du texte suivant :\n\n{txt[:4000]}"
-    return safe_call_unified(system, prompt, 0.4, model, stats=stats) or "Amélioration stylistique indisponible."
-
-def agent_plan(plan: str, model="claude", stats=None):
-    system = "Tu es un rapporteur de thèse expert en structuration académique."
-    prompt = f"Analyse et optimise le plan suivant :\n\n{plan[:4000]}"
-    return safe_call_unified(system, prompt, 0.3, model, stats=stats) or "Analyse du plan indisponible."
-
-def agent_synthese(titre: str, analyses: list, model="claude", stats=None):
-    system = "Tu es un examinateur scientifique rédigeant un rapport critique."
-    prompt = f"Synthétise les points clés du chapitre '{titre}' :\n\n{'\n\n'.join(analyses)[:8000]}"
-    return safe_call_unified(system, prompt, 0.4, model, stats=stats) or "Synthèse indisponible."
+def afficher_profil(profileur: Profileur):
+    """Tableau des étapes locales les plus coûteuses"""
+    profil = profileur.rapport()
+    print(f"\n🔬 Temps local : {profil['duree_locale_sec']:.2f}s sur {profil['duree_run_sec']}s de run")
+    for nom, etape in list(profil["etapes"].items())[:8]:
+        print(f"   {nom:<14} {etape['duree_sec']:>8.3f}s  ×{etape['nb']:<5} "
+              f"moy. {etape['duree_moyenne_ms']:.2f} ms  pic {etape['pic_memoire_ko']:.0f} Ko")
 
 # ===============================================================
-# UTILITAIRES LATEX
+# RUN À BLANC (--dry-run)
 # ===============================================================
 
-def lire_latex(fichier: str) -> str:
-    for enc in ['utf-8', 'latin-1', 'cp1252']:
+def afficher_estimation(pipeline: Pipeline, chapitres: List[Section], budget_usd: Optional[str] = None) -> Dict:
+    estimation = pipeline.estimer(chapitres)
+    echeance = pipeline.echeance
+    print("🧮 Run à blanc : aucun appel API")
+    for fournisseur, total in estimation["par_fournisseur"].items():
+        calibration = estimation["calibration"][fournisseur]
+        origine = f"calibré sur {calibration['observations']} appels" if calibration["observations"] else "a priori"
+        print(f"   • {fournisseur:7s} {total['nb_appels']:4d} appels | {total['jetons_entree']:,} jetons en entrée, "
+              f"~{total['jetons_sortie']:,} en sortie | {total['duree_sec'] / 60:.1f} min | "
+              f"${total['cout_usd']:.2f} ({origine})")
+    bas, haut = fourchette(estimation["duree_sec"])
+    print(f"⏱️ Durée prévue : {bas}–{haut} min | 💰 Coût prévu : ${estimation['cout_usd']:.2f}")
+    if echeance.active():
+        restant = echeance.restant()
+        verdict = "✅ tient" if estimation["duree_sec"] * 1.25 <= restant else "⚠️ ne tient pas"
+        print(f"   {verdict} avant l'échéance ({echeance}, {max(restant, 0) / 60:.0f} min disponibles)")
+    if budget_usd:
         try:
-            with open(fichier, 'r', encoding=enc) as f:
-                print(f"✅ Lecture réussie ({enc})")
-                return f.read()
-        except Exception:
-            continue
-    print("❌ Échec lecture du fichier LaTeX")
-    return ""
-
-def compter_mots(txt: str) -> int:
-    txt = re.sub(r'\\[a-zA-Z]+\{[^}]*\}', '', txt)
-    txt = re.sub(r'\\[a-zA-Z]+', '', txt)
-    return len(txt.split())
-
-def extraire_chapitres(contenu: str, mode: Dict) -> List[Dict]:
-    pattern = re.compile(r'\\(chapter|section|subsection)\s*\{([^}]*)\}')
-    pos = [(m.start(), m.group(1), m.group(2)) for m in pattern.finditer(contenu)]
-    chapitres = []
-    for i, (p, niveau, titre) in enumerate(pos):
-        if niveau not in mode["niveaux"]: continue
-        fin = pos[i+1][0] if i+1 < len(pos) else len(contenu)
-        texte = contenu[p:fin]
-        mots = compter_mots(texte)
-        if mots >= mode["min_mots"]:
-            chapitres.append({"type": niveau, "titre": titre.strip(), "texte": texte, "nb_mots": mots})
-    print(f"🔍 {len(chapitres)} sections retenues ({', '.join(mode['niveaux'])})")
-    return chapitres
+            plafond = float(budget_usd)
+            verdict = "✅ dans" if estimation["cout_usd"] <= plafond else "⚠️ au-delà du"
+            print(f"   {verdict} budget (${plafond:.2f})")
+        except ValueError:
+            print(f"⚠️ Budget invalide : {budget_usd}")
+    return estimation
 
 # ===============================================================
-# GÉNÉRATION HTML
+# EXÉCUTION PRINCIPALE
 # ===============================================================
 
-def generer_html(stats: Statistiques, nom_fichier: str, fichier_source: str, mode: str) -> str:
-    """Génère un HTML avec tous les résultats d'analyse"""
-
-    rapport = stats.obtenir_rapport()
-
-    html = f"""<!DOCTYPE html>
-<html lang="fr">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Rapport d'Analyse Académique</title>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            background-color: #f5f5f5;
-        }}
-        .container {{
-            max-width: 900px;
-            margin: 40px auto;
-            background-color: white;
-            padding: 40px;
-            box-shadow: 0 0 20px rgba(0,0,0,0.1);
-            border-radius: 8px;
-        }}
-        h1 {{
-            color: #1f4788;
-            border-bottom: 3px solid #1f4788;
-            padding-bottom: 15px;
-            margin-bottom: 30px;
-            font-size: 2.5em;
-        }}
-        h2 {{
-            color: #2e5c8a;
-            margin-top: 30px;
-            margin-bottom: 15px;
-            font-size: 1.8em;
-            border-left: 4px solid #2e5c8a;
-            padding-left: 15px;
-        }}
-        h3 {{
-            color: #3e6fa6;
-            margin-top: 20px;
-            margin-bottom: 10px;
-            font-size: 1.2em;
-        }}
-        .metadata {{
-            background-color: #e8f0f7;
-            padding: 20px;
-            border-radius: 5px;
-            margin-bottom: 30px;
-            border-left: 4px solid #1f4788;
-        }}
-        .metadata p {{
-            margin: 8px 0;
-            font-size: 0.95em;
-        }}
-        .metadata strong {{
-            color: #1f4788;
-            display: inline-block;
-            min-width: 180px;
-        }}
-        .stats {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin: 20px 0;
-        }}
-        .stat-card {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px;
-            border-radius: 8px;
-            text-align: center;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }}
-        .stat-value {{
-            font-size: 2em;
-            font-weight: bold;
-            margin: 10px 0;
-        }}
-        .stat-label {{
-            font-size: 0.9em;
-            opacity: 0.9;
-        }}
-        .chapter {{
-            page-break-inside: avoid;
-            margin: 30px 0;
-            padding: 20px;
-            background-color: #f9f9f9;
-            border-radius: 5px;
-            border-left: 4px solid #2e5c8a;
-        }}
-        .chapter-title {{
-            color: #1f4788;
-            font-size: 1.5em;
-            margin-bottom: 15px;
-        }}
-        .analysis-section {{
-            margin: 15px 0;
-            padding: 15px;
-            background-color: white;
-            border-radius: 4px;
-            border-left: 3px solid #667eea;
-        }}
-        .analysis-title {{
-            color: #667eea;
-            font-weight: bold;
-            margin-bottom: 10px;
-            font-size: 1.05em;
-        }}
-        .analysis-content {{
-            color: #555;
-            line-height: 1.8;
-            font-size: 0.95em;
-        }}
-        .footer {{
-            margin-top: 50px;
-            padding-top: 20px;
-            border-top: 2px solid #e8f0f7;
-            text-align: center;
-            color: #999;
-            font-size: 0.9em;
-        }}
-        @media print {{
-            body {{
-                background-color: white;
-            }}
-            .container {{
-                box-shadow: none;
-                margin: 0;
-                padding: 20px;
-            }}
-            .chapter {{
-                page-break-inside: avoid;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>📊 Rapport d'Analyse Académique</h1>
-
-        <div class="metadata">
-            <p><strong>Fichier source :</strong> {fichier_source}</p>
-            <p><strong>Mode d'analyse :</strong> {mode}</p>
-            <p><strong>Date du rapport :</strong> {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-            <p><strong>Nombre de sections :</strong> {len(stats.resultats)}</p>
-        </div>
-
-        <h2>Statistiques Globales</h2>
-        <div class="stats">
-            <div class="stat-card">
-                <div class="stat-label">Temps Total</div>
-                <div class="stat-value">{rapport['temps_total_min']}</div>
-                <div class="stat-label">minutes</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Appels API</div>
-                <div class="stat-value">{rapport['nb_appels']}</div>
-                <div class="stat-label">total</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Taux de Succès</div>
-                <div class="stat-value">{rapport['taux_succes']}%</div>
-                <div class="stat-label">réussite</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Sections</div>
-                <div class="stat-value">{len(stats.resultats)}</div>
-                <div class="stat-label">analysées</div>
-            </div>
-        </div>
-
-        <h2>Détails des Analyses par Chapitre</h2>
-"""
-
-    # Ajouter les analyses par chapitre
-    for i, resultat in enumerate(stats.resultats, 1):
-        html += f"""
-        <div class="chapter">
-            <div class="chapter-title">Chapitre {i}: {resultat['chapitre']}</div>
-
-            <div class="analysis-section">
-                <div class="analysis-title">✓ Rigueur Scientifique</div>
-                <div class="analysis-content">{resultat['scientifique'][:500]}...</div>
-            </div>
-
-            <div class="analysis-section">
-                <div class="analysis-title">✓ Style et Clarté</div>
-                <div class="analysis-content">{resultat['style'][:500]}...</div>
-            </div>
-
-            <div class="analysis-section">
-                <div class="analysis-title">✓ Synthèse</div>
-                <div class="analysis-content">{resultat['synthese'][:500]}...</div>
-            </div>
-        </div>
-"""
-
-    html += f"""
-        <div class="footer">
-            <p>Rapport généré automatiquement le {datetime.now().strftime("%d/%m/%Y à %H:%M:%S")}</p>
-            <p>Analyseur Multi-Modèles IA v3.2</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-
-    return html
-
-def sauvegarder_html(html: str, nom_fichier: str) -> str:
-    """Sauvegarde le HTML"""
-    try:
-        Path("rapports").mkdir(exist_ok=True)
-        html_path = f"rapports/{nom_fichier}.html"
-
-        with open(html_path, 'w', encoding='utf-8') as f:
-            f.write(html)
+def valeur_option(nom: str) -> Optional[str]:
+    """Valeur d'une option '--nom valeur' ou '--nom=valeur' de la ligne de commande"""
+    for i, arg in enumerate(sys.argv):
+        if arg.startswith(nom + "="):
+            return arg.split("=", 1)[1]
+        if arg == nom and i + 1 < len(sys.argv):
+            return sys.argv[i + 1]
+    return None
 
-        print(f"✅ HTML généré : {html_path}")
-        return html_path
+def file_travaux() -> FileTravaux:
+    return FileTravaux(valeur_option("--queue") or FICHIER_FILE)
 
-    except Exception as e:
-        print(f"❌ Erreur lors de la sauvegarde HTML : {e}")
+def index_similarite() -> Optional[IndexSimilarite]:
+    """--similar [0.9:0.6] : sections quasi identiques reprises (≥ 1er seuil) ou revues sur leurs modifications"""
+    seuils = valeur_option("--similar")
+    if "--similar" not in sys.argv and seuils is None:
         return None
-
-def sauvegarder_json(stats: Statistiques, nom_fichier: str, fichier_source: str, mode: str) -> str:
-    """Sauvegarde les résultats en JSON"""
+    if seuils and not seuils[0].isdigit():
+        seuils = None
+    reprise, revision = parser_seuils(seuils)
+    return IndexSimilarite(seuil_reprise=reprise, seuil_revision=revision)
+
+def afficher_fournisseurs(ouvrier: Ouvrier):
+    for nom, dispo in ouvrier.fournisseurs.disponibilites().items():
+        print(f"   {'✅' if dispo else '❌'} {NOMS_FOURNISSEURS[nom]}"
+              + ("" if dispo else f" : {ouvrier.fournisseurs.erreurs.get(nom)}"))
+
+def afficher_file(file: FileTravaux):
+    compte = file.compter()
+    print(f"🗂️ File {file.chemin} : " + (", ".join(f"{n} {etat}" for etat, n in sorted(compte.items())) or "vide"))
+
+def servir():
+    """Processus de longue durée : analyses soumises par HTTP, clients et caches gardés"""
+    port = valeur_option("--port")
+    nb_travaux = valeur_option("--jobs")
     try:
-        Path("rapports").mkdir(exist_ok=True)
-        json_path = f"rapports/{nom_fichier}.json"
-
-        donnees = {
-            "metadata": {
-                "fichier_source": fichier_source,
-                "mode_analyse": mode,
-                "date": datetime.now().isoformat(),
-            },
-            "statistiques": stats.obtenir_rapport(),
-            "resultats": stats.resultats
-        }
-
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(donnees, f, ensure_ascii=False, indent=2)
-
-        print(f"✅ JSON sauvegardé : {json_path}")
-        return json_path
-
-    except Exception as e:
-        print(f"❌ Erreur lors de la sauvegarde JSON : {e}")
-        return None
-
-# ===============================================================
-# EXÉCUTION PRINCIPALE
-# ===============================================================
+        service = Service(int(port) if port else PORT_SERVICE, nb_travaux=int(nb_travaux or 2),
+                          limites=parser_limites(valeur_option("--limits")), file=file_travaux(),
+                          reserves=int(valeur_option("--interactive-slots") or 0), similarite=index_similarite())
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"❌ Service non démarré : {e}")
+        sys.exit(1)
+    print("="*60)
+    print("🛰️ ANALYSEUR MULTI-MODÈLES IA – MODE SERVICE")
+    print("="*60)
+    if service.ouvrier:
+        afficher_fournisseurs(service.ouvrier)
+        print(f"📡 API : {service.adresse}/travaux ({service.ouvrier.nb_travaux} travaux en parallèle)")
+    else:
+        print(f"📡 API : {service.adresse}/travaux (exécution par des processus worker)")
+    afficher_file(service.file)
+    service.attendre()
+    print("👋 Service arrêté.")
+
+def travailler():
+    """Processus ouvrier : exécute les travaux de la file partagée, sans API HTTP"""
+    nb_travaux = valeur_option("--jobs")
+    try:
+        ouvrier = Ouvrier(file_travaux(), int(nb_travaux or 2), parser_limites(valeur_option("--limits")),
+                          reserves=int(valeur_option("--interactive-slots") or 0), similarite=index_similarite())
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"❌ Ouvrier non démarré : {e}")
+        sys.exit(1)
+    print(f"🛠️ Ouvrier {ouvrier.nom} : {ouvrier.nb_travaux} travaux en parallèle"
+          + (f" + {ouvrier.reserves} place(s) interactive(s)" if ouvrier.reserves else ""))
+    afficher_fournisseurs(ouvrier)
+    afficher_file(ouvrier.file)
+    ouvrier.attendre()
+    print("👋 Ouvrier arrêté.")
+
+def soumettre():
+    """Met un manuscrit en file : submit fichier.tex [--mode rapide] [--deadline 18:30]"""
+    fichiers = [a for a in sys.argv[2:] if a.endswith(".tex")]
+    if not fichiers:
+        print("❌ Usage : submit fichier.tex [...] [--mode rapide|normal|detaille] [--deadline ...] "
+              "[--interactive] [--weight 2] [--queue ...]")
+        sys.exit(1)
+    file = file_travaux()
+    for fichier in fichiers:
+        try:
+            poids = valeur_option("--weight")
+            travail = file.soumettre(fichier, valeur_option("--mode") or "normal",
+                                     echeance=valeur_option("--deadline"), interactif="--interactive" in sys.argv,
+                                     poids=float(poids) if poids else None)
+        except ValueError as e:
+            print(f"❌ {fichier} : {e}")
+            continue
+        print(f"📥 {travail['id']} : {fichier} ({travail['mode']}, poids {travail['poids']:g}"
+              + (", interactif)" if travail["interactif"] else ")"))
+    afficher_file(file)
 
 if __name__ == "__main__":
+    commandes = {"serve": servir, "worker": travailler, "submit": soumettre}
+    if len(sys.argv) > 1 and sys.argv[1] in commandes:
+        commandes[sys.argv[1]]()
+        sys.exit(0)
     auto = "--auto" in sys.argv
+    dry_run = "--dry-run" in sys.argv
+    echeance = Echeance.parser(valeur_option("--deadline"))
+    otlp = valeur_option("--otlp")
+    if "--otlp" in sys.argv and (otlp is None or otlp.startswith("--")):
+        otlp = OTLP_DEFAUT
+    port_metriques = valeur_option("--metrics-port")
+    fichier_metriques = valeur_option("--metrics-textfile")
+    # --profile : étapes + tracemalloc + cProfile ; --profile=etapes : sans cProfile
+    profil = valeur_option("--profile")
+    if "--profile" in sys.argv and (profil is None or profil.startswith("--")):
+        profil = "complet"
+    profileur = Profileur(actif=profil is not None, cprofile=profil == "complet")
+    # --limits : places et appels par minute par fournisseur, respectés par le run et prévus par --dry-run
+    if valeur_option("--limits"):
+        fournisseurs.limites = parser_limites(valeur_option("--limits"))
     print("="*60)
     print("🤖 ANALYSEUR MULTI-MODÈLES IA – V3.2 FINAL")
     print("="*60)
+    for nom, dispo in fournisseurs.disponibilites().items():
+        if not dispo:
+            print(f"⚠️ {NOMS_FOURNISSEURS[nom]} non disponible : {fournisseurs.erreurs.get(nom)}")
+    if fournisseurs.modele_gemini:
+        print(f"✅ Gemini initialisé ({fournisseurs.modele_gemini})")
 
     mode = ModeAnalyse.choisir_mode(auto)
     config = ConfigModeles()
@@ -615,49 +279,84 @@ if __name__ == "__main__":
         print(f"❌ Fichier introuvable : {fichier}")
         sys.exit(1)
 
-    contenu = lire_latex(fichier)
-    chapitres = extraire_chapitres(contenu, mode)
+    try:
+        similarite = index_similarite()
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    if similarite is not None:
+        print(f"♻️ Index de similarité : {len(similarite)} section(s) déjà analysée(s) "
+              f"(reprise ≥ {similarite.seuil_reprise:g}, revue ≥ {similarite.seuil_revision:g})")
+    pipeline = Pipeline(mode, config.modeles, echeance, fournisseurs, profileur,
+                        fichier_metriques=fichier_metriques, similarite=similarite,
+                        compaction="--no-compaction" not in sys.argv)
+    profileur.demarrer()
+    manuscrit = pipeline.charger(fichier)
+    print(f"📚 {len(manuscrit.fichiers)} fichier(s) source ({manuscrit.cache.nb_relus} analysé(s), "
+          f"{manuscrit.cache.nb_reutilises} repris du cache)")
+    if manuscrit.manquants:
+        print(f"⚠️ Fichiers inclus introuvables : {', '.join(manuscrit.manquants)}")
+    ModeAnalyse.apercu(manuscrit)
+    chapitres = pipeline.sections()
+    print(f"🔍 {len(chapitres)} sections retenues ({', '.join(mode['niveaux'])})")
 
     if not chapitres:
         print("⚠️ Aucune section détectée. Vérifie ton fichier.")
         sys.exit(0)
 
-    print(f"\n📊 {len(chapitres)} sections, {sum(c['nb_mots'] for c in chapitres)} mots\n")
+    print(f"\n📊 {len(chapitres)} sections, {sum(c.nb_mots for c in chapitres)} mots\n")
+    if dry_run:
+        afficher_estimation(pipeline, chapitres, valeur_option("--budget"))
+        sys.exit(0)
 
-    # Initialiser les statistiques
-    stats = Statistiques()
+    stats = pipeline.demarrer(chapitres)
+    print(f"🧾 Suivi en direct : {stats.resultats.chemin}")
+    serveur_metriques = None
+    if port_metriques:
+        try:
+            serveur_metriques = ServeurMetriques(stats.metriques, int(port_metriques))
+            print(f"📡 Métriques Prometheus : {serveur_metriques.adresse}")
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Serveur de métriques non démarré ({port_metriques}) : {e}")
+    if echeance.active():
+        print(f"⏰ Échéance du run : {echeance}")
+    print(f"⏳ Estimation initiale : {pipeline.progression}")
 
     # Analyse
-    for i, ch in enumerate(chapitres, 1):
-        print(f"\n🔎 {i}/{len(chapitres)}: {ch['titre']} ({ch['nb_mots']} mots)")
-
-        sci = agent_scientifique(ch["texte"], config.modeles["scientifique"], stats)
-        sty = agent_style(ch["texte"], config.modeles["style"], stats)
-        syn = agent_synthese(ch["titre"], [sci, sty], config.modeles["synthese"], stats)
-
-        stats.ajouter_resultat(ch["titre"], sci, sty, syn)
-
-        print(f"   ✅ Terminé ({i}/{len(chapitres)})")
+    pipeline.analyser(chapitres)
 
     rapport = stats.obtenir_rapport()
     print(f"\n⏱️ Temps total : {rapport['temps_total_min']} min")
     print(f"📈 Appels API : {rapport['nb_appels']} | Erreurs : {rapport['nb_erreurs']} | Succès : {rapport['taux_succes']}%")
+    for api, latence in rapport["latences_par_fournisseur"].items():
+        print(f"   ⏱️ {api} : p50 {latence['p50']}s | p90 {latence['p90']}s | p99 {latence['p99']}s ({latence['nb']} appels)")
+    if rapport["compaction"]:
+        compaction = rapport["compaction"]
+        print(f"   🗜️ Compaction : {compaction['jetons_bruts']} → {compaction['jetons_scientifique']} jetons "
+              f"de texte (−{compaction['economie_pct']} %, style : {compaction['jetons_style']})")
+    libelles = {"identique": "reprise(s) telle(s) quelle(s)", "revision": "revue(s) sur leurs seules modifications"}
+    for type_reprise, nb in rapport["sections_reutilisees"].items():
+        print(f"   ♻️ {nb} section(s) {libelles[type_reprise]}")
+    for api, attente in rapport["attente_fournisseurs"].items():
+        print(f"   ⏳ {api} : {attente['sec']}s d'attente de places ({attente['nb']} appels)")
     print("🏁 Analyse complète.")
 
-    # Générer les exports
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    nom_rapport = f"rapport_analyse_{timestamp}"
-
-    json_path = sauvegarder_json(stats, nom_rapport, fichier, mode["nom"])
-    html_content = generer_html(stats, nom_rapport, fichier, mode["nom"])
-    html_path = sauvegarder_html(html_content, nom_rapport)
+    # Exports HTML, PDF, JSON, trace
+    chemins = pipeline.exporter(otlp)
+    if serveur_metriques:
+        serveur_metriques.arreter()
+    if profileur.actif:
+        afficher_profil(profileur)
 
     print(f"\n✨ Tous les résultats ont été sauvegardés !")
-    if html_path:
-        print(f"   📄 HTML : {html_path}")
-    if json_path:
-        print(f"   📊 JSON : {json_path}")
-    print(f"\n💡 Pour convertir en PDF :")
-    print(f"   • Ouvre le HTML dans un navigateur")
-    print(f"   • Fichier → Imprimer → Enregistrer en PDF")
-    print(f"   • Ou utilise : python3 converter_html_to_pdf.py {html_path}")
+    if chemins["html"]:
+        print(f"   📄 HTML : {chemins['html']}")
+    if chemins["pdf"]:
+        print(f"   📕 PDF : {chemins['pdf']}")
+    if chemins["json"]:
+        print(f"   📊 JSON : {chemins['json']}")
+    print(f"   🧾 Journal (JSONL) : {chemins['journal']}")
+    if chemins["trace"]:
+        print(f"   🧭 Trace (Perfetto / chrome://tracing) : {chemins['trace']}")
+    if chemins["prof"]:
+        print(f"   🔬 Profil cProfile (pstats / snakeviz) : {chemins['prof']}")
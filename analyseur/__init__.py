@@ -0,0 +1,86 @@
+# ===============================================================
+# analyseur — Briques communes de l'analyseur multi-modèles
+# ===============================================================
+# L'import de ce paquet ne crée aucun client API et n'affiche rien.
+# ===============================================================
+
+from analyseur.compaction import compacter
+from analyseur.budgets import budget_sortie, consigne_longueur, facteur_mode, jetons_texte, mots_extrait
+from analyseur.estimation import HistoriqueAppels, estimer_run
+from analyseur.file_travaux import FileTravaux
+from analyseur.fournisseurs import CacheReponses, Flux, Fournisseurs, FournisseursHTTP, Limiteur
+from analyseur.latex import (DocumentLatex, IndexMots, Noeud, Section, analyser_document,
+                             analyser_latex, compter_mots, compter_sections, extraire_chapitres)
+from analyseur.logger import Logger
+from analyseur.metriques import (Esquisse, Histogramme, Metriques, ServeurMetriques,
+                                 fusionner_latences, latences_rapports)
+from analyseur.manuscrit import CacheAnalyses, Manuscrit, SectionManuscrit, charger_manuscrit
+from analyseur.pipeline import AnalyseAnnulee, Pipeline, Statistiques
+from analyseur.profilage import Profileur
+from analyseur.progression import Progression
+from analyseur.rapport_html import RapportHTML, ecrire_rapport_html
+from analyseur.rapport_latex import RapportLatex, echapper_latex
+from analyseur.rapport_pdf import ecrire_rapport_pdf
+from analyseur.pdf import EcrivainPDF
+from analyseur.resultats import MagasinResultats
+from analyseur.service import Ouvrier, Service
+from analyseur.similarite import IndexSimilarite
+from analyseur.traces import Span, Traceur
+from analyseur.sources import charger_source, detecter_encodage, lire_source
+
+__all__ = [
+    "DocumentLatex",
+    "IndexMots",
+    "Noeud",
+    "Section",
+    "analyser_document",
+    "analyser_latex",
+    "compter_mots",
+    "compter_sections",
+    "extraire_chapitres",
+    "HistoriqueAppels",
+    "IndexSimilarite",
+    "estimer_run",
+    "CacheReponses",
+    "FileTravaux",
+    "Flux",
+    "Fournisseurs",
+    "FournisseursHTTP",
+    "Limiteur",
+    "Logger",
+    "Esquisse",
+    "Histogramme",
+    "Metriques",
+    "ServeurMetriques",
+    "CacheAnalyses",
+    "Manuscrit",
+    "SectionManuscrit",
+    "MagasinResultats",
+    "AnalyseAnnulee",
+    "Pipeline",
+    "Ouvrier",
+    "Service",
+    "Statistiques",
+    "Profileur",
+    "Progression",
+    "RapportHTML",
+    "ecrire_rapport_html",
+    "RapportLatex",
+    "echapper_latex",
+    "EcrivainPDF",
+    "ecrire_rapport_pdf",
+    "charger_manuscrit",
+    "charger_source",
+    "detecter_encodage",
+    "lire_source",
+    "Span",
+    "Traceur",
+    "budget_sortie",
+    "compacter",
+    "consigne_longueur",
+    "facteur_mode",
+    "fusionner_latences",
+    "jetons_texte",
+    "latences_rapports",
+    "mots_extrait",
+]
@@ -0,0 +1,66 @@
+# ===============================================================
+# analyseur/budgets.py — Budgets de sortie adaptatifs
+# ===============================================================
+# La longueur de la réponse pilote la latence d'un appel : on
+# calcule pour chaque agent un max_tokens proportionné à la taille
+# de l'entrée et au mode d'analyse, au lieu d'un 4000 fixe.
+# ===============================================================
+
+from typing import Optional, Dict
+
+# Plafond absolu accepté par les trois fournisseurs
+PLAFOND_TOKENS = 4000
+
+# Approximation pour du texte français : ~1,5 token par mot
+TOKENS_PAR_MOT = 1.5
+
+# Par agent : tokens de sortie par mot d'entrée, minimum, maximum
+BUDGETS_AGENTS = {
+    "scientifique": {"ratio": 0.6, "min": 250, "max": 1500},
+    "style":        {"ratio": 0.8, "min": 250, "max": 2000},
+    "plan":         {"ratio": 1.0, "min": 400, "max": 3000},
+    "synthese":     {"ratio": 0.5, "min": 200, "max": 1500},
+}
+
+# Multiplicateur appliqué selon le mode si celui-ci n'en définit pas
+FACTEURS_MODE = {"Rapide": 0.6, "Normal": 1.0, "Détaillé": 1.5}
+
+
+def facteur_mode(mode: Optional[Dict]) -> float:
+    """Facteur de longueur associé au mode d'analyse"""
+    if not mode:
+        return 1.0
+    if "facteur_sortie" in mode:
+        return mode["facteur_sortie"]
+    return FACTEURS_MODE.get(mode.get("nom"), 1.0)
+
+
+def budget_sortie(agent: str, nb_mots_entree: int, mode: Optional[Dict] = None) -> int:
+    """Nombre maximal de tokens de sortie pour un agent et une entrée donnés"""
+    regle = BUDGETS_AGENTS.get(agent, BUDGETS_AGENTS["scientifique"])
+    facteur = facteur_mode(mode)
+    brut = nb_mots_entree * regle["ratio"]
+    borne = max(regle["min"], min(brut, regle["max"])) * facteur
+    return int(max(regle["min"] // 2, min(borne, PLAFOND_TOKENS)))
+
+
+def mots_extrait(texte: str, extrait: str, nb_mots: Optional[int] = None) -> int:
+    """Mots de l'extrait envoyé au modèle, au prorata du compte déjà indexé de la section"""
+    if nb_mots is None:
+        return len(extrait.split())
+    if len(extrait) >= len(texte):
+        return nb_mots
+    return int(nb_mots * len(extrait) / max(len(texte), 1))
+
+
+def consigne_longueur(max_tokens: int) -> str:
+    """Consigne de longueur à ajouter au prompt, cohérente avec max_tokens"""
+    # Marge de 20 % pour que le modèle termine avant la coupure
+    mots = int(max_tokens / TOKENS_PAR_MOT * 0.8)
+    mots = max(50, round(mots, -1))
+    return f"Réponds de façon concise et proportionnée : {mots} mots au maximum."
+
+
+def jetons_texte(texte: str) -> int:
+    """Nombre de jetons approché d'un texte (prompt), sans tokenizer"""
+    return int(len(texte.split()) * TOKENS_PAR_MOT) + 1
@@ -0,0 +1,92 @@
+# ===============================================================
+# analyseur/compaction.py — Texte des sections allégé avant les prompts
+# ===============================================================
+# Le source LaTeX d'une section porte beaucoup de balisage sans
+# valeur pour les agents : commentaires, \label, flottants complets,
+# échafaudage des listes, commandes de mise en page, blancs. Tout
+# cela coûte des jetons et, avec la coupe des extraits, repousse le
+# vrai texte hors du prompt. La compaction garde le texte, les maths
+# en ligne et les légendes ; pour l'agent de style, les équations
+# hors texte deviennent de simples marqueurs.
+# ===============================================================
+
+import re
+from typing import Dict
+
+from analyseur.budgets import jetons_texte
+
+# Flottants réduits à leur légende
+FLOTTANTS = {"figure": "Figure", "table": "Tableau", "algorithm": "Algorithme"}
+
+# Environnements mathématiques hors texte (remplacés pour l'agent de style)
+MATHS_HORS_TEXTE = ("equation", "align", "gather", "multline", "eqnarray", "displaymath", "flalign")
+
+MARQUEUR_EQUATION = "[équation]"
+
+_LIGNE_COMMENTAIRE = re.compile(r'^[ \t]*%[^\n]*\n', re.M)
+_COMMENTAIRE = re.compile(r'(?<!\\)%[^\n]*')
+_FLOTTANT = re.compile(r'\\begin\{(' + "|".join(FLOTTANTS) + r')(\*?)\}.*?\\end\{\1\2\}', re.S)
+_LEGENDE = re.compile(r'\\caption(?:\[[^\]]*\])?\{')
+_LABEL = re.compile(r'\\label\{[^}]*\}')
+_REFERENCE = re.compile(r'~?\\(?:ref|eqref|pageref|autoref|cref|Cref)\{[^}]*\}')
+_CITATION = re.compile(r'~?\\cite[a-z]*\*?(?:\[[^\]]*\])*\{[^}]*\}')
+_LISTE = re.compile(r'[ \t]*\\(?:begin|end)\{(?:itemize|enumerate|description)\}(?:\[[^\]]*\])?[ \t]*\n?')
+_ITEM = re.compile(r'\\item(?:\[([^\]]*)\])?\s*')
+_MISE_EN_PAGE = re.compile(r'\\(?:centering|noindent|newpage|clearpage|medskip|bigskip|smallskip|vfill|hfill'
+                           r'|[vh]space\*?\{[^}]*\})(?![A-Za-z])')
+_MATHS = re.compile(r'\$\$.*?\$\$|\\\[.*?\\\]|\\begin\{(' + "|".join(MATHS_HORS_TEXTE) + r')(\*?)\}.*?'
+                    r'\\end\{\1\2\}', re.S)
+_BLANCS = re.compile(r'[ \t]+')
+_LIGNES_VIDES = re.compile(r'\n\s*\n\s*(?:\n\s*)+')
+
+
+def _legende(flottant: str) -> str:
+    """Texte de la première \\caption du flottant (accolades imbriquées comprises), ou ''"""
+    trouve = _LEGENDE.search(flottant)
+    if not trouve:
+        return ""
+    debut = i = trouve.end()
+    profondeur = 1
+    while i < len(flottant):
+        if flottant[i] == "\\":
+            i += 2
+            continue
+        if flottant[i] == "{":
+            profondeur += 1
+        elif flottant[i] == "}":
+            profondeur -= 1
+            if profondeur == 0:
+                return " ".join(flottant[debut:i].split())
+        i += 1
+    return ""
+
+
+def _reduire_flottant(trouve: "re.Match") -> str:
+    legende = _legende(trouve.group(0))
+    nom = FLOTTANTS[trouve.group(1)]
+    return f"[{nom} : {_LABEL.sub('', legende).strip()}]" if legende else f"[{nom}]"
+
+
+def compacter(texte: str, maths: bool = True) -> str:
+    """Texte de section sans balisage inutile aux agents ; maths=False : équations hors texte en marqueurs"""
+    texte = _LIGNE_COMMENTAIRE.sub("", texte)
+    texte = _COMMENTAIRE.sub("", texte)
+    texte = _FLOTTANT.sub(_reduire_flottant, texte)
+    if not maths:
+        texte = _MATHS.sub(f" {MARQUEUR_EQUATION} ", texte)
+    texte = _LABEL.sub("", texte)
+    texte = _REFERENCE.sub(" [réf.]", texte)
+    texte = _CITATION.sub(" [cit.]", texte)
+    texte = _LISTE.sub("", texte)
+    texte = _ITEM.sub(lambda m: f"- {m.group(1)} : " if m.group(1) else "- ", texte)
+    texte = _MISE_EN_PAGE.sub("", texte)
+    texte = _BLANCS.sub(" ", texte)
+    texte = "\n".join(ligne.strip() for ligne in texte.split("\n"))
+    return _LIGNES_VIDES.sub("\n\n", texte).strip()
+
+
+def mesurer(brut: str, scientifique: str, style: str) -> Dict[str, int]:
+    """Jetons (approchés) et caractères avant et après compaction"""
+    return {"jetons_bruts": jetons_texte(brut), "jetons_scientifique": jetons_texte(scientifique),
+            "jetons_style": jetons_texte(style), "caracteres_bruts": len(brut),
+            "caracteres_scientifique": len(scientifique), "caracteres_style": len(style)}
@@ -0,0 +1,116 @@
+# ===============================================================
+# analyseur/echeance.py — Délais d'appel et échéance globale
+# ===============================================================
+# Chaque appel SDK reçoit un délai maximal (fournisseur × tâche),
+# borné par le temps restant avant l'échéance du run. À l'approche
+# de l'échéance, le niveau de dégradation indique quoi sacrifier
+# pour que les rapports HTML/JSON soient prêts à l'heure.
+# ===============================================================
+
+import time
+import re
+from datetime import datetime, timedelta
+from typing import Optional
+
+# Délai de base par appel (secondes)
+DELAIS_FOURNISSEUR = {"claude": 120.0, "openai": 120.0, "gemini": 90.0}
+
+# Multiplicateur par tâche (le plan et la synthèse produisent plus)
+FACTEURS_TACHE = {"scientifique": 1.0, "style": 1.0, "plan": 1.5, "synthese": 1.2}
+
+# Modèles de repli plus rapides, utilisés en mode dégradé
+MODELES_RAPIDES = {
+    "claude": "claude-3-5-haiku-20241022",
+    "openai": "gpt-4o-mini",
+    "gemini": "gemini-1.5-flash",
+}
+
+# Niveaux de dégradation, du plus léger au plus fort
+NORMAL = "normal"
+SANS_SYNTHESE = "sans_synthese"
+MODELE_RAPIDE = "modele_rapide"
+NON_ANALYSEE = "non_analysee"
+# Section commencée mais dont un agent a été abandonné faute de temps
+INTERROMPUE = "interrompue"
+
+# Part du temps d'une section consacrée à la synthèse, et gain du modèle rapide
+PART_SYNTHESE = 1 / 3
+GAIN_MODELE_RAPIDE = 0.5
+
+# En dessous de ce délai, un appel n'a aucune chance d'aboutir
+DELAI_MINIMAL = 5.0
+
+
+class Echeance:
+    """Échéance globale du run, avec une réserve pour les exports"""
+
+    def __init__(self, fin: Optional[float] = None, reserve: float = 30.0):
+        self.fin = fin
+        self.reserve = reserve
+        self.abandons = 0       # appels abandonnés parce que l'échéance était atteinte
+
+    @staticmethod
+    def parser(valeur: Optional[str], reserve: float = 30.0) -> "Echeance":
+        """Accepte 'HH:MM', '+45m', '+2h', '+90s', un nombre de secondes ou une date ISO"""
+        if not valeur:
+            return Echeance(None, reserve)
+        valeur = valeur.strip()
+        maintenant = datetime.now()
+
+        relatif = re.fullmatch(r'\+?(\d+(?:\.\d+)?)([smh]?)', valeur)
+        if relatif:
+            unite = {"": 1, "s": 1, "m": 60, "h": 3600}[relatif.group(2)]
+            return Echeance(time.time() + float(relatif.group(1)) * unite, reserve)
+
+        heure = re.fullmatch(r'(\d{1,2})[:h](\d{2})', valeur)
+        if heure:
+            cible = maintenant.replace(hour=int(heure.group(1)), minute=int(heure.group(2)),
+                                       second=0, microsecond=0)
+            if cible <= maintenant:
+                cible += timedelta(days=1)
+            return Echeance(cible.timestamp(), reserve)
+
+        return Echeance(datetime.fromisoformat(valeur).timestamp(), reserve)
+
+    def active(self) -> bool:
+        return self.fin is not None
+
+    def restant(self) -> float:
+        """Secondes disponibles pour l'analyse (réserve d'export déduite)"""
+        if self.fin is None:
+            return float("inf")
+        return self.fin - self.reserve - time.time()
+
+    def depassee(self) -> bool:
+        return self.restant() <= DELAI_MINIMAL
+
+    def niveau(self, nb_sections_restantes: int, duree_section: Optional[float]) -> str:
+        """Dégradation nécessaire pour traiter les sections restantes à temps"""
+        if self.fin is None:
+            return NORMAL
+        restant = self.restant()
+        if restant <= DELAI_MINIMAL:
+            return NON_ANALYSEE
+        if not duree_section or nb_sections_restantes <= 0:
+            return NORMAL
+        besoin = nb_sections_restantes * duree_section
+        if besoin <= restant:
+            return NORMAL
+        besoin *= 1 - PART_SYNTHESE
+        if besoin <= restant:
+            return SANS_SYNTHESE
+        return MODELE_RAPIDE
+
+    def __str__(self) -> str:
+        if self.fin is None:
+            return "aucune"
+        return datetime.fromtimestamp(self.fin).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def delai_appel(model: str, tache: Optional[str] = None,
+                echeance: Optional[Echeance] = None) -> float:
+    """Délai maximal d'un appel, borné par le temps restant avant l'échéance"""
+    delai = DELAIS_FOURNISSEUR.get(model, 120.0) * FACTEURS_TACHE.get(tache, 1.0)
+    if echeance is not None and echeance.active():
+        delai = min(delai, max(echeance.restant(), 0.0))
+    return delai
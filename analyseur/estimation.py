@@ -0,0 +1,160 @@
+# ===============================================================
+# analyseur/estimation.py — Durée et coût prévus d'un run (--dry-run)
+# ===============================================================
+# Chaque appel réussi d'un run alimente, par fournisseur, une
+# régression durée ≈ latence + jetons de sortie / débit, ainsi que la
+# part du budget max_tokens réellement consommée. Ces sommes sont
+# cumulées d'un run à l'autre dans un petit fichier JSON ; un run à
+# blanc s'en sert pour prévoir durée et coût de chaque appel prévu.
+# Avant toute calibration, des valeurs a priori prudentes servent.
+# ===============================================================
+
+import os
+import json
+import math
+import threading
+from typing import Optional, List, Dict, Tuple
+
+FICHIER_HISTORIQUE = "rapports/historique_appels.json"
+
+# Tarifs indicatifs des modèles principaux (USD par million de jetons : entrée, sortie)
+TARIFS = {"claude": (3.0, 15.0), "openai": (2.5, 10.0), "gemini": (1.25, 5.0)}
+
+# A priori : latence fixe (s), débit de sortie (jetons/s), part du budget consommée
+A_PRIORI = {
+    "claude": {"latence": 2.0, "debit": 45.0},
+    "openai": {"latence": 1.5, "debit": 60.0},
+    "gemini": {"latence": 2.0, "debit": 70.0},
+}
+REMPLISSAGE = 0.7
+
+# Observations nécessaires avant de se fier à la régression, et poids maximal de l'historique
+MIN_OBSERVATIONS = 5
+POIDS_MAX = 2000
+
+_SOMMES = ("n", "sx", "sy", "sxx", "sxy", "budget", "sortie")
+
+
+class HistoriqueAppels:
+    """Sommes de régression par fournisseur, cumulées entre runs (mémoire fixe)"""
+
+    def __init__(self, chemin: Optional[str] = FICHIER_HISTORIQUE):
+        self.chemin = chemin
+        self.sommes: Dict[str, Dict[str, float]] = {}
+        # Un service partage l'historique entre ses travaux
+        self._verrou = threading.Lock()
+        if chemin and os.path.exists(chemin):
+            try:
+                with open(chemin, encoding="utf-8") as f:
+                    self.sommes = json.load(f).get("fournisseurs", {})
+            except (OSError, ValueError):
+                self.sommes = {}
+
+    def observer(self, fournisseur: str, duree: float, jetons_sortie: Optional[int],
+                 budget: Optional[int] = None):
+        if jetons_sortie is None:
+            return
+        with self._verrou:
+            self._observer(fournisseur, duree, jetons_sortie, budget)
+
+    def _observer(self, fournisseur: str, duree: float, jetons_sortie: int, budget: Optional[int]):
+        s = self.sommes.setdefault(fournisseur, dict.fromkeys(_SOMMES, 0.0))
+        s["n"] += 1
+        s["sx"] += jetons_sortie
+        s["sy"] += duree
+        s["sxx"] += jetons_sortie * jetons_sortie
+        s["sxy"] += jetons_sortie * duree
+        if budget:
+            s["budget"] += budget
+            s["sortie"] += jetons_sortie
+        if s["n"] > POIDS_MAX:
+            # Les runs anciens pèsent de moins en moins (débits des fournisseurs qui évoluent)
+            facteur = POIDS_MAX / s["n"]
+            for cle in _SOMMES:
+                s[cle] *= facteur
+
+    def modele(self, fournisseur: str) -> Dict:
+        """Latence (s), débit (jetons/s) et remplissage du budget calibrés pour ce fournisseur"""
+        a_priori = A_PRIORI.get(fournisseur, A_PRIORI["claude"])
+        modele = {"latence": a_priori["latence"], "debit": a_priori["debit"],
+                  "remplissage": REMPLISSAGE, "observations": 0}
+        s = self.sommes.get(fournisseur)
+        if not s or s["n"] < MIN_OBSERVATIONS:
+            return modele
+        modele["observations"] = int(round(s["n"]))
+        if s["budget"]:
+            modele["remplissage"] = min(1.0, s["sortie"] / s["budget"])
+        n, sx, sy = s["n"], s["sx"], s["sy"]
+        denominateur = n * s["sxx"] - sx * sx
+        pente = (n * s["sxy"] - sx * sy) / denominateur if denominateur > 0 else 0.0
+        latence = (sy - pente * sx) / n
+        if pente <= 0 or latence < 0:
+            # Régression mal posée (jetons trop homogènes) : latence a priori, débit moyen
+            latence = min(modele["latence"], sy / n)
+            pente = max(sy - latence * n, 1e-6) / max(sx, 1.0)
+        modele["latence"] = latence
+        modele["debit"] = 1 / pente
+        return modele
+
+    def sauvegarder(self):
+        if not self.chemin:
+            return
+        dossier = os.path.dirname(self.chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        temporaire = f"{self.chemin}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._verrou:
+            sommes = {f: dict(s) for f, s in self.sommes.items()}
+        with open(temporaire, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "fournisseurs": sommes}, f, indent=2)
+        os.replace(temporaire, self.chemin)
+
+
+def estimer_run(appels: List[Dict], historique: HistoriqueAppels, concurrence: int = 1,
+                limites_rpm: Optional[Dict[str, float]] = None) -> Dict:
+    """Durée murale et coût prévus pour une liste d'appels {fournisseur, jetons_entree, budget}
+
+    Les appels sont répartis sur `concurrence` fils ; une limite de requêtes
+    par minute d'un fournisseur impose une durée minimale à ses appels.
+    """
+    par_fournisseur: Dict[str, Dict] = {}
+    modeles: Dict[str, Dict] = {}
+    for appel in appels:
+        fournisseur = appel["fournisseur"]
+        if fournisseur not in modeles:
+            modeles[fournisseur] = historique.modele(fournisseur)
+        modele = modeles[fournisseur]
+        sortie = appel["budget"] * modele["remplissage"]
+        duree = modele["latence"] + sortie / modele["debit"]
+        prix_entree, prix_sortie = TARIFS.get(fournisseur, TARIFS["claude"])
+        total = par_fournisseur.setdefault(fournisseur, {"nb_appels": 0, "jetons_entree": 0, "jetons_sortie": 0,
+                                                         "duree_sec": 0.0, "cout_usd": 0.0})
+        total["nb_appels"] += 1
+        total["jetons_entree"] += appel["jetons_entree"]
+        total["jetons_sortie"] += int(sortie)
+        total["duree_sec"] += duree
+        total["cout_usd"] += (appel["jetons_entree"] * prix_entree + sortie * prix_sortie) / 1e6
+
+    duree_appels = sum(t["duree_sec"] for t in par_fournisseur.values())
+    duree = duree_appels / max(concurrence, 1)
+    for fournisseur, rpm in (limites_rpm or {}).items():
+        if fournisseur in par_fournisseur and rpm:
+            duree = max(duree, 60 * par_fournisseur[fournisseur]["nb_appels"] / rpm)
+    for total in par_fournisseur.values():
+        total["duree_sec"] = round(total["duree_sec"], 1)
+        total["cout_usd"] = round(total["cout_usd"], 4)
+    return {
+        "nb_appels": len(appels),
+        "duree_sec": round(duree, 1),
+        "cout_usd": round(sum(t["cout_usd"] for t in par_fournisseur.values()), 4),
+        "par_fournisseur": par_fournisseur,
+        "calibration": {f: {"latence_sec": round(m["latence"], 2), "debit_jetons_sec": round(m["debit"], 1),
+                            "remplissage": round(m["remplissage"], 2), "observations": m["observations"]}
+                        for f, m in modeles.items()},
+    }
+
+
+def fourchette(duree_sec: float, marge: float = 0.25) -> Tuple[float, float]:
+    """Fourchette de durée en minutes (± marge)"""
+    return (math.floor(duree_sec * (1 - marge) / 60 * 10) / 10,
+            math.ceil(duree_sec * (1 + marge) / 60 * 10) / 10)
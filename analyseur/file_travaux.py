@@ -0,0 +1,257 @@
+# ===============================================================
+# analyseur/file_travaux.py — File persistante de travaux (SQLite)
+# ===============================================================
+# Les travaux d'analyse (manuscrit, mode, modèles, échéance) sont mis
+# en file dans une base SQLite. Un ouvrier prend un travail en posant
+# un bail (ouvrier + date d'expiration) qu'il prolonge régulièrement
+# (battement) ; si l'ouvrier disparaît, le bail expire et un autre
+# ouvrier reprend le travail. Un travail en échec est relancé après un
+# délai croissant, puis écarté (lettre morte) après TENTATIVES_MAX.
+#
+# Toutes les transitions passent par BEGIN IMMEDIATE : plusieurs
+# processus, sur une ou plusieurs machines partageant le dossier, se
+# coordonnent par la même base. Le journal SQLite reste en mode
+# DELETE (le mode WAL ne fonctionne pas sur un système de fichiers
+# réseau).
+#
+# Un travail interactif passe devant les autres dans la file et peut
+# prendre les places réservées d'un ouvrier ; son poids (partage des
+# fournisseurs entre travaux en cours) est aussi multiplié.
+# ===============================================================
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict
+
+FICHIER_FILE = "rapports/travaux.sqlite3"
+
+EN_ATTENTE = "en_attente"
+EN_COURS = "en_cours"
+TERMINE = "termine"
+ECHEC = "echec"                  # dernière tentative en échec, relance prévue
+ABANDONNE = "abandonne"          # lettre morte : tentatives épuisées
+
+# Durée d'un bail sans battement (s), tentatives par travail, délai avant la 1re relance (s)
+BAIL = 120.0
+TENTATIVES_MAX = 3
+DELAI_RELANCE = 30.0
+
+MODES_CONNUS = ("rapide", "normal", "detaille", "détaillé")
+
+# Poids par défaut dans le partage des fournisseurs : un petit travail pèse plus par appel
+POIDS_MODE = {"rapide": 2.0, "normal": 1.0, "detaille": 0.5, "détaillé": 0.5}
+FACTEUR_INTERACTIF = 4.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS travaux (
+    id TEXT PRIMARY KEY,
+    etat TEXT NOT NULL,
+    fichier TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    modeles TEXT,
+    echeance TEXT,
+    soumis REAL NOT NULL,
+    disponible_a REAL NOT NULL,
+    tentatives INTEGER NOT NULL DEFAULT 0,
+    ouvrier TEXT,
+    bail_expire REAL,
+    debut REAL,
+    fin REAL,
+    erreur TEXT,
+    journal TEXT,
+    chemins TEXT,
+    avancement TEXT,
+    poids REAL NOT NULL DEFAULT 1.0,
+    interactif INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS travaux_prets ON travaux (etat, disponible_a);
+"""
+
+# Colonnes ajoutées depuis la première version de la base
+_COLONNES_AJOUTEES = {"poids": "REAL NOT NULL DEFAULT 1.0", "interactif": "INTEGER NOT NULL DEFAULT 0"}
+
+_JSON = ("modeles", "chemins", "avancement")
+_DATES = ("soumis", "disponible_a", "bail_expire", "debut", "fin")
+
+
+def _date(instant: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(instant).isoformat(timespec="seconds") if instant else None
+
+
+class FileTravaux:
+    """Travaux en base SQLite : soumission, bail, battement, relance et lettre morte"""
+
+    def __init__(self, chemin: str = FICHIER_FILE, bail: float = BAIL, tentatives_max: int = TENTATIVES_MAX,
+                 delai_relance: float = DELAI_RELANCE):
+        self.chemin = os.path.abspath(chemin)
+        Path(self.chemin).parent.mkdir(parents=True, exist_ok=True)
+        # Manuscrits envoyés par HTTP, à côté de la base pour être visibles de tous les ouvriers
+        self.dossier_envois = Path(self.chemin).parent / "envois"
+        self.bail = bail
+        self.tentatives_max = tentatives_max
+        self.delai_relance = delai_relance
+        self._locale = threading.local()
+        self._connexion().executescript(_SCHEMA)
+        colonnes = {ligne["name"] for ligne in self._connexion().execute("PRAGMA table_info(travaux)")}
+        for colonne, definition in _COLONNES_AJOUTEES.items():
+            if colonne not in colonnes:
+                self._connexion().execute(f"ALTER TABLE travaux ADD COLUMN {colonne} {definition}")
+
+    def _connexion(self) -> sqlite3.Connection:
+        """Une connexion par fil (sqlite3 ne les partage pas entre fils)"""
+        connexion = getattr(self._locale, "connexion", None)
+        if connexion is None:
+            connexion = sqlite3.connect(self.chemin, timeout=30, isolation_level=None)
+            connexion.row_factory = sqlite3.Row
+            self._locale.connexion = connexion
+        return connexion
+
+    def _transaction(self, fonction):
+        """Exécute fonction(connexion) sous verrou d'écriture de la base"""
+        connexion = self._connexion()
+        connexion.execute("BEGIN IMMEDIATE")
+        try:
+            resultat = fonction(connexion)
+        except BaseException:
+            connexion.execute("ROLLBACK")
+            raise
+        connexion.execute("COMMIT")
+        return resultat
+
+    @staticmethod
+    def _dict(ligne: Optional[sqlite3.Row]) -> Optional[Dict]:
+        if ligne is None:
+            return None
+        travail = dict(ligne)
+        for cle in _JSON:
+            travail[cle] = json.loads(travail[cle]) if travail[cle] else ({} if cle == "chemins" else None)
+        for cle in _DATES:
+            travail[cle] = _date(travail[cle])
+        travail["interactif"] = bool(travail["interactif"])
+        return travail
+
+    def soumettre(self, fichier: Optional[str] = None, mode: str = "normal",
+                  modeles: Optional[Dict[str, str]] = None, echeance: Optional[str] = None,
+                  nom: Optional[str] = None, contenu: Optional[str] = None, interactif: bool = False,
+                  poids: Optional[float] = None) -> Dict:
+        """Nouveau travail : un fichier local, ou un manuscrit envoyé (nom + contenu)
+
+        poids : part dans le partage des fournisseurs (défaut selon le mode).
+        """
+        if mode.lower() not in MODES_CONNUS:
+            raise ValueError(f"Mode inconnu : {mode}")
+        identifiant = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        if contenu is not None:
+            nom = os.path.basename(nom or "manuscrit.tex")
+            if not nom.endswith(".tex"):
+                nom += ".tex"
+            dossier = self.dossier_envois / identifiant
+            dossier.mkdir(parents=True, exist_ok=True)
+            fichier = str(dossier / nom)
+            with open(fichier, "w", encoding="utf-8") as f:
+                f.write(contenu)
+        if not fichier or not os.path.isfile(fichier):
+            raise ValueError(f"Fichier introuvable : {fichier}")
+        if poids is not None and poids <= 0:
+            raise ValueError(f"Poids invalide : {poids}")
+        maintenant = time.time()
+        self._transaction(lambda c: c.execute(
+            "INSERT INTO travaux (id, etat, fichier, mode, modeles, echeance, soumis, disponible_a, poids, "
+            "interactif) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (identifiant, EN_ATTENTE, os.path.abspath(fichier), mode.lower(),
+             json.dumps(modeles) if modeles else None, echeance, maintenant, maintenant,
+             poids if poids is not None else POIDS_MODE[mode.lower()], int(interactif))))
+        return self.obtenir(identifiant)
+
+    def prendre(self, ouvrier: str, interactifs_seulement: bool = False) -> Optional[Dict]:
+        """Pose un bail sur le travail prêt le plus prioritaire (interactif, puis le plus ancien)"""
+        def prendre(connexion: sqlite3.Connection) -> Optional[str]:
+            maintenant = time.time()
+            # Baux expirés : l'ouvrier a disparu, la tentative compte comme un échec
+            for ligne in connexion.execute("SELECT id, tentatives FROM travaux WHERE etat = ? AND bail_expire < ?",
+                                           (EN_COURS, maintenant)).fetchall():
+                self._echec(connexion, ligne["id"], ligne["tentatives"], "Bail expiré (ouvrier disparu)",
+                            maintenant)
+            ligne = connexion.execute(
+                "SELECT id FROM travaux WHERE etat IN (?, ?) AND disponible_a <= ? AND interactif >= ? "
+                "ORDER BY interactif DESC, soumis LIMIT 1",
+                (EN_ATTENTE, ECHEC, maintenant, int(interactifs_seulement))).fetchone()
+            if ligne is None:
+                return None
+            connexion.execute(
+                "UPDATE travaux SET etat = ?, ouvrier = ?, bail_expire = ?, debut = ?, "
+                "tentatives = tentatives + 1, avancement = NULL WHERE id = ?",
+                (EN_COURS, ouvrier, maintenant + self.bail, maintenant, ligne["id"]))
+            return ligne["id"]
+
+        identifiant = self._transaction(prendre)
+        return self.obtenir(identifiant) if identifiant else None
+
+    def _echec(self, connexion: sqlite3.Connection, identifiant: str, tentatives: int, erreur: str,
+               maintenant: float):
+        if tentatives >= self.tentatives_max:
+            connexion.execute("UPDATE travaux SET etat = ?, erreur = ?, ouvrier = NULL, bail_expire = NULL, "
+                              "fin = ? WHERE id = ?", (ABANDONNE, erreur, maintenant, identifiant))
+        else:
+            relance = maintenant + self.delai_relance * 2 ** (tentatives - 1)
+            connexion.execute("UPDATE travaux SET etat = ?, erreur = ?, ouvrier = NULL, bail_expire = NULL, "
+                              "disponible_a = ? WHERE id = ?", (ECHEC, erreur, relance, identifiant))
+
+    def battre(self, identifiant: str, ouvrier: str, avancement: Optional[Dict] = None,
+               journal: Optional[str] = None) -> bool:
+        """Prolonge le bail ; False si l'ouvrier l'a perdu (expiré et repris ailleurs)"""
+        curseur = self._transaction(lambda c: c.execute(
+            "UPDATE travaux SET bail_expire = ?, avancement = COALESCE(?, avancement), "
+            "journal = COALESCE(?, journal) WHERE id = ? AND ouvrier = ? AND etat = ?",
+            (time.time() + self.bail, json.dumps(avancement) if avancement else None, journal,
+             identifiant, ouvrier, EN_COURS)))
+        return curseur.rowcount == 1
+
+    def terminer(self, identifiant: str, ouvrier: str, chemins: Dict) -> bool:
+        curseur = self._transaction(lambda c: c.execute(
+            "UPDATE travaux SET etat = ?, chemins = ?, fin = ?, erreur = NULL, ouvrier = NULL, "
+            "bail_expire = NULL WHERE id = ? AND ouvrier = ? AND etat = ?",
+            (TERMINE, json.dumps(chemins), time.time(), identifiant, ouvrier, EN_COURS)))
+        return curseur.rowcount == 1
+
+    def echouer(self, identifiant: str, ouvrier: str, erreur: str) -> bool:
+        """Échec de la tentative : relance différée, ou lettre morte si les tentatives sont épuisées"""
+        def echouer(connexion: sqlite3.Connection) -> bool:
+            ligne = connexion.execute("SELECT tentatives FROM travaux WHERE id = ? AND ouvrier = ? AND etat = ?",
+                                      (identifiant, ouvrier, EN_COURS)).fetchone()
+            if ligne is None:
+                return False
+            self._echec(connexion, identifiant, ligne["tentatives"], erreur[:500], time.time())
+            return True
+
+        return self._transaction(echouer)
+
+    def relancer(self, identifiant: str) -> bool:
+        """Remet en file un travail écarté (lettre morte), tentatives remises à zéro"""
+        curseur = self._transaction(lambda c: c.execute(
+            "UPDATE travaux SET etat = ?, tentatives = 0, disponible_a = ?, erreur = NULL, fin = NULL "
+            "WHERE id = ? AND etat = ?", (EN_ATTENTE, time.time(), identifiant, ABANDONNE)))
+        return curseur.rowcount == 1
+
+    def obtenir(self, identifiant: str) -> Optional[Dict]:
+        return self._dict(self._connexion().execute("SELECT * FROM travaux WHERE id = ?",
+                                                    (identifiant,)).fetchone())
+
+    def lister(self, etat: Optional[str] = None, limite: int = 200) -> List[Dict]:
+        if etat:
+            lignes = self._connexion().execute("SELECT * FROM travaux WHERE etat = ? ORDER BY soumis DESC LIMIT ?",
+                                               (etat, limite))
+        else:
+            lignes = self._connexion().execute("SELECT * FROM travaux ORDER BY soumis DESC LIMIT ?", (limite,))
+        return [self._dict(ligne) for ligne in lignes]
+
+    def compter(self) -> Dict[str, int]:
+        """Nombre de travaux par état"""
+        return {ligne["etat"]: ligne["nb"] for ligne in
+                self._connexion().execute("SELECT etat, COUNT(*) AS nb FROM travaux GROUP BY etat")}
@@ -0,0 +1,373 @@
+# ===============================================================
+# analyseur/fournisseurs.py — Clients API construits au premier usage
+# ===============================================================
+# Aucun SDK n'est importé et aucun client n'est construit au chargement
+# du module : chaque fournisseur est préparé au premier appel (ou à la
+# première question sur sa disponibilité), puis gardé. Un fournisseur
+# indisponible (SDK absent, clé refusée) est mémorisé avec sa raison,
+# que l'appelant affiche s'il le souhaite. Les SDK ne refont aucune
+# tentative : safe_call_unified gère les reprises et l'échéance.
+# Un processus de longue durée (mode serve) partage une seule instance
+# entre ses travaux : limites de débit par fournisseur et cache des
+# réponses y sont alors communs.
+# FournisseursHTTP passe par les API REST avec la seule bibliothèque
+# standard, pour les installations sans SDK (script autonome).
+# ===============================================================
+
+import os
+import json
+import time
+import heapq
+import hashlib
+import itertools
+import threading
+import urllib.error
+import urllib.request
+from collections import OrderedDict
+from typing import Optional, List, Dict, Tuple
+
+from analyseur.echeance import MODELES_RAPIDES
+
+FOURNISSEURS = ("claude", "gemini", "openai")
+
+# Modèle utilisé par défaut pour chaque fournisseur (Gemini : premier modèle accepté)
+MODELES_PRINCIPAUX = {"claude": "claude-3-5-sonnet-20241022", "openai": "gpt-4o"}
+MODELES_GEMINI = ("gemini-2.0-flash", "gemini-1.5-flash", "gemini-1.5-pro")
+
+# Réponses gardées par défaut dans le cache partagé
+TAILLE_CACHE = 1024
+
+# Accès REST sans SDK : variable de la clé, point d'accès, délai par défaut (s)
+CLES_API = {"claude": "ANTHROPIC_API_KEY", "gemini": "GEMINI_API_KEY", "openai": "OPENAI_API_KEY"}
+URL_CLAUDE = "https://api.anthropic.com/v1/messages"
+URL_OPENAI = "https://api.openai.com/v1/chat/completions"
+URL_GEMINI = "https://generativelanguage.googleapis.com/v1beta/models/{modele}:generateContent"
+DELAI_HTTP = 120.0
+
+
+class Flux:
+    """Travail qui partage les fournisseurs avec d'autres : nom et poids dans le partage équitable"""
+
+    def __init__(self, nom: str = "", poids: float = 1.0):
+        self.nom = nom
+        self.poids = max(poids, 1e-3)
+
+
+class Limiteur:
+    """Appels simultanés et appels par minute plafonnés pour un fournisseur (sûr entre fils)
+
+    Quand toutes les places sont prises, la prochaine place libre revient
+    à l'appel en attente de plus petite étiquette de départ (file équitable
+    pondérée, variante « start-time fair queuing ») : chaque flux avance
+    son horloge de cout / poids par appel. Un petit travail qui arrive
+    part à l'horloge courante, il ne passe donc pas derrière tout ce qu'un
+    gros travail a déjà consommé.
+    """
+
+    def __init__(self, concurrence: int = 4, rpm: Optional[float] = None):
+        self.concurrence = concurrence
+        self.rpm = rpm
+        self._condition = threading.Condition()
+        self._libres = concurrence
+        self._file: List[Tuple[float, int]] = []   # tas des (étiquette de départ, n° d'arrivée)
+        self._arrivees = itertools.count()
+        self._virtuel = 0.0                        # étiquette du dernier appel parti
+        self._fins: Dict[object, float] = {}       # étiquette de fin du dernier appel de chaque flux
+        self._prochain = 0.0                       # instant du prochain départ autorisé (rpm)
+        self.attente = 0.0                         # secondes passées à attendre une place, tous flux
+
+    def acquerir(self, flux: Optional[Flux] = None, cout: float = 1.0) -> float:
+        """Attend une place ; renvoie l'attente en secondes"""
+        t0 = time.monotonic()
+        with self._condition:
+            debut = max(self._virtuel, self._fins.get(flux, 0.0))
+            self._fins[flux] = debut + max(cout, 1.0) / (flux.poids if flux else 1.0)
+            ticket = (debut, next(self._arrivees))
+            heapq.heappush(self._file, ticket)
+            while self._libres <= 0 or self._file[0] != ticket:
+                self._condition.wait()
+            heapq.heappop(self._file)
+            self._libres -= 1
+            self._virtuel = max(self._virtuel, debut)
+            if len(self._fins) > 256:
+                # Flux en retard sur l'horloge : leur étiquette ne compte plus
+                self._fins = {f: fin for f, fin in self._fins.items() if fin > self._virtuel}
+            self._condition.notify_all()
+            if self.rpm:
+                depart = max(self._prochain, time.monotonic())
+                self._prochain = depart + 60.0 / self.rpm
+        if self.rpm:
+            time.sleep(max(depart - time.monotonic(), 0.0))
+        attente = time.monotonic() - t0
+        self.attente += attente
+        return attente
+
+    def liberer(self):
+        with self._condition:
+            self._libres += 1
+            self._condition.notify_all()
+
+    def __enter__(self):
+        self.acquerir()
+        return self
+
+    def __exit__(self, *exc):
+        self.liberer()
+
+
+class CacheReponses:
+    """Réponses complètes récentes (LRU en mémoire), clé = fournisseur, modèle et prompt exacts"""
+
+    def __init__(self, taille: int = TAILLE_CACHE):
+        self.taille = taille
+        self._reponses: "OrderedDict[str, Tuple[str, Dict]]" = OrderedDict()
+        self._verrou = threading.Lock()
+        self.nb_trouves = 0
+        self.nb_manques = 0
+
+    @staticmethod
+    def cle(*elements) -> str:
+        return hashlib.sha256(json.dumps(elements, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def obtenir(self, cle: str) -> Optional[Tuple[str, Dict]]:
+        with self._verrou:
+            reponse = self._reponses.get(cle)
+            if reponse is None:
+                self.nb_manques += 1
+                return None
+            self._reponses.move_to_end(cle)
+            self.nb_trouves += 1
+            return reponse
+
+    def garder(self, cle: str, texte: str, infos: Dict):
+        with self._verrou:
+            self._reponses[cle] = (texte, dict(infos))
+            self._reponses.move_to_end(cle)
+            while len(self._reponses) > self.taille:
+                self._reponses.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._reponses)
+
+
+class Fournisseurs:
+    """Clients Claude, Gemini et OpenAI, construits à la demande"""
+
+    def __init__(self, max_retries: int = 0, modeles_gemini: Tuple[str, ...] = MODELES_GEMINI,
+                 limites: Optional[Dict[str, Limiteur]] = None, cache: Optional[CacheReponses] = None,
+                 modeles: Optional[Dict[str, str]] = None):
+        self.max_retries = max_retries
+        self.modeles_gemini = modeles_gemini
+        self.modeles = {**MODELES_PRINCIPAUX, **(modeles or {})}    # modèles principaux Claude / OpenAI
+        self.limites = limites or {}
+        self.cache = cache
+        self._verrou = threading.Lock()
+        self.erreurs: Dict[str, str] = {}
+        self.modele_gemini: Optional[str] = None
+        self._clients: Dict[str, object] = {}
+        self._genai = None
+        self._gemini: Dict[str, object] = {}        # nom de modèle → GenerativeModel
+
+    def _construire(self, nom: str):
+        if nom == "openai":
+            from openai import OpenAI
+            return OpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=self.max_retries)
+        if nom == "claude":
+            import anthropic
+            return anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"), max_retries=self.max_retries)
+        if nom == "gemini":
+            import google.generativeai as genai
+            genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+            self._genai = genai
+            for modele in self.modeles_gemini:
+                try:
+                    client = genai.GenerativeModel(model_name=modele)
+                except Exception:
+                    continue
+                self.modele_gemini = modele
+                self._gemini[modele] = client
+                return client
+            raise RuntimeError("Aucun modèle Gemini disponible parmi : " + ", ".join(self.modeles_gemini))
+        raise ValueError(f"Fournisseur inconnu : {nom}")
+
+    def client(self, nom: str):
+        """Client du fournisseur, ou None s'il est indisponible (raison dans self.erreurs)"""
+        if nom not in self._clients:
+            with self._verrou:
+                if nom not in self._clients:
+                    try:
+                        self._clients[nom] = self._construire(nom)
+                    except Exception as e:
+                        self._clients[nom] = None
+                        self.erreurs[nom] = str(e)
+        return self._clients[nom]
+
+    def disponible(self, nom: str) -> bool:
+        return self.client(nom) is not None
+
+    def disponibilites(self) -> Dict[str, bool]:
+        return {nom: self.disponible(nom) for nom in FOURNISSEURS}
+
+    def _modele_gemini(self, nom: str):
+        if nom not in self._gemini:
+            with self._verrou:
+                if nom not in self._gemini:
+                    self._gemini[nom] = self._genai.GenerativeModel(model_name=nom)
+        return self._gemini[nom]
+
+    def appeler(self, nom: str, system_prompt: str, echanges: List[Dict], temperature: float,
+                max_tokens: int, delai: Optional[float] = None, rapide: bool = False,
+                modele: Optional[str] = None, flux: Optional[Flux] = None) -> Tuple[str, bool, Dict]:
+        """Un appel ; renvoie (texte, tronqué, infos : modèle, jetons, attente d'une place)
+
+        modele remplace le modèle principal du fournisseur (rapide : modèle de repli).
+        Une réponse complète déjà obtenue pour le même prompt est reprise du
+        cache (infos["cache"] vrai) ; sinon l'appel attend une place auprès du
+        limiteur du fournisseur, partagée équitablement entre les flux selon
+        leur poids (le coût d'un appel est son budget max_tokens).
+        """
+        cle = None
+        if self.cache is not None:
+            cle = CacheReponses.cle(nom, modele or self.modeles.get(nom), rapide, system_prompt, echanges,
+                                    temperature, max_tokens)
+            reponse = self.cache.obtenir(cle)
+            if reponse is not None:
+                return reponse[0], False, dict(reponse[1], cache=True)
+        limiteur = self.limites.get(nom)
+        attente = limiteur.acquerir(flux, max_tokens) if limiteur else 0.0
+        try:
+            texte, tronque, infos = self._appeler(nom, system_prompt, echanges, temperature, max_tokens,
+                                                  delai, rapide, modele)
+        finally:
+            if limiteur:
+                limiteur.liberer()
+        # Une réponse tronquée sera complétée par des continuations : seule une réponse entière est gardée
+        if cle is not None and not tronque:
+            self.cache.garder(cle, texte, infos)
+        if attente:
+            infos = dict(infos, attente_sec=attente)
+        return texte, tronque, infos
+
+    def _appeler(self, nom: str, system_prompt: str, echanges: List[Dict], temperature: float,
+                 max_tokens: int, delai: Optional[float], rapide: bool,
+                 modele: Optional[str]) -> Tuple[str, bool, Dict]:
+        """Un appel brut au SDK du fournisseur"""
+        client = self.client(nom)
+        if client is None:
+            raise ValueError(f"Modèle {nom} non disponible.")
+        delais = {"timeout": delai} if delai is not None else {}
+
+        if nom == "claude":
+            modele = MODELES_RAPIDES["claude"] if rapide else modele or self.modeles["claude"]
+            response = client.messages.create(
+                model=modele,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=system_prompt,
+                messages=echanges,
+                **delais
+            )
+            infos = {"modele": modele, "jetons_entree": response.usage.input_tokens,
+                     "jetons_sortie": response.usage.output_tokens}
+            return response.content[0].text, response.stop_reason == "max_tokens", infos
+
+        if nom == "gemini":
+            contents = [{"role": "user" if e["role"] == "user" else "model", "parts": [e["content"]]}
+                        for e in echanges]
+            contents[0]["parts"] = [f"{system_prompt}\n\n{echanges[0]['content']}"]
+            if rapide:
+                client = self._modele_gemini(MODELES_RAPIDES["gemini"])
+            elif modele:
+                client = self._modele_gemini(modele)
+            response = client.generate_content(
+                contents=contents,
+                generation_config=self._genai.GenerationConfig(
+                    temperature=temperature,
+                    max_output_tokens=max_tokens
+                ),
+                request_options=delais
+            )
+            raison = getattr(response.candidates[0].finish_reason, "name", response.candidates[0].finish_reason)
+            usage = getattr(response, "usage_metadata", None)
+            infos = {"modele": getattr(client, "model_name", "gemini"),
+                     "jetons_entree": getattr(usage, "prompt_token_count", None),
+                     "jetons_sortie": getattr(usage, "candidates_token_count", None)}
+            return response.text, raison in ("MAX_TOKENS", 2), infos
+
+        modele = MODELES_RAPIDES["openai"] if rapide else modele or self.modeles["openai"]
+        response = client.chat.completions.create(
+            model=modele,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            messages=[{"role": "system", "content": system_prompt}] + echanges,
+            **delais
+        )
+        choix = response.choices[0]
+        infos = {"modele": modele, "jetons_entree": response.usage.prompt_tokens,
+                 "jetons_sortie": response.usage.completion_tokens}
+        return choix.message.content, choix.finish_reason == "length", infos
+
+
+class FournisseursHTTP(Fournisseurs):
+    """Mêmes fournisseurs par leurs API REST, sans SDK (bibliothèque standard seulement)"""
+
+    def _construire(self, nom: str):
+        if nom not in CLES_API:
+            raise ValueError(f"Fournisseur inconnu : {nom}")
+        cle = os.getenv(CLES_API[nom])
+        if not cle:
+            raise RuntimeError(f"{CLES_API[nom]} non définie")
+        if nom == "gemini":
+            self.modele_gemini = self.modeles_gemini[0]
+        return cle
+
+    @staticmethod
+    def _poster(url: str, entetes: Dict[str, str], corps: Dict, delai: Optional[float]) -> Dict:
+        requete = urllib.request.Request(url, json.dumps(corps).encode("utf-8"),
+                                         {"content-type": "application/json", **entetes})
+        try:
+            with urllib.request.urlopen(requete, timeout=delai or DELAI_HTTP) as reponse:
+                return json.load(reponse)
+        except urllib.error.HTTPError as e:
+            raise RuntimeError(f"HTTP {e.code} : {e.read().decode('utf-8', 'replace')[:200]}") from None
+
+    def _appeler(self, nom: str, system_prompt: str, echanges: List[Dict], temperature: float,
+                 max_tokens: int, delai: Optional[float], rapide: bool,
+                 modele: Optional[str]) -> Tuple[str, bool, Dict]:
+        cle = self.client(nom)
+        if cle is None:
+            raise ValueError(f"Modèle {nom} non disponible.")
+
+        if nom == "claude":
+            modele = MODELES_RAPIDES["claude"] if rapide else modele or self.modeles["claude"]
+            reponse = self._poster(URL_CLAUDE, {"x-api-key": cle, "anthropic-version": "2023-06-01"},
+                                   {"model": modele, "max_tokens": max_tokens, "temperature": temperature,
+                                    "system": system_prompt, "messages": echanges}, delai)
+            infos = {"modele": modele, "jetons_entree": reponse["usage"]["input_tokens"],
+                     "jetons_sortie": reponse["usage"]["output_tokens"]}
+            return reponse["content"][0]["text"], reponse.get("stop_reason") == "max_tokens", infos
+
+        if nom == "gemini":
+            modele = MODELES_RAPIDES["gemini"] if rapide else modele or self.modele_gemini
+            contenus = [{"role": "user" if e["role"] == "user" else "model", "parts": [{"text": e["content"]}]}
+                        for e in echanges]
+            reponse = self._poster(URL_GEMINI.format(modele=modele), {"x-goog-api-key": cle},
+                                   {"systemInstruction": {"parts": [{"text": system_prompt}]},
+                                    "contents": contenus,
+                                    "generationConfig": {"temperature": temperature,
+                                                         "maxOutputTokens": max_tokens}}, delai)
+            candidat = reponse["candidates"][0]
+            usage = reponse.get("usageMetadata", {})
+            infos = {"modele": modele, "jetons_entree": usage.get("promptTokenCount"),
+                     "jetons_sortie": usage.get("candidatesTokenCount")}
+            texte = "".join(partie.get("text", "") for partie in candidat["content"]["parts"])
+            return texte, candidat.get("finishReason") == "MAX_TOKENS", infos
+
+        modele = MODELES_RAPIDES["openai"] if rapide else modele or self.modeles["openai"]
+        reponse = self._poster(URL_OPENAI, {"authorization": f"Bearer {cle}"},
+                               {"model": modele, "temperature": temperature, "max_tokens": max_tokens,
+                                "messages": [{"role": "system", "content": system_prompt}] + echanges}, delai)
+        choix = reponse["choices"][0]
+        infos = {"modele": modele, "jetons_entree": reponse["usage"]["prompt_tokens"],
+                 "jetons_sortie": reponse["usage"]["completion_tokens"]}
+        return choix["message"]["content"], choix["finish_reason"] == "length", infos
@@ -0,0 +1,449 @@
+# ===============================================================
+# analyseur/latex.py — Lexer LaTeX en une passe et arbre des sections
+# ===============================================================
+# Un seul parcours linéaire du source repère les titres de
+# sectionnement (part … subparagraph, variantes étoilées, titre
+# court optionnel, accolades imbriquées) et compte les mots au fil
+# de l'eau : chaque nœud de l'arbre reçoit ses offsets et son
+# nombre de mots sans nouveau balayage du texte.
+# ===============================================================
+
+import os
+import re
+from array import array
+from bisect import bisect_right
+from typing import Optional, List, Dict, Iterator, Tuple, Union
+
+from analyseur.sources import lire_source
+
+# Profondeur de chaque commande de sectionnement
+NIVEAUX = {
+    "part": -1,
+    "chapter": 0,
+    "section": 1,
+    "subsection": 2,
+    "subsubsection": 3,
+    "paragraph": 4,
+    "subparagraph": 5,
+}
+NIVEAU_RACINE = -2
+
+# Commandes qui insèrent un autre fichier source
+INCLUSIONS = ("input", "include", "subfile")
+
+# Longueur maximale explorée pour lire un titre (protège des accolades non fermées)
+MAX_TITRE = 2000
+
+# Texte libre suivi d'un jeton : commande (avec son argument simple
+# éventuel), symbole de contrôle, commentaire, accolade ou fin du
+# source. Le jeton réussit toujours après le texte libre : aucun
+# retour arrière, même sur une longue fin de fichier sans commande.
+_JETON = re.compile(r'([^\\%{}]*)(?:\\(?:([A-Za-z@]+)(\*?)(\{[^{}\\%]*\})?|.|\Z)|%[^\n]*|([{}])|\Z)', re.S)
+_BLANCS = re.compile(r'\s*')
+
+# Un titre ne franchit ni une ligne vide (\par) ni un autre titre : l'exploration
+# d'un titre non fermé s'arrête là, chaque caractère n'est lu qu'une fois
+_FIN_TITRE = re.compile(r'\n[ \t]*\n|\\(?:' + "|".join(NIVEAUX) + r')(?![A-Za-z@])')
+
+# Granularité de la table d'accès direct de l'index des mots (2**8 = 256 caractères)
+_BLOC = 8
+
+
+class Noeud:
+    """Nœud de l'arbre des sections (la racine représente le document)"""
+
+    __slots__ = ("type", "niveau", "titre", "titre_court", "etoile",
+                 "debut", "debut_contenu", "fin", "fin_propre",
+                 "mots_debut", "nb_mots", "nb_mots_propres", "enfants", "parent")
+
+    def __init__(self, type: str, niveau: int, titre: str, debut: int, debut_contenu: int,
+                 mots_debut: int, titre_court: Optional[str] = None, etoile: bool = False,
+                 parent: Optional["Noeud"] = None):
+        self.type = type
+        self.niveau = niveau
+        self.titre = titre
+        self.titre_court = titre_court
+        self.etoile = etoile
+        self.debut = debut                  # offset du \section
+        self.debut_contenu = debut_contenu  # offset après le titre
+        self.fin = debut                    # fin du nœud, enfants compris
+        self.fin_propre = None              # fin du texte avant le premier enfant
+        self.mots_debut = mots_debut
+        self.nb_mots = 0                    # mots du nœud, enfants compris
+        self.nb_mots_propres = 0            # mots avant le premier enfant
+        self.enfants: List["Noeud"] = []
+        self.parent = parent
+
+    def _fermer(self, fin: int, mots: int):
+        self.fin = fin
+        self.nb_mots = mots - self.mots_debut
+        if self.fin_propre is None:
+            self.fin_propre = fin
+            self.nb_mots_propres = self.nb_mots
+
+    def __iter__(self) -> Iterator["Noeud"]:
+        """Parcours préfixe des descendants"""
+        pile = list(reversed(self.enfants))
+        while pile:
+            noeud = pile.pop()
+            yield noeud
+            pile.extend(reversed(noeud.enfants))
+
+    def __repr__(self) -> str:
+        return f"Noeud({self.type}{'*' if self.etoile else ''}, {self.titre!r}, {self.debut}:{self.fin}, {self.nb_mots} mots)"
+
+
+class IndexMots:
+    """Sommes cumulées des mots du document nettoyé.
+
+    Le lexer enregistre chaque segment de texte compté (début, fin,
+    mots cumulés avant lui). Une table indexée par blocs de 256
+    caractères donne directement le segment qui couvre un offset :
+    le nombre de mots de n'importe quel intervalle [debut, fin) se lit
+    en temps constant, exactement aux frontières de jetons (donc aux
+    titres) et par un court comptage partiel à l'intérieur d'un segment.
+    """
+
+    __slots__ = ("document", "longueur", "debuts", "fins", "avants", "fusions", "total", "blocs")
+
+    def __init__(self, longueur: int):
+        self.document = None       # DocumentLatex propriétaire (texte chargé à la demande)
+        self.longueur = longueur
+        self.debuts = array("q")
+        self.fins = array("q")
+        self.avants = array("q")
+        self.fusions = bytearray()
+        self.total = 0
+        self.blocs = array("q")
+
+    def _terminer(self, total: int):
+        self.total = total
+        nb_blocs = (self.longueur >> _BLOC) + 1
+        debuts = self.debuts
+        self.blocs = array("q", (bisect_right(debuts, b << _BLOC) - 1 for b in range(nb_blocs)))
+
+    def mots_avant(self, offset: int) -> int:
+        """Mots entièrement ou partiellement situés avant offset"""
+        if offset <= 0 or not self.debuts:
+            return 0
+        if offset >= self.longueur:
+            return self.total
+        debuts = self.debuts
+        i = self.blocs[offset >> _BLOC]
+        dernier = len(debuts) - 1
+        while i < dernier and debuts[i + 1] <= offset:
+            i += 1
+        if i < 0:
+            return 0
+        if offset >= self.fins[i]:
+            return self.avants[i + 1] if i < dernier else self.total
+        n = len(self.document.contenu[debuts[i]:offset].split())
+        return self.avants[i] + max(n - self.fusions[i], 0)
+
+    def mots_entre(self, debut: int, fin: int) -> int:
+        """Nombre de mots de l'intervalle [debut, fin)"""
+        return self.mots_avant(fin) - self.mots_avant(debut)
+
+
+def _lire_groupe(contenu: str, i: int, ouvrant: str, fermant: str) -> int:
+    """Offset juste après le groupe équilibré commençant en i, ou -1"""
+    profondeur = 0
+    limite = min(len(contenu), i + MAX_TITRE)
+    coupure = _FIN_TITRE.search(contenu, i + 1, limite)
+    if coupure:
+        limite = coupure.start()
+    while i < limite:
+        c = contenu[i]
+        if c == "\\":
+            i += 2
+            continue
+        if c == ouvrant:
+            profondeur += 1
+        elif c == fermant:
+            profondeur -= 1
+            if profondeur == 0:
+                return i + 1
+        i += 1
+    return -1
+
+
+def _lire_titre(contenu: str, i: int) -> Optional[Tuple[Optional[str], str, int]]:
+    """Lit '[court]{titre}' à partir de i ; renvoie (court, titre, fin) ou None"""
+    i = _BLANCS.match(contenu, i).end()
+    court = None
+    if contenu.startswith("[", i):
+        fin = _lire_groupe(contenu, i, "[", "]")
+        if fin < 0:
+            return None
+        court = contenu[i + 1:fin - 1].strip()
+        i = _BLANCS.match(contenu, fin).end()
+    if not contenu.startswith("{", i):
+        return None
+    fin = _lire_groupe(contenu, i, "{", "}")
+    if fin < 0:
+        return None
+    return court, contenu[i + 1:fin - 1].strip(), fin
+
+
+class DocumentLatex:
+    """Source analysé : texte, arbre des sections, index des mots et inclusions.
+
+    Le texte n'est pas conservé lors de la sérialisation : un document
+    relu depuis le cache ne recharge son fichier (chemin) que lorsqu'un
+    extrait est réellement demandé, après avoir vérifié que le fichier
+    n'a pas changé depuis l'analyse (signature = mtime, taille).
+    """
+
+    __slots__ = ("_contenu", "chemin", "encodage", "signature", "longueur", "racine", "index",
+                 "inclusions")
+
+    def __init__(self, contenu: str, racine: Noeud, index: IndexMots,
+                 inclusions: Optional[List[Tuple[int, int, str, str]]] = None,
+                 chemin: Optional[str] = None, encodage: Optional[str] = None):
+        self._contenu = contenu
+        self.chemin = chemin
+        self.encodage = encodage     # encodage détecté à la lecture, réutilisé pour relire
+        self.signature: Optional[Tuple[int, int]] = None    # (mtime_ns, taille) lors de l'analyse
+        self.longueur = len(contenu)
+        self.racine = racine
+        self.index = index
+        self.inclusions = inclusions or []   # (debut, fin, commande, cible)
+        index.document = self
+
+    @property
+    def contenu(self) -> str:
+        if self._contenu is None:
+            # Les offsets de l'arbre et de l'index ne valent que pour le fichier analysé
+            infos = os.stat(self.chemin)
+            if self.signature is not None and (infos.st_mtime_ns, infos.st_size) != self.signature:
+                raise RuntimeError(f"{self.chemin} a été modifié depuis son analyse, relancer l'analyse")
+            contenu = lire_source(self.chemin, self.encodage)
+            if len(contenu) != self.longueur:
+                raise RuntimeError(f"{self.chemin} a été modifié depuis son analyse, relancer l'analyse")
+            self._contenu = contenu
+        return self._contenu
+
+    def __getstate__(self):
+        return {nom: getattr(self, nom) for nom in self.__slots__ if nom != "_contenu"}
+
+    def __setstate__(self, etat):
+        self._contenu = None
+        for nom, valeur in etat.items():
+            setattr(self, nom, valeur)
+
+    def __iter__(self) -> Iterator[Noeud]:
+        return iter(self.racine)
+
+    def nb_mots(self, debut: int = 0, fin: Optional[int] = None) -> int:
+        return self.index.mots_entre(debut, self.longueur if fin is None else fin)
+
+    def sections(self, mode: Dict, imbrique: bool = False) -> List["Section"]:
+        return extraire_chapitres(self, mode, imbrique)
+
+    def compter(self, mode: Dict, imbrique: bool = False) -> Tuple[int, int]:
+        return compter_sections(self, mode, imbrique)
+
+
+class Section:
+    """Section retenue pour l'analyse : positions dans le source, sans copie du texte.
+
+    Le texte n'est construit qu'à la lecture de l'attribut texte, au
+    moment d'assembler le prompt, puis n'est plus référencé. L'accès
+    par clé (section["titre"]) reste possible pour les scripts
+    qui manipulaient des dictionnaires.
+    """
+
+    __slots__ = ("type", "titre", "titre_court", "etoile", "fichier", "fragments", "nb_mots")
+
+    def __init__(self, type: str, titre: str, fragments: List[Tuple[DocumentLatex, int, int]],
+                 nb_mots: int, titre_court: Optional[str] = None, etoile: bool = False,
+                 fichier: Optional[str] = None):
+        self.type = type
+        self.titre = titre
+        self.titre_court = titre_court
+        self.etoile = etoile
+        self.fichier = fichier
+        self.fragments = fragments          # (document, debut, fin), dans l'ordre du texte
+        self.nb_mots = nb_mots
+
+    @property
+    def debut(self) -> int:
+        return self.fragments[0][1] if self.fragments else 0
+
+    @property
+    def fin(self) -> int:
+        return self.fragments[-1][2] if self.fragments else 0
+
+    @property
+    def texte(self) -> str:
+        if len(self.fragments) == 1:
+            document, debut, fin = self.fragments[0]
+            return document.contenu[debut:fin]
+        return "".join(document.contenu[debut:fin] for document, debut, fin in self.fragments)
+
+    def __getitem__(self, cle: str):
+        try:
+            return getattr(self, cle)
+        except AttributeError:
+            raise KeyError(cle) from None
+
+    def get(self, cle: str, defaut=None):
+        return getattr(self, cle, defaut)
+
+    def __repr__(self) -> str:
+        return f"Section({self.type}, {self.titre!r}, {self.nb_mots} mots)"
+
+
+def analyser_document(contenu: str, chemin: Optional[str] = None,
+                      encodage: Optional[str] = None) -> DocumentLatex:
+    """Construit l'arbre des sections et l'index des mots en un seul passage.
+
+    Les mots sont comptés comme le faisait compter_mots : les noms de
+    commandes et le premier argument entre accolades d'une commande
+    sont ignorés, les titres de sectionnement aussi ; les commentaires
+    ne comptent pas.
+    """
+    index = IndexMots(len(contenu))
+    inclusions = []
+    debuts, fins, avants, fusions = (index.debuts.append, index.fins.append,
+                                     index.avants.append, index.fusions.append)
+    racine = Noeud("document", NIVEAU_RACINE, "", 0, 0, 0)
+    pile = [racine]
+    mots = 0
+    colle = False          # le texte précédent finit par un caractère non blanc
+    ignore = 0             # profondeur dans un argument de commande ignoré
+    attente = -1           # offset où '{' ouvrirait l'argument de la dernière commande
+    pos = 0
+
+    while True:
+        relance = None
+        for m in _JETON.finditer(contenu, pos):
+            texte, nom, etoile, argument, accolade = m.groups()
+            pos = m.end()
+
+            if texte and not ignore:
+                n = len(texte.split())
+                if n:
+                    fusion = colle and not texte[0].isspace()
+                    debut = m.start()
+                    debuts(debut)
+                    fins(debut + len(texte))
+                    avants(mots)
+                    fusions(fusion)
+                    mots += n - fusion
+                    colle = not texte[-1].isspace()
+                else:
+                    colle = False
+
+            if accolade:
+                if accolade == "{":
+                    if ignore:
+                        ignore += 1
+                    elif pos - 1 == attente:
+                        ignore = 1
+                elif ignore:
+                    ignore -= 1
+                continue
+            if nom is None:
+                continue
+
+            niveau = NIVEAUX.get(nom)
+            if niveau is None or ignore:
+                if argument is None:
+                    attente = pos
+                elif nom in INCLUSIONS and not ignore:
+                    inclusions.append((m.start() + len(texte), pos, nom, argument[1:-1].strip()))
+                continue
+            if argument is not None:
+                court, titre, fin_titre = None, argument[1:-1].strip(), pos
+            else:
+                lu = _lire_titre(contenu, pos)
+                if lu is None:
+                    continue
+                court, titre, fin_titre = lu
+
+            debut = m.start() + len(texte)
+            while pile[-1].niveau >= niveau:
+                pile.pop()._fermer(debut, mots)
+            parent = pile[-1]
+            if parent.fin_propre is None:
+                parent.fin_propre = debut
+                parent.nb_mots_propres = mots - parent.mots_debut
+            noeud = Noeud(nom, niveau, titre, debut, fin_titre, mots, court, etoile == "*", parent)
+            parent.enfants.append(noeud)
+            pile.append(noeud)
+            colle = False
+            if fin_titre != pos:
+                relance = fin_titre
+                break
+        if relance is None:
+            break
+        pos = relance
+
+    while pile:
+        pile.pop()._fermer(len(contenu), mots)
+    index._terminer(mots)
+    return DocumentLatex(contenu, racine, index, inclusions, chemin, encodage)
+
+
+def analyser_latex(contenu: str) -> Noeud:
+    """Arbre des sections d'un source LaTeX (voir analyser_document)"""
+    return analyser_document(contenu).racine
+
+
+def compter_mots(txt: str) -> int:
+    """Nombre de mots d'un texte LaTeX (commandes et arguments exclus)"""
+    return analyser_latex(txt).nb_mots
+
+
+def _fin_section(noeud: Noeud, niveaux: List[str], imbrique: bool) -> int:
+    """Fin du texte d'une section retenue.
+
+    Sans imbrication, le texte s'arrête au premier sous-titre d'un type
+    retenu par le mode (qui fera l'objet de sa propre section) ; les
+    sous-titres plus fins, non retenus, restent dans le texte.
+    """
+    if not imbrique:
+        for descendant in noeud:
+            if descendant.type in niveaux:
+                return descendant.debut
+    return noeud.fin
+
+
+def extraire_chapitres(contenu: Union[str, DocumentLatex], mode: Dict,
+                       imbrique: bool = False) -> List[Section]:
+    """Sections retenues pour un mode d'analyse.
+
+    Sans imbrication, le texte d'une section s'arrête au titre retenu
+    suivant ou au titre de même niveau ; avec imbrication, il inclut
+    toutes ses sous-sections. Passer un DocumentLatex déjà analysé évite tout
+    nouveau passage sur le source : changer de mode ne coûte que la
+    lecture de l'index des mots.
+    """
+    document = contenu if isinstance(contenu, DocumentLatex) else analyser_document(contenu)
+    index = document.index
+    niveaux, min_mots = mode["niveaux"], mode["min_mots"]
+    chapitres = []
+    for noeud in document:
+        if noeud.type not in niveaux:
+            continue
+        fin = _fin_section(noeud, niveaux, imbrique)
+        nb_mots = index.mots_entre(noeud.debut, fin)
+        if nb_mots >= min_mots:
+            chapitres.append(Section(noeud.type, noeud.titre, [(document, noeud.debut, fin)], nb_mots,
+                                     noeud.titre_court, noeud.etoile, document.chemin))
+    return chapitres
+
+
+def compter_sections(document: DocumentLatex, mode: Dict, imbrique: bool = False) -> Tuple[int, int]:
+    """(sections retenues, mots) pour un mode, sans construire les textes"""
+    index = document.index
+    nb_sections = nb_mots = 0
+    for noeud in document:
+        if noeud.type not in mode["niveaux"]:
+            continue
+        mots = index.mots_entre(noeud.debut, _fin_section(noeud, mode["niveaux"], imbrique))
+        if mots >= mode["min_mots"]:
+            nb_sections += 1
+            nb_mots += mots
+    return nb_sections, nb_mots
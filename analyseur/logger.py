@@ -0,0 +1,152 @@
+# ===============================================================
+# analyseur/logger.py — Journal texte écrit par un fil dédié
+# ===============================================================
+# log() ne fait que déposer l'entrée dans une file (jamais bloquante,
+# utilisable depuis n'importe quel fil ou tâche asyncio) ; un fil
+# d'écriture regroupe les entrées et les écrit par lots, dès que le
+# lot est plein ou que l'intervalle est écoulé. Le fichier reste
+# ouvert pendant tout le run. Les entrées en attente sont écrites à
+# la sortie du programme et à la réception de SIGTERM.
+# ===============================================================
+
+import sys
+import json
+import time
+import queue
+import atexit
+import signal
+import threading
+from datetime import datetime
+from typing import Optional, List
+
+# Un lot est écrit dès qu'il atteint cette taille ou que cet intervalle est écoulé
+TAILLE_LOT = 256
+INTERVALLE = 0.5
+
+# Signaux après lesquels le journal est vidé avant l'arrêt
+SIGNAUX = tuple(getattr(signal, nom) for nom in ("SIGTERM", "SIGHUP") if hasattr(signal, nom))
+
+_ARRET = object()
+
+
+class Logger:
+    """Enregistre les étapes de l'analyse (texte ou JSON Lines), sans bloquer l'appelant"""
+
+    def __init__(self, chemin: str, structure: bool = False, taille_lot: int = TAILLE_LOT,
+                 intervalle: float = INTERVALLE, signaux: bool = True):
+        self.chemin = chemin
+        self.structure = structure        # True : une ligne JSON par entrée
+        self.taille_lot = taille_lot
+        self.intervalle = intervalle
+        self.debut = time.time()
+        self._file = queue.SimpleQueue()
+        self._fichier = open(chemin, "w", encoding="utf-8")
+        if not structure:
+            self._fichier.write("=" * 60 + "\n")
+            self._fichier.write("LOG D'ANALYSE MULTI-AGENT\n")
+            self._fichier.write("=" * 60 + "\n\n")
+            self._fichier.write(f"Début : {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            self._fichier.flush()
+        self._fil = threading.Thread(target=self._ecrivain, name="logger", daemon=True)
+        self._fil.start()
+        atexit.register(self.fermer)
+        if signaux:
+            self._installer_signaux()
+
+    # ---------------------------------------------------------------
+    # Côté appelant
+    # ---------------------------------------------------------------
+
+    def log(self, message: str, **champs):
+        """Ajoute une entrée au log (champs : données supplémentaires du format JSON)"""
+        self._file.put((time.time(), threading.current_thread().name, message, champs))
+
+    def vider(self, delai: Optional[float] = 5.0):
+        """Attend que les entrées déjà déposées soient écrites sur disque"""
+        if not self._fil.is_alive():
+            return
+        ecrit = threading.Event()
+        self._file.put(ecrit)
+        ecrit.wait(delai)
+
+    def fin(self):
+        """Marque la fin de l'analyse et ferme le journal"""
+        duree = time.time() - self.debut
+        if self.structure:
+            self.log("fin", duree=round(duree, 1))
+        else:
+            self._file.put(f"\nFin : {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                           f"Durée totale : {duree:.1f} secondes ({duree/60:.1f} minutes)\n")
+        self.fermer()
+
+    def fermer(self):
+        if self._fil.is_alive():
+            self._file.put(_ARRET)
+            self._fil.join()
+        if not self._fichier.closed:
+            self._fichier.close()
+        atexit.unregister(self.fermer)
+
+    # ---------------------------------------------------------------
+    # Fil d'écriture
+    # ---------------------------------------------------------------
+
+    def _formater(self, entree) -> str:
+        if isinstance(entree, str):
+            return entree
+        horodatage, fil, message, champs = entree
+        moment = datetime.fromtimestamp(horodatage)
+        if self.structure:
+            enregistrement = {"horodatage": moment.isoformat(timespec="milliseconds"),
+                              "fil": fil, "message": message}
+            enregistrement.update(champs)
+            return json.dumps(enregistrement, ensure_ascii=False, default=str) + "\n"
+        return f"[{moment.strftime('%H:%M:%S')}] {message}\n"
+
+    def _ecrivain(self):
+        lot: List[str] = []
+        echeance = None
+        while True:
+            try:
+                attente = None if echeance is None else max(echeance - time.monotonic(), 0)
+                entree = self._file.get(timeout=attente)
+            except queue.Empty:
+                entree = None
+            if entree is not None and not isinstance(entree, threading.Event) and entree is not _ARRET:
+                lot.append(self._formater(entree))
+                if echeance is None:
+                    echeance = time.monotonic() + self.intervalle
+                if len(lot) < self.taille_lot:
+                    continue
+            # Lot plein, intervalle écoulé, demande de vidage ou arrêt : écriture groupée
+            if lot:
+                self._fichier.write("".join(lot))
+                self._fichier.flush()
+                lot = []
+            echeance = None
+            if isinstance(entree, threading.Event):
+                entree.set()
+            elif entree is _ARRET:
+                return
+
+    # ---------------------------------------------------------------
+    # Signaux
+    # ---------------------------------------------------------------
+
+    def _installer_signaux(self):
+        if threading.current_thread() is not threading.main_thread():
+            return
+        for numero in SIGNAUX:
+            precedent = signal.getsignal(numero)
+
+            def gestionnaire(recu, cadre, precedent=precedent):
+                self.vider()
+                if callable(precedent):
+                    precedent(recu, cadre)
+                elif precedent != signal.SIG_IGN:
+                    sys.exit(128 + recu)
+
+            try:
+                signal.signal(numero, gestionnaire)
+            except (ValueError, OSError):
+                pass
@@ -0,0 +1,239 @@
+# ===============================================================
+# analyseur/manuscrit.py — Manuscrits multi-fichiers et cache d'analyse
+# ===============================================================
+# Un manuscrit réel est découpé en \include{chap1}, \input{...} ou
+# \subfile{...}. Chaque fichier est analysé séparément (arbre, index
+# des mots, inclusions), puis les fichiers sont assemblés dans l'ordre
+# du document : une section peut donc commencer dans un fichier et
+# se poursuivre dans un autre. Les analyses sont mises en cache sur
+# disque, indexées par chemin + mtime + taille : lors d'une nouvelle
+# exécution, seuls les fichiers modifiés sont relus et ré-analysés.
+# ===============================================================
+
+import os
+import pickle
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional, List, Dict, Iterator, Tuple
+
+from analyseur.latex import DocumentLatex, Section, analyser_document, NIVEAU_RACINE
+from analyseur.sources import charger_source
+
+DOSSIER_CACHE = ".cache_analyseur"
+
+# Version du format des analyses en cache (à incrémenter si le lexer ou le format change)
+VERSION_CACHE = 3
+
+
+class CacheAnalyses:
+    """Analyses de fichiers LaTeX, en mémoire et sur disque, clé = chemin + mtime + taille"""
+
+    def __init__(self, dossier: Optional[str] = DOSSIER_CACHE):
+        self.dossier = Path(dossier) / "analyses" if dossier else None
+        self.memoire: Dict[str, Tuple[Tuple[int, int], DocumentLatex]] = {}
+        self.nb_relus = 0
+        self.nb_reutilises = 0
+
+    def _fichier_cache(self, chemin: str) -> Path:
+        return self.dossier / (hashlib.sha1(chemin.encode("utf-8")).hexdigest() + ".pkl")
+
+    def document(self, chemin: str) -> DocumentLatex:
+        """Analyse du fichier, relue seulement s'il a changé depuis la dernière fois"""
+        chemin = os.path.abspath(chemin)
+        infos = os.stat(chemin)
+        cle = (infos.st_mtime_ns, infos.st_size)
+
+        en_memoire = self.memoire.get(chemin)
+        if en_memoire and en_memoire[0] == cle:
+            self.nb_reutilises += 1
+            return en_memoire[1]
+
+        if self.dossier:
+            try:
+                with open(self._fichier_cache(chemin), "rb") as f:
+                    version, cle_disque, document = pickle.load(f)
+                if version == VERSION_CACHE and cle_disque == cle:
+                    document.chemin = chemin
+                    self.memoire[chemin] = (cle, document)
+                    self.nb_reutilises += 1
+                    return document
+            except (OSError, pickle.UnpicklingError, EOFError, ValueError, AttributeError):
+                pass
+
+        contenu, encodage = charger_source(chemin)
+        document = analyser_document(contenu, chemin, encodage)
+        document.signature = cle
+        self.nb_relus += 1
+        self.memoire[chemin] = (cle, document)
+        if self.dossier:
+            try:
+                self.dossier.mkdir(parents=True, exist_ok=True)
+                cible = self._fichier_cache(chemin)
+                temporaire = cible.with_name(f"{cible.stem}.{os.getpid()}.{threading.get_ident()}.tmp")
+                with open(temporaire, "wb") as f:
+                    pickle.dump((VERSION_CACHE, cle, document), f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temporaire, cible)
+            except OSError:
+                pass
+        return document
+
+
+class SectionManuscrit:
+    """Section d'un manuscrit ; son texte peut couvrir plusieurs fichiers"""
+
+    __slots__ = ("type", "niveau", "titre", "titre_court", "etoile", "fichier",
+                 "fragments", "enfants", "parent")
+
+    def __init__(self, type: str, niveau: int, titre: str, fichier: Optional[str],
+                 titre_court: Optional[str] = None, etoile: bool = False,
+                 parent: Optional["SectionManuscrit"] = None):
+        self.type = type
+        self.niveau = niveau
+        self.titre = titre
+        self.titre_court = titre_court
+        self.etoile = etoile
+        self.fichier = fichier                              # fichier contenant le titre
+        self.fragments: List[Tuple[DocumentLatex, int, int]] = []   # texte propre, avant le 1er enfant
+        self.enfants: List["SectionManuscrit"] = []
+        self.parent = parent
+
+    def __iter__(self) -> Iterator["SectionManuscrit"]:
+        """Parcours préfixe des descendants"""
+        pile = list(reversed(self.enfants))
+        while pile:
+            section = pile.pop()
+            yield section
+            pile.extend(reversed(section.enfants))
+
+    def tous_fragments(self, arret: Optional[List[str]] = None) -> List[Tuple[DocumentLatex, int, int]]:
+        """Fragments de la section, sous-sections comprises.
+
+        arret : types de titres qui terminent le texte (sous-sections
+        analysées séparément) ; les sous-titres d'autres types restent inclus.
+        """
+        fragments = list(self.fragments)
+        for enfant in self:
+            if arret and enfant.type in arret:
+                break
+            for document, debut, fin in enfant.fragments:
+                # Fragments contigus du même fichier : un seul intervalle
+                if fragments and fragments[-1][0] is document and fragments[-1][2] == debut:
+                    fragments[-1] = (document, fragments[-1][1], fin)
+                else:
+                    fragments.append((document, debut, fin))
+        return fragments
+
+    def __repr__(self) -> str:
+        return f"SectionManuscrit({self.type}, {self.titre!r}, {self.fichier})"
+
+
+def _mots(fragments) -> int:
+    return sum(doc.index.mots_entre(debut, fin) for doc, debut, fin in fragments)
+
+
+class Manuscrit:
+    """Fichier principal et fichiers inclus, assemblés en un seul arbre de sections"""
+
+    def __init__(self, principal: str, cache: Optional[CacheAnalyses] = None):
+        self.principal = os.path.abspath(principal)
+        self.racine_projet = os.path.dirname(self.principal)
+        self.cache = cache or CacheAnalyses()
+        self.documents: Dict[str, DocumentLatex] = {}
+        self.manquants: List[str] = []
+        self.racine = SectionManuscrit("document", NIVEAU_RACINE, "", self.principal)
+        self._assembler()
+
+    def _resoudre(self, cible: str, depuis: str) -> Optional[str]:
+        """Chemin du fichier inclus (relatif au fichier principal, puis au fichier courant)"""
+        for base in (self.racine_projet, os.path.dirname(depuis)):
+            for candidat in (cible + ".tex", cible) if not cible.endswith(".tex") else (cible,):
+                chemin = os.path.abspath(os.path.join(base, candidat))
+                if os.path.isfile(chemin):
+                    return chemin
+        return None
+
+    def _morceaux(self, document: DocumentLatex, en_cours: Tuple[str, ...]) -> Iterator[tuple]:
+        """Texte et titres du document, inclusions développées, dans l'ordre du manuscrit"""
+        titres = list(document)
+        inclusions = document.inclusions
+        i = j = 0
+        pos = 0
+        while i < len(titres) or j < len(inclusions):
+            if j >= len(inclusions) or (i < len(titres) and titres[i].debut < inclusions[j][0]):
+                noeud = titres[i]
+                i += 1
+                yield ("texte", document, pos, noeud.debut)
+                yield ("titre", document, noeud)
+                pos = noeud.debut
+            else:
+                debut, fin, _, cible = inclusions[j]
+                j += 1
+                yield ("texte", document, pos, debut)
+                pos = fin
+                chemin = self._resoudre(cible, document.chemin)
+                if chemin is None:
+                    self.manquants.append(cible)
+                elif chemin not in en_cours:
+                    inclus = self.cache.document(chemin)
+                    self.documents[chemin] = inclus
+                    yield from self._morceaux(inclus, en_cours + (chemin,))
+        yield ("texte", document, pos, document.longueur)
+
+    def _assembler(self):
+        principal = self.cache.document(self.principal)
+        self.documents[self.principal] = principal
+        pile = [self.racine]
+        for morceau in self._morceaux(principal, (self.principal,)):
+            if morceau[0] == "texte":
+                _, document, debut, fin = morceau
+                if debut < fin:
+                    # Le texte revient à la section ouverte la plus profonde, même si
+                    # elle a commencé dans un autre fichier (texte après un \input)
+                    pile[-1].fragments.append((document, debut, fin))
+                continue
+            _, document, noeud = morceau
+            while pile[-1].niveau >= noeud.niveau:
+                pile.pop()
+            parent = pile[-1]
+            section = SectionManuscrit(noeud.type, noeud.niveau, noeud.titre, document.chemin,
+                                       noeud.titre_court, noeud.etoile, parent)
+            parent.enfants.append(section)
+            pile.append(section)
+
+    def __iter__(self) -> Iterator[SectionManuscrit]:
+        return iter(self.racine)
+
+    @property
+    def fichiers(self) -> List[str]:
+        return list(self.documents)
+
+    def sections(self, mode: Dict, imbrique: bool = False) -> List[Section]:
+        """Sections retenues pour un mode, avec le fichier source de chacune"""
+        chapitres = []
+        for section in self:
+            if section.type not in mode["niveaux"]:
+                continue
+            fragments = section.tous_fragments(None if imbrique else mode["niveaux"])
+            nb_mots = _mots(fragments)
+            if nb_mots >= mode["min_mots"]:
+                chapitres.append(Section(section.type, section.titre, fragments, nb_mots,
+                                         section.titre_court, section.etoile, section.fichier))
+        return chapitres
+
+    def compter(self, mode: Dict, imbrique: bool = False) -> Tuple[int, int]:
+        """(sections retenues, mots) pour un mode, sans construire les textes"""
+        nb_sections = nb_mots = 0
+        for section in self:
+            if section.type not in mode["niveaux"]:
+                continue
+            mots = _mots(section.tous_fragments(None if imbrique else mode["niveaux"]))
+            if mots >= mode["min_mots"]:
+                nb_sections += 1
+                nb_mots += mots
+        return nb_sections, nb_mots
+
+
+def charger_manuscrit(fichier: str, cache: Optional[CacheAnalyses] = None) -> Manuscrit:
+    """Manuscrit complet à partir du fichier principal (\\input, \\include, \\subfile résolus)"""
+    return Manuscrit(fichier, cache)
@@ -0,0 +1,351 @@
+# ===============================================================
+# analyseur/metriques.py — Histogrammes de latence et export Prometheus
+# ===============================================================
+# Les durées d'appel sont rangées dans des histogrammes à seuils fixes
+# (un par fournisseur et par agent) : p50/p90/p99 s'en déduisent sans
+# conserver chaque durée. Compteurs (appels, reprises, basculements,
+# continuations) et jauges (appels en cours) complètent le tableau.
+# Le tout s'exporte au format texte de Prometheus, via un petit
+# serveur HTTP local (/metrics) ou un fichier pour le collecteur
+# « textfile » de node-exporter.
+# Pour les percentiles précis des appels réussis, Esquisse garde des
+# compteurs sur des intervalles logarithmiques (erreur relative bornée,
+# mémoire fixe) ; elle se sérialise dans le JSON du run et se fusionne
+# entre processus et entre runs.
+# ===============================================================
+
+import os
+import json
+import math
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, List, Dict, Tuple, Iterable
+
+# Seuils des histogrammes de latence (secondes)
+SEUILS_LATENCE = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+PREFIXE = "analyseur"
+
+# Esquisses : erreur relative sur les quantiles et nombre maximal d'intervalles
+PRECISION_ESQUISSE = 0.01
+INTERVALLES_MAX = 2048
+
+Etiquettes = Tuple[Tuple[str, str], ...]
+
+
+def _etiquettes(**etiquettes) -> Etiquettes:
+    return tuple(sorted((cle, str(valeur)) for cle, valeur in etiquettes.items() if valeur is not None))
+
+
+def _echapper(valeur: str) -> str:
+    return valeur.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_etiquettes(etiquettes: Etiquettes, supplement: str = "") -> str:
+    parties = [f'{cle}="{_echapper(valeur)}"' for cle, valeur in etiquettes]
+    if supplement:
+        parties.append(supplement)
+    return "{" + ",".join(parties) + "}" if parties else ""
+
+
+def _nombre(valeur: float) -> str:
+    if valeur == math.inf:
+        return "+Inf"
+    return repr(float(valeur)) if isinstance(valeur, float) else str(valeur)
+
+
+class Histogramme:
+    """Histogramme cumulatif à seuils fixes, fusionnable"""
+
+    __slots__ = ("seuils", "comptes", "somme", "nombre")
+
+    def __init__(self, seuils: Tuple[float, ...] = SEUILS_LATENCE):
+        self.seuils = seuils
+        self.comptes = [0] * (len(seuils) + 1)     # dernier : au-delà du plus grand seuil
+        self.somme = 0.0
+        self.nombre = 0
+
+    def observer(self, valeur: float):
+        self.comptes[bisect_left(self.seuils, valeur)] += 1
+        self.somme += valeur
+        self.nombre += 1
+
+    def fusionner(self, autre: "Histogramme"):
+        for i, compte in enumerate(autre.comptes):
+            self.comptes[i] += compte
+        self.somme += autre.somme
+        self.nombre += autre.nombre
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Quantile estimé par interpolation linéaire dans le seuil concerné (comme Prometheus)"""
+        if not self.nombre:
+            return None
+        rang = q * self.nombre
+        cumul = 0
+        for i, compte in enumerate(self.comptes):
+            if compte and cumul + compte >= rang:
+                if i == len(self.seuils):
+                    return self.seuils[-1]
+                bas = self.seuils[i - 1] if i else 0.0
+                return bas + (self.seuils[i] - bas) * (rang - cumul) / compte
+            cumul += compte
+        return self.seuils[-1]
+
+    def resume(self) -> Dict:
+        resume = {"nb": self.nombre, "moyenne": round(self.somme / self.nombre, 3) if self.nombre else None}
+        for q in QUANTILES:
+            valeur = self.quantile(q)
+            resume[f"p{round(q * 100)}"] = round(valeur, 3) if valeur is not None else None
+        return resume
+
+
+class Esquisse:
+    """Esquisse de quantiles à intervalles logarithmiques (type DDSketch), fusionnable
+
+    Une valeur v tombe dans l'intervalle ⌈log_γ v⌉ avec γ = (1+α)/(1-α) :
+    tout quantile est restitué à α près (en relatif), en O(1) par ajout.
+    Au-delà de INTERVALLES_MAX, les plus petits intervalles sont regroupés,
+    ce qui ne dégrade que les quantiles les plus bas.
+    """
+
+    __slots__ = ("precision", "gamma", "_log_gamma", "comptes", "zeros", "nombre", "somme", "min", "max")
+
+    def __init__(self, precision: float = PRECISION_ESQUISSE):
+        self.precision = precision
+        self.gamma = (1 + precision) / (1 - precision)
+        self._log_gamma = math.log(self.gamma)
+        self.comptes: Dict[int, int] = {}
+        self.zeros = 0                      # valeurs nulles (ou quasi)
+        self.nombre = 0
+        self.somme = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def ajouter(self, valeur: float, nombre: int = 1):
+        self.nombre += nombre
+        self.somme += valeur * nombre
+        self.min = min(self.min, valeur)
+        self.max = max(self.max, valeur)
+        if valeur <= 1e-9:
+            self.zeros += nombre
+            return
+        indice = math.ceil(math.log(valeur) / self._log_gamma)
+        self.comptes[indice] = self.comptes.get(indice, 0) + nombre
+        if len(self.comptes) > INTERVALLES_MAX:
+            self._regrouper()
+
+    def _regrouper(self):
+        indices = sorted(self.comptes)
+        surplus = indices[:len(indices) - INTERVALLES_MAX + 1]
+        self.comptes[surplus[-1]] += sum(self.comptes.pop(i) for i in surplus[:-1])
+
+    def fusionner(self, autre: "Esquisse"):
+        if autre.precision != self.precision:
+            raise ValueError(f"Esquisses de précisions différentes ({self.precision} / {autre.precision})")
+        for indice, compte in autre.comptes.items():
+            self.comptes[indice] = self.comptes.get(indice, 0) + compte
+        self.zeros += autre.zeros
+        self.nombre += autre.nombre
+        self.somme += autre.somme
+        self.min = min(self.min, autre.min)
+        self.max = max(self.max, autre.max)
+        if len(self.comptes) > INTERVALLES_MAX:
+            self._regrouper()
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.nombre:
+            return None
+        if q <= 0 or q >= 1:
+            return self.min if q <= 0 else self.max
+        rang = q * (self.nombre - 1)
+        cumul = self.zeros
+        if cumul > rang:
+            return 0.0
+        for indice in sorted(self.comptes):
+            cumul += self.comptes[indice]
+            if cumul > rang:
+                # Milieu (relatif) de l'intervalle ]γ^(i-1), γ^i], borné par les extrêmes observés
+                estimation = 2 * self.gamma ** indice / (self.gamma + 1)
+                return min(max(estimation, self.min), self.max)
+        return self.max
+
+    def resume(self) -> Dict:
+        resume = {"nb": self.nombre, "moyenne": round(self.somme / self.nombre, 3) if self.nombre else None}
+        for q in QUANTILES:
+            valeur = self.quantile(q)
+            resume[f"p{round(q * 100)}"] = round(valeur, 3) if valeur is not None else None
+        resume["max"] = round(self.max, 3) if self.nombre else None
+        return resume
+
+    def en_dict(self) -> Dict:
+        """Forme sérialisable en JSON (clés d'intervalles en texte)"""
+        return {"precision": self.precision, "nb": self.nombre, "somme": self.somme,
+                "min": self.min if self.nombre else None, "max": self.max if self.nombre else None,
+                "zeros": self.zeros, "comptes": {str(i): c for i, c in sorted(self.comptes.items())}}
+
+    @classmethod
+    def depuis_dict(cls, donnees: Dict) -> "Esquisse":
+        esquisse = cls(donnees["precision"])
+        esquisse.comptes = {int(i): c for i, c in donnees["comptes"].items()}
+        esquisse.zeros = donnees["zeros"]
+        esquisse.nombre = donnees["nb"]
+        esquisse.somme = donnees["somme"]
+        if esquisse.nombre:
+            esquisse.min, esquisse.max = donnees["min"], donnees["max"]
+        return esquisse
+
+
+def fusionner_latences(latences: Iterable[Dict[str, Dict[str, Dict]]]) -> Dict[str, Dict[str, Esquisse]]:
+    """Fusionne des esquisses sérialisées {fournisseur: {tache: esquisse}} (plusieurs runs ou processus)"""
+    fusion: Dict[str, Dict[str, Esquisse]] = {}
+    for par_fournisseur in latences:
+        for api, par_tache in par_fournisseur.items():
+            for tache, donnees in par_tache.items():
+                esquisse = Esquisse.depuis_dict(donnees)
+                if tache in fusion.setdefault(api, {}):
+                    fusion[api][tache].fusionner(esquisse)
+                else:
+                    fusion[api][tache] = esquisse
+    return fusion
+
+
+def latences_rapports(chemins: Iterable[str]) -> Dict[str, Dict[str, Esquisse]]:
+    """Profil de latence commun à plusieurs rapports JSON de runs"""
+    def esquisses():
+        for chemin in chemins:
+            with open(chemin, encoding="utf-8") as f:
+                yield json.load(f).get("statistiques", {}).get("esquisses_latence", {})
+    return fusionner_latences(esquisses())
+
+
+class Metriques:
+    """Compteurs, jauges et histogrammes étiquetés ; sûrs entre fils"""
+
+    AIDES = {
+        "appel_duree_secondes": ("histogram", "Durée des appels aux fournisseurs"),
+        "appels_total": ("counter", "Appels aux fournisseurs, par résultat"),
+        "reprises_total": ("counter", "Nouvelles tentatives après un échec"),
+        "bascules_total": ("counter", "Basculements vers un fournisseur de secours"),
+        "continuations_total": ("counter", "Appels de continuation après une réponse tronquée"),
+        "appels_en_cours": ("gauge", "Appels en cours"),
+        "sections_total": ("counter", "Sections traitées, par niveau de dégradation"),
+    }
+
+    def __init__(self):
+        self._verrou = threading.Lock()
+        self.compteurs: Dict[str, Dict[Etiquettes, float]] = {}
+        self.jauges: Dict[str, Dict[Etiquettes, float]] = {}
+        self.histogrammes: Dict[str, Dict[Etiquettes, Histogramme]] = {}
+
+    def incrementer(self, nom: str, valeur: float = 1, **etiquettes):
+        cle = _etiquettes(**etiquettes)
+        with self._verrou:
+            serie = self.compteurs.setdefault(nom, {})
+            serie[cle] = serie.get(cle, 0) + valeur
+
+    def jauge(self, nom: str, delta: float, **etiquettes):
+        """Ajoute delta à la jauge (±1 pour un appel qui commence ou se termine)"""
+        cle = _etiquettes(**etiquettes)
+        with self._verrou:
+            serie = self.jauges.setdefault(nom, {})
+            serie[cle] = serie.get(cle, 0) + delta
+
+    def observer(self, nom: str, valeur: float, **etiquettes):
+        cle = _etiquettes(**etiquettes)
+        with self._verrou:
+            serie = self.histogrammes.setdefault(nom, {})
+            histogramme = serie.get(cle)
+            if histogramme is None:
+                histogramme = serie[cle] = Histogramme()
+            histogramme.observer(valeur)
+
+    def agreger(self, nom: str, par: str) -> Dict[str, Histogramme]:
+        """Histogrammes fusionnés selon une seule étiquette (ex. par fournisseur)"""
+        agregats: Dict[str, Histogramme] = {}
+        with self._verrou:
+            for etiquettes, histogramme in self.histogrammes.get(nom, {}).items():
+                valeur = dict(etiquettes).get(par)
+                if valeur is None:
+                    continue
+                if valeur not in agregats:
+                    agregats[valeur] = Histogramme(histogramme.seuils)
+                agregats[valeur].fusionner(histogramme)
+        return agregats
+
+    def total(self, nom: str, **filtre) -> float:
+        with self._verrou:
+            return sum(valeur for etiquettes, valeur in self.compteurs.get(nom, {}).items()
+                       if all(dict(etiquettes).get(cle) == str(v) for cle, v in filtre.items()))
+
+    # ---------------------------------------------------------------
+    # Format texte Prometheus
+    # ---------------------------------------------------------------
+
+    def _entete(self, lignes: List[str], nom: str, type_par_defaut: str):
+        type_metrique, aide = self.AIDES.get(nom, (type_par_defaut, nom))
+        lignes.append(f"# HELP {PREFIXE}_{nom} {aide}")
+        lignes.append(f"# TYPE {PREFIXE}_{nom} {type_metrique}")
+
+    def texte_prometheus(self) -> str:
+        lignes: List[str] = []
+        with self._verrou:
+            for nom, serie in sorted(self.compteurs.items()):
+                self._entete(lignes, nom, "counter")
+                for etiquettes, valeur in sorted(serie.items()):
+                    lignes.append(f"{PREFIXE}_{nom}{_format_etiquettes(etiquettes)} {_nombre(valeur)}")
+            for nom, serie in sorted(self.jauges.items()):
+                self._entete(lignes, nom, "gauge")
+                for etiquettes, valeur in sorted(serie.items()):
+                    lignes.append(f"{PREFIXE}_{nom}{_format_etiquettes(etiquettes)} {_nombre(valeur)}")
+            for nom, serie in sorted(self.histogrammes.items()):
+                self._entete(lignes, nom, "histogram")
+                for etiquettes, histogramme in sorted(serie.items()):
+                    cumul = 0
+                    for seuil, compte in zip(histogramme.seuils + (math.inf,), histogramme.comptes):
+                        cumul += compte
+                        le = f'le="{_nombre(seuil)}"'
+                        lignes.append(f"{PREFIXE}_{nom}_bucket{_format_etiquettes(etiquettes, le)} {cumul}")
+                    lignes.append(f"{PREFIXE}_{nom}_sum{_format_etiquettes(etiquettes)} "
+                                  f"{_nombre(histogramme.somme)}")
+                    lignes.append(f"{PREFIXE}_{nom}_count{_format_etiquettes(etiquettes)} {histogramme.nombre}")
+        return "\n".join(lignes) + "\n"
+
+    def ecrire_textfile(self, chemin: str):
+        """Fichier pour le collecteur textfile de node-exporter (remplacé atomiquement)"""
+        temporaire = f"{chemin}.{os.getpid()}.tmp"
+        with open(temporaire, "w", encoding="utf-8") as f:
+            f.write(self.texte_prometheus())
+        os.replace(temporaire, chemin)
+
+
+class ServeurMetriques:
+    """Point d'accès HTTP local /metrics, servi par un fil en arrière-plan"""
+
+    def __init__(self, metriques: Metriques, port: int, hote: str = "127.0.0.1"):
+        class Gestionnaire(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                corps = metriques.texte_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def log_message(self, *args):
+                pass
+
+        self._serveur = ThreadingHTTPServer((hote, port), Gestionnaire)
+        self._serveur.daemon_threads = True
+        self.adresse = f"http://{hote}:{self._serveur.server_port}/metrics"
+        self._fil = threading.Thread(target=self._serveur.serve_forever, name="metriques", daemon=True)
+        self._fil.start()
+
+    def arreter(self):
+        self._serveur.shutdown()
+        self._serveur.server_close()
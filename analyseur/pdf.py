@@ -0,0 +1,223 @@
+# ===============================================================
+# analyseur/pdf.py — Écriture PDF native, page par page
+# ===============================================================
+# PDF 1.4 minimal sans dépendance : polices standard Helvetica
+# (encodage WinAnsi), texte justifié à gauche avec coupure des
+# lignes selon les chasses de la police. Chaque page est compressée
+# (zlib) et écrite dès qu'elle est pleine ; seuls les offsets des
+# objets restent en mémoire jusqu'à la table xref finale.
+# ===============================================================
+
+import zlib
+import codecs
+import unicodedata
+from datetime import datetime
+from typing import Optional, List, Tuple, IO
+
+# Format A4 en points, marges
+LARGEUR_PAGE = 595.0
+HAUTEUR_PAGE = 842.0
+MARGE = 56.0
+
+# Chasses Helvetica (1/1000 em) des caractères 32 à 126, d'après les métriques AFM
+_CHASSES = {
+    "F1": [278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+           556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+           1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+           667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+           333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+           556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584],
+    "F2": [278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+           556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+           975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+           667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+           333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+           611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584],
+}
+_CHASSE_DEFAUT = 556
+
+POLICES = {"F1": "Helvetica", "F2": "Helvetica-Bold"}
+
+
+def _remplacer(erreur: UnicodeEncodeError):
+    """Caractère hors WinAnsi : lettre de base (NFKD), sinon '?' ou rien pour un symbole"""
+    sortie = []
+    for c in erreur.object[erreur.start:erreur.end]:
+        base = unicodedata.normalize("NFKD", c).encode("cp1252", "ignore").decode("cp1252")
+        if base:
+            sortie.append(base)
+        elif not unicodedata.category(c).startswith(("S", "M", "C")):
+            sortie.append("?")
+    return "".join(sortie), erreur.end
+
+
+codecs.register_error("analyseur_winansi", _remplacer)
+
+
+def vers_winansi(texte: str) -> str:
+    """Texte représentable en WinAnsi (cp1252) : accents conservés, symboles retirés"""
+    return texte.encode("cp1252", "analyseur_winansi").decode("cp1252")
+
+
+def _table_chasses(chasses: List[int]) -> List[int]:
+    """Chasse de chaque octet WinAnsi (lettre accentuée : chasse de la lettre de base)"""
+    table = []
+    for octet in range(256):
+        c = bytes([octet]).decode("cp1252", "replace")
+        base = ord(unicodedata.normalize("NFD", c)[0])
+        table.append(chasses[base - 32] if 32 <= base <= 126 else _CHASSE_DEFAUT)
+    return table
+
+
+_TABLES = {police: _table_chasses(chasses) for police, chasses in _CHASSES.items()}
+
+
+def largeur(texte: str, police: str, taille: float) -> float:
+    """Largeur en points d'un texte WinAnsi"""
+    return sum(map(_TABLES[police].__getitem__, texte.encode("cp1252", "replace"))) * taille / 1000
+
+
+def _echapper(texte: str) -> bytes:
+    return (texte.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            .encode("cp1252", "replace"))
+
+
+class EcrivainPDF:
+    """Document PDF écrit au fil de l'eau dans un flux binaire"""
+
+    # Objets réservés : 1 catalogue, 2 arbre des pages, 3-4 polices
+    CATALOGUE, PAGES = 1, 2
+
+    def __init__(self, flux: IO[bytes], titre: str = "", pied: str = ""):
+        self.flux = flux
+        self.titre = titre
+        self.pied = pied
+        self.offsets: List[int] = [0, 0, 0]      # offset de chaque objet (index = numéro)
+        self.pages: List[int] = []
+        self.position = 0
+        self.contenu: List[bytes] = []
+        self.y = 0.0
+        self._ecrire(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        for numero, (cle, nom) in enumerate(POLICES.items(), 3):
+            self._objet(f"<< /Type /Font /Subtype /Type1 /BaseFont /{nom} "
+                        f"/Encoding /WinAnsiEncoding >>".encode("ascii"), numero)
+        self._nouvelle_page()
+
+    # ---------------------------------------------------------------
+    # Objets bas niveau
+    # ---------------------------------------------------------------
+
+    def _ecrire(self, donnees: bytes):
+        self.flux.write(donnees)
+        self.position += len(donnees)
+
+    def _objet(self, corps: bytes, numero: Optional[int] = None) -> int:
+        if numero is None:
+            numero = len(self.offsets)
+        while len(self.offsets) <= numero:
+            self.offsets.append(0)
+        self.offsets[numero] = self.position
+        self._ecrire(b"%d 0 obj\n" % numero + corps + b"\nendobj\n")
+        return numero
+
+    def _flux_compresse(self, donnees: bytes) -> int:
+        compresse = zlib.compress(donnees, 6)
+        return self._objet(b"<< /Length %d /Filter /FlateDecode >>\nstream\n" % len(compresse)
+                           + compresse + b"\nendstream")
+
+    # ---------------------------------------------------------------
+    # Pages
+    # ---------------------------------------------------------------
+
+    def _terminer_page(self):
+        if self.pied:
+            numero = f"{self.pied} — page {len(self.pages) + 1}"
+            self._texte(numero, "F1", 8, MARGE, MARGE / 2, (0.6, 0.6, 0.6))
+        contenu = self._flux_compresse(b"".join(self.contenu))
+        self.contenu = []
+        page = self._objet(b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+                           b"/Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> /Contents %d 0 R >>"
+                           % (self.PAGES, LARGEUR_PAGE, HAUTEUR_PAGE, contenu))
+        self.pages.append(page)
+
+    def _nouvelle_page(self):
+        self.y = HAUTEUR_PAGE - MARGE
+
+    def saut_page(self):
+        self._terminer_page()
+        self._nouvelle_page()
+
+    def _texte(self, texte: str, police: str, taille: float, x: float, y: float,
+               couleur: Tuple[float, float, float] = (0.2, 0.2, 0.2)):
+        self.contenu.append(b"BT %.3f %.3f %.3f rg /%s %.1f Tf %.2f %.2f Td (" % (
+            couleur[0], couleur[1], couleur[2], police.encode("ascii"), taille, x, y)
+            + _echapper(texte) + b") Tj ET\n")
+
+    # ---------------------------------------------------------------
+    # Mise en page
+    # ---------------------------------------------------------------
+
+    def espace(self, hauteur: float):
+        self.y -= hauteur
+
+    def paragraphe(self, texte: str, taille: float = 10, gras: bool = False,
+                   couleur: Tuple[float, float, float] = (0.2, 0.2, 0.2), retrait: float = 0.0):
+        """Texte coupé en lignes à la largeur utile ; passe à la page suivante si besoin"""
+        police = "F2" if gras else "F1"
+        interligne = taille * 1.35
+        utile = LARGEUR_PAGE - 2 * MARGE - retrait
+        for ligne in self._couper(vers_winansi(texte), police, taille, utile):
+            if self.y - interligne < MARGE:
+                self.saut_page()
+            self.y -= interligne
+            if ligne:
+                self._texte(ligne, police, taille, MARGE + retrait, self.y, couleur)
+
+    def _couper(self, texte: str, police: str, taille: float, utile: float):
+        espace = largeur(" ", police, taille)
+        for bloc in texte.split("\n"):
+            ligne, courante = [], 0.0
+            for mot in bloc.split(" "):
+                l_mot = largeur(mot, police, taille)
+                while l_mot > utile:
+                    # Mot plus long qu'une ligne : coupé caractère par caractère
+                    if ligne:
+                        yield " ".join(ligne)
+                        ligne, courante = [], 0.0
+                    table = _TABLES[police]
+                    octets = mot.encode("cp1252", "replace")
+                    i, cumul = 1, table[octets[0]] * taille / 1000
+                    while i < len(octets):
+                        cumul += table[octets[i]] * taille / 1000
+                        if cumul > utile:
+                            break
+                        i += 1
+                    yield mot[:i]
+                    mot = mot[i:]
+                    l_mot = largeur(mot, police, taille)
+                if ligne and courante + espace + l_mot > utile:
+                    yield " ".join(ligne)
+                    ligne, courante = [], 0.0
+                courante += (espace if ligne else 0) + l_mot
+                ligne.append(mot)
+            yield " ".join(ligne)
+
+    # ---------------------------------------------------------------
+    # Clôture
+    # ---------------------------------------------------------------
+
+    def fermer(self):
+        """Dernière page, arbre des pages, catalogue, table xref et trailer"""
+        self._terminer_page()
+        kids = b" ".join(b"%d 0 R" % p for p in self.pages)
+        self._objet(b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(self.pages), self.PAGES)
+        self._objet(b"<< /Type /Catalog /Pages %d 0 R >>" % self.PAGES, self.CATALOGUE)
+        date = datetime.now().strftime("D:%Y%m%d%H%M%S")
+        infos = self._objet(b"<< /Title (" + _echapper(vers_winansi(self.titre)) + b") /Producer "
+                            b"(Analyseur Multi-Modeles IA) /CreationDate (" + date.encode("ascii") + b") >>")
+        debut_xref = self.position
+        lignes = [b"xref\n0 %d\n" % len(self.offsets), b"0000000000 65535 f \n"]
+        lignes.extend(b"%010d 00000 n \n" % offset for offset in self.offsets[1:])
+        self._ecrire(b"".join(lignes))
+        self._ecrire(b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                     % (len(self.offsets), self.CATALOGUE, infos, debut_xref))
@@ -0,0 +1,853 @@
+# ===============================================================
+# analyseur/pipeline.py — Analyse d'un manuscrit, de bout en bout
+# ===============================================================
+# Appels aux modèles (reprises, continuations, basculement, échéance),
+# agents, statistiques du run, exports et la classe Pipeline qui
+# enchaîne le tout. Les scripts n'y ajoutent que les menus et la
+# ligne de commande ; un service l'importe tel quel : l'import ne crée
+# aucun client API et n'affiche rien (voir analyseur/fournisseurs.py).
+# ===============================================================
+
+import time
+import json
+import threading
+from contextlib import nullcontext
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple
+
+from analyseur.latex import Section
+from analyseur.manuscrit import CacheAnalyses, Manuscrit, charger_manuscrit
+from analyseur.budgets import budget_sortie, consigne_longueur, mots_extrait, jetons_texte, TOKENS_PAR_MOT
+from analyseur.echeance import (Echeance, delai_appel, DELAI_MINIMAL,
+                                NORMAL, SANS_SYNTHESE, MODELE_RAPIDE, INTERROMPUE, NON_ANALYSEE)
+from analyseur.fournisseurs import Flux, Fournisseurs
+from analyseur.resultats import MagasinResultats
+from analyseur.rapport_html import ecrire_rapport_html
+from analyseur.rapport_pdf import ecrire_rapport_pdf
+from analyseur.traces import Traceur
+from analyseur.metriques import Esquisse, Metriques
+from analyseur.profilage import Profileur
+from analyseur.estimation import HistoriqueAppels, estimer_run
+from analyseur.progression import Progression
+from analyseur.compaction import compacter, mesurer
+from analyseur.similarite import (IndexSimilarite, MIN_MOTS, mots_sans_latex, passages_modifies, signature,
+                                  REUTILISATION_IDENTIQUE, REUTILISATION_REVISION)
+
+# Clients partagés par défaut : rien n'est construit avant le premier appel
+FOURNISSEURS_DEFAUT = Fournisseurs()
+
+SUITE_PROMPT = "Continue exactement là où ta réponse s'est arrêtée, sans répéter ce qui précède."
+
+MESSAGE_NON_ANALYSE = "Section non analysée (échéance du run atteinte)."
+
+
+class AnalyseAnnulee(Exception):
+    """Run arrêté à la demande (bail perdu par l'ouvrier) : aucun export n'est écrit"""
+
+# ===============================================================
+# MODES D'ANALYSE
+# ===============================================================
+
+MODE_RAPIDE = {
+    "nom": "Rapide",
+    "description": "Analyse uniquement les chapitres principaux (chapter)",
+    "niveaux": ["chapter"],
+    "min_mots": 100,
+    "facteur_sortie": 0.6,
+    "duree_estimee": "5–10 min"
+}
+
+MODE_NORMAL = {
+    "nom": "Normal",
+    "description": "Analyse chapitres + sections principales",
+    "niveaux": ["chapter", "section"],
+    "min_mots": 50,
+    "facteur_sortie": 1.0,
+    "duree_estimee": "10–20 min"
+}
+
+MODE_DETAILLE = {
+    "nom": "Détaillé",
+    "description": "Analyse complète (chapitres, sections, sous-sections)",
+    "niveaux": ["chapter", "section", "subsection"],
+    "min_mots": 20,
+    "facteur_sortie": 1.5,
+    "duree_estimee": "20–40 min"
+}
+
+MODES = (MODE_RAPIDE, MODE_NORMAL, MODE_DETAILLE)
+
+
+def modeles_par_defaut(fournisseurs: Optional[Fournisseurs] = None) -> Dict[str, str]:
+    """Modèle par tâche selon les fournisseurs disponibles (Gemini de préférence pour le style)"""
+    fournisseurs = fournisseurs or FOURNISSEURS_DEFAUT
+    return {
+        "scientifique": "claude",
+        "style": "gemini" if fournisseurs.disponible("gemini") else "openai" if fournisseurs.disponible("openai") else "claude",
+        "plan": "claude",
+        "synthese": "claude"
+    }
+
+# ===============================================================
+# STATISTIQUES GLOBALES
+# ===============================================================
+
+class Statistiques:
+    """Compteurs, latences, résultats, spans et métriques d'un run"""
+
+    def __init__(self, fichier_resultats: Optional[str] = None, profileur: Optional[Profileur] = None,
+                 service: str = "analyseur", historique: Optional[HistoriqueAppels] = None,
+                 flux: Optional[Flux] = None):
+        self.debut = time.time()
+        self.nb_appels = 0
+        self.nb_erreurs = 0
+        self.nb_fallbacks = 0
+        self.nb_continuations = 0
+        # Appels sans réponse après reprises et basculement (texte de repli à la place de l'analyse)
+        self.nb_sans_reponse = 0
+        # Durées des appels réussis : une esquisse de quantiles par fournisseur et par agent
+        self.latences: Dict[str, Dict[str, Esquisse]] = {}
+        # Résultats écrits sur disque au fil de l'eau (fichier temporaire si aucun chemin)
+        self.resultats = MagasinResultats(fichier_resultats)
+        # Spans run → section → agent → tentative, exportés en fin de run
+        self.traceur = Traceur(service)
+        # Histogrammes de latence, compteurs et jauges (format Prometheus)
+        self.metriques = Metriques()
+        # Temps et mémoire des étapes locales (--profile), inactif sinon
+        self.profileur = profileur or Profileur()
+        # Durées et jetons des appels, cumulés entre runs pour calibrer --dry-run
+        self.historique = historique or HistoriqueAppels()
+        # Temps restant, mis à jour à chaque appel terminé (défini au début de l'analyse)
+        self.progression: Optional[Progression] = None
+        # Part de ce run dans le partage des fournisseurs entre travaux (mode serve / worker)
+        self.flux = flux
+        # Attente en file avant le début du run, puis attente d'une place par fournisseur [secondes, appels]
+        self.attente_file: Optional[float] = None
+        self.attentes: Dict[str, List[float]] = {}
+        # Sections reprises d'analyses antérieures quasi identiques, par type de reprise
+        self.reutilisations: Dict[str, int] = {}
+        # Jetons des textes de section avant et après compaction, cumulés sur le run
+        self.compaction: Dict[str, int] = {}
+
+    def debut_appel(self, api: str):
+        self.metriques.jauge("appels_en_cours", 1, fournisseur=api)
+
+    def ajouter_appel(self, api: str, temps: float, succes: bool, tache: Optional[str] = None,
+                      continuation: bool = False, erreur: Optional[str] = None,
+                      infos: Optional[Dict] = None, budget: Optional[int] = None, rapide: bool = False):
+        self.nb_appels += 1
+        infos = infos or {}
+        # L'attente d'une place auprès du limiteur ne fait pas partie de la latence du fournisseur
+        attente = infos.get("attente_sec", 0.0)
+        if attente:
+            temps = max(temps - attente, 0.0)
+            cumul = self.attentes.setdefault(api, [0.0, 0])
+            cumul[0] += attente
+            cumul[1] += 1
+            self.metriques.observer("attente_place_secondes", attente, fournisseur=api)
+        if not succes:
+            self.nb_erreurs += 1
+        # Une réponse reprise du cache est un succès, mais ne dit rien du débit du fournisseur
+        mesure = succes and not infos.get("cache")
+        if mesure and not rapide:
+            self.historique.observer(api, temps, infos.get("jetons_sortie"), budget)
+        if mesure:
+            par_tache = self.latences.setdefault(api, {})
+            if (tache or "autre") not in par_tache:
+                par_tache[tache or "autre"] = Esquisse()
+            par_tache[tache or "autre"].ajouter(temps)
+        self.metriques.jauge("appels_en_cours", -1, fournisseur=api)
+        self.metriques.incrementer("appels_total", fournisseur=api, tache=tache,
+                                   resultat="succes" if succes else "echec")
+        self.metriques.observer("appel_duree_secondes", temps, fournisseur=api, tache=tache)
+        if continuation and succes:
+            self.metriques.incrementer("continuations_total", fournisseur=api, tache=tache)
+        self.resultats.evenement("appel", fournisseur=api, tache=tache, duree_sec=round(temps, 3),
+                                 succes=succes, continuation=continuation, erreur=erreur,
+                                 jetons_entree=infos.get("jetons_entree"), jetons_sortie=infos.get("jetons_sortie"),
+                                 attente_sec=round(attente, 3) if attente else None)
+        if self.progression and mesure:
+            self.progression.observer(api, temps, infos.get("jetons_sortie"), budget)
+            self.resultats.evenement("progression", **self.progression.estimation())
+
+    def ajouter_reprise(self, api: str, tache: Optional[str] = None):
+        self.metriques.incrementer("reprises_total", fournisseur=api, tache=tache)
+
+    def ajouter_bascule(self, de: str, vers: str, tache: Optional[str] = None):
+        self.nb_fallbacks += 1
+        self.metriques.incrementer("bascules_total", de=de, vers=vers, tache=tache)
+        self.resultats.evenement("bascule", de=de, vers=vers, tache=tache)
+
+    def ajouter_resultat(self, chapitre: str, scientifique: str, style: str, synthese: str,
+                         degradation: str = NORMAL, fichier: Optional[str] = None,
+                         duree: Optional[float] = None, reutilisation: Optional[Dict] = None,
+                         compaction: Optional[Dict] = None):
+        self.metriques.incrementer("sections_total", degradation=degradation)
+        if compaction:
+            for cle, valeur in compaction.items():
+                self.compaction[cle] = self.compaction.get(cle, 0) + valeur
+            self.metriques.incrementer("jetons_compaction_economises_total",
+                                       compaction["jetons_bruts"] - compaction["jetons_scientifique"])
+        if reutilisation:
+            self.reutilisations[reutilisation["type"]] = self.reutilisations.get(reutilisation["type"], 0) + 1
+            self.metriques.incrementer("sections_reutilisees_total", type=reutilisation["type"])
+        self.resultats.ajouter({
+            "chapitre": chapitre,
+            "fichier": fichier,
+            "scientifique": scientifique,
+            "style": style,
+            "synthese": synthese,
+            "degradation": degradation,
+            "duree_sec": round(duree, 2) if duree is not None else None,
+            "reutilisation": reutilisation,
+            "compaction": compaction
+        })
+
+    def _latences_par(self, cle) -> Dict[str, Dict]:
+        """Esquisses fusionnées selon cle(fournisseur, tache), résumées en p50/p90/p99"""
+        fusion: Dict[str, Esquisse] = {}
+        for api, par_tache in self.latences.items():
+            for tache, esquisse in par_tache.items():
+                fusion.setdefault(cle(api, tache), Esquisse()).fusionner(esquisse)
+        return {nom: esquisse.resume() for nom, esquisse in fusion.items()}
+
+    def obtenir_rapport(self) -> Dict:
+        temps_total = time.time() - self.debut
+        # Moyenne sur les appels mesurés : les réponses du cache n'ont pas de latence fournisseur
+        nb_appels_mesures = sum(e.nombre for par_tache in self.latences.values() for e in par_tache.values())
+        temps_appels = sum(e.somme for par_tache in self.latences.values() for e in par_tache.values())
+        return {
+            "temps_total_sec": round(temps_total, 2),
+            "temps_total_min": round(temps_total / 60, 2),
+            "nb_appels": self.nb_appels,
+            "nb_erreurs": self.nb_erreurs,
+            "nb_fallbacks": self.nb_fallbacks,
+            "nb_continuations": self.nb_continuations,
+            "nb_sections_degradees": len(self.resultats) - self.resultats.compter(NORMAL),
+            "taux_succes": round(100 * (1 - self.nb_erreurs / max(self.nb_appels, 1)), 1),
+            "temps_moyen_appel_sec": round(temps_appels / nb_appels_mesures, 2) if nb_appels_mesures > 0 else 0,
+            "latences_par_fournisseur": self._latences_par(lambda api, tache: api),
+            "latences_par_agent": self._latences_par(lambda api, tache: tache),
+            "nb_reprises": int(self.metriques.total("reprises_total")),
+            "attente_file_sec": round(self.attente_file, 1) if self.attente_file is not None else None,
+            "attente_fournisseurs": {api: {"sec": round(sec, 2), "nb": int(nb)}
+                                     for api, (sec, nb) in self.attentes.items()},
+            "sections_reutilisees": dict(self.reutilisations),
+            "compaction": dict(self.compaction, economie_pct=round(
+                100 * (1 - self.compaction["jetons_scientifique"] / max(self.compaction["jetons_bruts"], 1)), 1))
+            if self.compaction else None,
+            # Esquisses sérialisées : fusionnables entre runs (analyseur.metriques.latences_rapports)
+            "esquisses_latence": {api: {tache: esquisse.en_dict() for tache, esquisse in par_tache.items()}
+                                  for api, par_tache in self.latences.items()},
+        }
+
+# ===============================================================
+# FONCTION UNIFIÉE D'APPEL API
+# ===============================================================
+
+def _span(stats: Optional[Statistiques], nom: str, **attributs):
+    """Span de trace si des statistiques sont suivies, sinon rien"""
+    return stats.traceur.span(nom, **attributs) if stats else nullcontext()
+
+def _etape(stats: Optional[Statistiques], nom: str):
+    """Étape locale mesurée par le profileur du run (sans effet hors --profile)"""
+    return stats.profileur.etape(nom) if stats else nullcontext()
+
+def safe_call_unified(system_prompt: str, user_prompt: str,
+                      temperature: float = 0.3, model: str = "claude",
+                      fallback: bool = True, stats: Optional[Statistiques] = None,
+                      max_tokens: int = 4000, max_suites: int = 2, tache: Optional[str] = None,
+                      echeance: Optional[Echeance] = None, rapide: bool = False,
+                      fournisseurs: Optional[Fournisseurs] = None) -> Optional[str]:
+    """Appel unifié avec basculement automatique entre modèles.
+
+    Si la réponse est coupée à max_tokens, jusqu'à max_suites appels de
+    continuation complètent le texte. Chaque appel est borné par
+    delai_appel(model, tache, echeance).
+    """
+    fournisseurs = fournisseurs or FOURNISSEURS_DEFAUT
+    for attempt in range(3):
+        if echeance and echeance.depassee():
+            print(f"⏰ Échéance atteinte, appel {model} abandonné.")
+            echeance.abandons += 1
+            return None
+        t_debut = time.time()
+        echec = None
+        with _span(stats, "tentative", fournisseur=model, tentative=attempt + 1, bascule=not fallback,
+                   rapide=rapide, max_tokens=max_tokens) as span:
+            if stats:
+                stats.debut_appel(model)
+            try:
+                echanges = [{"role": "user", "content": user_prompt}]
+                texte, tronque, infos = fournisseurs.appeler(model, system_prompt, echanges, temperature,
+                                                           max_tokens, delai_appel(model, tache, echeance),
+                                                           rapide, flux=stats.flux if stats else None)
+                if span:
+                    span.definir(tronque=tronque, **infos)
+                if stats:
+                    stats.ajouter_appel(model, time.time() - t_debut, True, tache, infos=infos,
+                                        budget=max_tokens, rapide=rapide)
+
+            except Exception as e:
+                print(f"⚠️ Tentative {attempt+1}/3 échouée ({model}): {str(e)[:120]}")
+                if span:
+                    span.definir(erreur=str(e)[:200], raison_reprise=type(e).__name__)
+                if stats:
+                    stats.ajouter_appel(model, time.time() - t_debut, False, tache, erreur=str(e)[:200])
+                echec = e
+        if echec is not None:
+            if stats and attempt < 2:
+                stats.ajouter_reprise(model, tache)
+            if not (echeance and echeance.restant() < 3 + DELAI_MINIMAL):
+                with _span(stats, "attente_reprise", fournisseur=model, duree_prevue=3):
+                    time.sleep(3)
+            continue
+
+        # Continuations hors du try : un échec garde la réponse partielle déjà reçue
+        suites = 0
+        while tronque and suites < max_suites and not (echeance and echeance.depassee()):
+            suites += 1
+            print(f"   ↪ Réponse tronquée ({model}), continuation {suites}/{max_suites}")
+            if model == "claude":
+                # Pré-remplissage : Claude reprend directement son propre texte
+                echanges = [echanges[0], {"role": "assistant", "content": texte.rstrip()}]
+            else:
+                echanges = [echanges[0], {"role": "assistant", "content": texte},
+                            {"role": "user", "content": SUITE_PROMPT}]
+            t_suite = time.time()
+            with _span(stats, "continuation", fournisseur=model, continuation=suites,
+                       bascule=not fallback, rapide=rapide, max_tokens=max_tokens) as span:
+                if stats:
+                    stats.debut_appel(model)
+                try:
+                    suite, tronque, infos = fournisseurs.appeler(model, system_prompt, echanges, temperature,
+                                                               max_tokens, delai_appel(model, tache, echeance),
+                                                               rapide, flux=stats.flux if stats else None)
+                    if span:
+                        span.definir(tronque=tronque, **infos)
+                except Exception as e:
+                    print(f"⚠️ Continuation {suites} échouée ({model}): {str(e)[:120]}, réponse partielle conservée")
+                    if span:
+                        span.definir(erreur=str(e)[:200])
+                    if stats:
+                        stats.ajouter_appel(model, time.time() - t_suite, False, tache, continuation=True,
+                                            erreur=str(e)[:200])
+                    break
+            if stats:
+                stats.ajouter_appel(model, time.time() - t_suite, True, tache, continuation=True,
+                                    infos=infos, budget=max_tokens, rapide=rapide)
+                stats.nb_continuations += 1
+            texte = texte.rstrip() + suite if model == "claude" else texte + suite
+        return texte
+
+    if echeance and echeance.depassee():
+        print(f"⏰ Échéance atteinte, pas de basculement après l'échec de {model}.")
+        echeance.abandons += 1
+        return None
+
+    # Si tout échoue, basculement automatique intelligent
+    if fallback:
+        # Basculement stratégique : preferer les modèles dispo
+        fallback_preferences = {
+            "claude": "openai" if fournisseurs.disponible("openai") else "gemini",
+            "gemini": "claude",
+            "openai": "claude"
+        }
+        alt = fallback_preferences.get(model, "claude")
+
+        # Verifier que le modèle de fallback est disponible
+        if fournisseurs.disponible(alt):
+            print(f"🔄 Basculement de {model.upper()} vers {alt.upper()}...")
+            if stats:
+                stats.ajouter_bascule(model, alt, tache)
+            return safe_call_unified(system_prompt, user_prompt, temperature, model=alt, fallback=False,
+                                     stats=stats, max_tokens=max_tokens, max_suites=max_suites,
+                                     tache=tache, echeance=echeance, rapide=rapide, fournisseurs=fournisseurs)
+        else:
+            print(f"⚠️ Modèle de secours {alt.upper()} également indisponible.")
+
+    print(f"❌ Abandon ({model}) après 3 tentatives.")
+    if stats:
+        stats.nb_sans_reponse += 1
+    return None
+
+# ===============================================================
+# AGENTS
+# ===============================================================
+
+def prompt_scientifique(txt: str, mode=None, nb_mots=None) -> Tuple[str, str, int]:
+    extrait = txt[:4000]
+    budget = budget_sortie("scientifique", mots_extrait(txt, extrait, nb_mots), mode)
+    system = "Tu es un expert en mathématiques appliquées et modélisation numérique."
+    prompt = f"Analyse la rigueur scientifique du texte suivant. {consigne_longueur(budget)}\n\n{extrait}"
+    return system, prompt, budget
+
+def prompt_style(txt: str, mode=None, nb_mots=None) -> Tuple[str, str, int]:
+    extrait = txt[:4000]
+    budget = budget_sortie("style", mots_extrait(txt, extrait, nb_mots), mode)
+    system = "Tu es un relecteur académique spécialisé en rédaction scientifique."
+    prompt = f"Améliore le style et la clarté du texte suivant. {consigne_longueur(budget)}\n\n{extrait}"
+    return system, prompt, budget
+
+def prompt_plan(plan: str, mode=None) -> Tuple[str, str, int]:
+    extrait = plan[:4000]
+    budget = budget_sortie("plan", len(extrait.split()), mode)
+    system = "Tu es un rapporteur de thèse expert en structuration académique."
+    prompt = f"Analyse et optimise le plan suivant. {consigne_longueur(budget)}\n\n{extrait}"
+    return system, prompt, budget
+
+def prompt_synthese(titre: str, analyses: list, mode=None) -> Tuple[str, str, int]:
+    extrait = "\n\n".join(analyses)[:8000]
+    budget = budget_sortie("synthese", len(extrait.split()), mode)
+    system = "Tu es un examinateur scientifique rédigeant un rapport critique."
+    prompt = f"Synthétise les points clés du chapitre '{titre}'. {consigne_longueur(budget)}\n\n{extrait}"
+    return system, prompt, budget
+
+def prompt_revision(tache: str, analyse: str, modifications: str, mode=None) -> Tuple[str, str, int]:
+    """Revue différentielle : analyse d'une version antérieure et passages modifiés seulement"""
+    system = (prompt_scientifique if tache == "scientifique" else prompt_style)("", mode)[0]
+    budget = budget_sortie(tache, len(modifications.split()), mode)
+    prompt = (f"Voici ton analyse d'une version antérieure de ce texte, puis les passages modifiés depuis "
+              f"(+ ajouté ou réécrit, - retiré). Indique seulement ce que ces modifications changent à "
+              f"l'analyse. {consigne_longueur(budget)}\n\nAnalyse précédente :\n{analyse[:3000]}"
+              f"\n\nModifications :\n{modifications}")
+    return system, prompt, budget
+
+def agent_scientifique(txt: str, model="claude", stats=None, mode=None, echeance=None, rapide=False,
+                       nb_mots=None, fournisseurs=None):
+    with _etape(stats, "prompt"):
+        system, prompt, budget = prompt_scientifique(txt, mode, nb_mots)
+    with _span(stats, "agent", tache="scientifique", fournisseur=model, budget=budget):
+        return safe_call_unified(system, prompt, 0.25, model, stats=stats, max_tokens=budget,
+                                 tache="scientifique", echeance=echeance, rapide=rapide,
+                                 fournisseurs=fournisseurs) or "Analyse scientifique indisponible."
+
+def agent_style(txt: str, model="gemini", stats=None, mode=None, echeance=None, rapide=False,
+                nb_mots=None, fournisseurs=None):
+    with _etape(stats, "prompt"):
+        system, prompt, budget = prompt_style(txt, mode, nb_mots)
+    with _span(stats, "agent", tache="style", fournisseur=model, budget=budget):
+        return safe_call_unified(system, prompt, 0.4, model, stats=stats, max_tokens=budget,
+                                 tache="style", echeance=echeance, rapide=rapide,
+                                 fournisseurs=fournisseurs) or "Amélioration stylistique indisponible."
+
+def agent_plan(plan: str, model="claude", stats=None, mode=None, echeance=None, rapide=False,
+               fournisseurs=None):
+    with _etape(stats, "prompt"):
+        system, prompt, budget = prompt_plan(plan, mode)
+    with _span(stats, "agent", tache="plan", fournisseur=model, budget=budget):
+        return safe_call_unified(system, prompt, 0.3, model, stats=stats, max_tokens=budget,
+                                 tache="plan", echeance=echeance, rapide=rapide,
+                                 fournisseurs=fournisseurs) or "Analyse du plan indisponible."
+
+def agent_synthese(titre: str, analyses: list, model="claude", stats=None, mode=None, echeance=None, rapide=False,
+                   fournisseurs=None):
+    with _etape(stats, "prompt"):
+        system, prompt, budget = prompt_synthese(titre, analyses, mode)
+    with _span(stats, "agent", tache="synthese", fournisseur=model, budget=budget):
+        return safe_call_unified(system, prompt, 0.4, model, stats=stats, max_tokens=budget,
+                                 tache="synthese", echeance=echeance, rapide=rapide,
+                                 fournisseurs=fournisseurs) or "Synthèse indisponible."
+
+def agent_revision(tache: str, analyse: str, modifications: str, model="claude", stats=None, mode=None,
+                   echeance=None, rapide=False, fournisseurs=None):
+    with _etape(stats, "prompt"):
+        system, prompt, budget = prompt_revision(tache, analyse, modifications, mode)
+    with _span(stats, "agent", tache="revision", fournisseur=model, budget=budget):
+        revision = safe_call_unified(system, prompt, 0.25 if tache == "scientifique" else 0.4, model,
+                                     stats=stats, max_tokens=budget, tache="revision", echeance=echeance,
+                                     rapide=rapide, fournisseurs=fournisseurs)
+    if revision is None:
+        return analyse
+    return f"{analyse}\n\nRévision (passages modifiés depuis l'analyse reprise) :\n{revision}"
+
+# ===============================================================
+# EXPORTS HTML / PDF / JSON / TRACE
+# ===============================================================
+
+def generer_html(stats: Statistiques, nom_fichier: str, fichier_source: str, mode: str) -> str:
+    """Écrit le rapport HTML dans rapports/, chapitre par chapitre"""
+    try:
+        Path("rapports").mkdir(exist_ok=True)
+        html_path = f"rapports/{nom_fichier}.html"
+
+        with open(html_path, 'w', encoding='utf-8') as f:
+            ecrire_rapport_html(f, stats.resultats, fichier_source, mode, stats.obtenir_rapport(),
+                                len(stats.resultats), "v3.2")
+
+        print(f"✅ HTML généré : {html_path}")
+        return html_path
+
+    except Exception as e:
+        print(f"❌ Erreur lors de la sauvegarde HTML : {e}")
+        return None
+
+def generer_pdf(stats: Statistiques, nom_fichier: str, fichier_source: str, mode: str) -> str:
+    """Écrit le rapport PDF dans rapports/, page par page (sans dépendance)"""
+    try:
+        Path("rapports").mkdir(exist_ok=True)
+        pdf_path = f"rapports/{nom_fichier}.pdf"
+
+        with open(pdf_path, 'wb') as f:
+            ecrire_rapport_pdf(f, stats.resultats, fichier_source, mode, stats.obtenir_rapport(),
+                               len(stats.resultats), "v3.2")
+
+        print(f"✅ PDF généré : {pdf_path}")
+        return pdf_path
+
+    except Exception as e:
+        print(f"❌ Erreur lors de la génération PDF : {e}")
+        return None
+
+def sauvegarder_json(stats: Statistiques, nom_fichier: str, fichier_source: str, mode: str,
+                     echeance: Optional[Echeance] = None) -> str:
+    """Sauvegarde les résultats en JSON"""
+    try:
+        Path("rapports").mkdir(exist_ok=True)
+        json_path = f"rapports/{nom_fichier}.json"
+
+        donnees = {
+            "metadata": {
+                "fichier_source": fichier_source,
+                "mode_analyse": mode,
+                "date": datetime.now().isoformat(),
+                "echeance": str(echeance) if echeance else "aucune",
+                "journal": stats.resultats.chemin,
+            },
+            "statistiques": stats.obtenir_rapport()
+        }
+        if stats.profileur.actif:
+            donnees["profil"] = stats.profileur.rapport()
+
+        # Les résultats sont recopiés depuis le magasin un par un, sans tout charger
+        with open(json_path, 'w', encoding='utf-8') as f:
+            entete = json.dumps(donnees, ensure_ascii=False, indent=2)
+            f.write(entete[:-2] + ',\n  "resultats": ')
+            stats.resultats.ecrire_json(f, indent=2, niveau=1)
+            f.write("\n}")
+
+        print(f"✅ JSON sauvegardé : {json_path}")
+        return json_path
+
+    except Exception as e:
+        print(f"❌ Erreur lors de la sauvegarde JSON : {e}")
+        return None
+
+def sauvegarder_trace(stats: Statistiques, nom_fichier: str, otlp: Optional[str] = None) -> str:
+    """Écrit les spans du run au format Chrome trace (Perfetto) ; envoi OTLP optionnel"""
+    trace_path = None
+    try:
+        Path("rapports").mkdir(exist_ok=True)
+        trace_path = f"rapports/{nom_fichier}.trace.json"
+        with open(trace_path, 'w', encoding='utf-8') as f:
+            stats.traceur.ecrire_chrome(f)
+        print(f"✅ Trace sauvegardée : {trace_path}")
+    except Exception as e:
+        print(f"❌ Erreur lors de la sauvegarde de la trace : {e}")
+        trace_path = None
+    if otlp:
+        try:
+            stats.traceur.envoyer_otlp(otlp)
+            print(f"✅ Trace envoyée au collecteur OTLP : {otlp}")
+        except Exception as e:
+            print(f"⚠️ Collecteur OTLP injoignable ({otlp}) : {e}")
+    return trace_path
+
+# ===============================================================
+# PLANIFICATION
+# ===============================================================
+
+def textes_agents(texte: str, compaction: bool = True) -> Tuple[str, str]:
+    """Texte envoyé aux agents scientifique et de style (compacté, équations en marqueurs pour le style)"""
+    if not compaction:
+        return texte, texte
+    scientifique = compacter(texte)
+    return scientifique, compacter(scientifique, maths=False)
+
+def planifier_appels(chapitres: List[Section], modeles: Dict[str, str], mode: Dict,
+                     historique: HistoriqueAppels, compaction: bool = True) -> List[Dict]:
+    """Appels qu'un run normal ferait, avec les vrais prompts (aucun appel API)"""
+    appels = []
+    for indice, ch in enumerate(chapitres):
+        textes = dict(zip(("scientifique", "style"), textes_agents(ch.texte, compaction)))
+        sorties = []
+        for tache, preparer in (("scientifique", prompt_scientifique), ("style", prompt_style)):
+            system, prompt, budget = preparer(textes[tache], mode, ch.nb_mots)
+            fournisseur = modeles[tache]
+            appels.append({"indice": indice, "section": ch.titre, "tache": tache, "fournisseur": fournisseur,
+                           "jetons_entree": jetons_texte(system) + jetons_texte(prompt), "budget": budget})
+            sorties.append(budget * historique.modele(fournisseur)["remplissage"])
+        # La synthèse reçoit les deux analyses : leur longueur prévue suffit à dimensionner son prompt
+        analyses = [" ".join(["mot"] * int(sortie / TOKENS_PAR_MOT)) for sortie in sorties]
+        system, prompt, budget = prompt_synthese(ch.titre, analyses, mode)
+        appels.append({"indice": indice, "section": ch.titre, "tache": "synthese",
+                       "fournisseur": modeles["synthese"],
+                       "jetons_entree": jetons_texte(system) + jetons_texte(prompt), "budget": budget})
+    return appels
+
+# ===============================================================
+# PIPELINE
+# ===============================================================
+
+class Pipeline:
+    """Chargement, sélection des sections, analyse et exports d'un manuscrit
+
+    Étapes, dans l'ordre : charger(), sections(), demarrer(), analyser(),
+    exporter() ; executer() les enchaîne. Menus, options de ligne de
+    commande et résumés restent à la charge de l'appelant.
+    """
+
+    def __init__(self, mode: Dict = MODE_NORMAL, modeles: Optional[Dict[str, str]] = None,
+                 echeance: Optional[Echeance] = None, fournisseurs: Optional[Fournisseurs] = None,
+                 profileur: Optional[Profileur] = None, nom_rapport: Optional[str] = None,
+                 fichier_metriques: Optional[str] = None, cache: Optional[CacheAnalyses] = None,
+                 historique: Optional[HistoriqueAppels] = None, poids: float = 1.0,
+                 attente_file: Optional[float] = None, similarite: Optional[IndexSimilarite] = None,
+                 compaction: bool = True):
+        self.mode = mode
+        self.fournisseurs = fournisseurs or FOURNISSEURS_DEFAUT
+        self.modeles = dict(modeles) if modeles else modeles_par_defaut(self.fournisseurs)
+        self.echeance = echeance or Echeance()
+        self.profileur = profileur or Profileur()
+        self.nom_rapport = nom_rapport or f"rapport_analyse_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        # Fichier Prometheus (collecteur textfile) réécrit après chaque section
+        self.fichier_metriques = fichier_metriques
+        # Analyses LaTeX et historique des appels : partagés entre travaux par un service
+        self.cache = cache
+        self.historique = historique
+        # Poids dans le partage équitable des fournisseurs, temps passé en file avant le run
+        self.poids = poids
+        self.attente_file = attente_file
+        # Analyses de sections quasi identiques, reprises ou revues sur leurs seules modifications
+        self.similarite = similarite
+        # Balisage sans valeur pour les agents retiré du texte des sections (analyseur/compaction.py)
+        self.compaction = compaction
+        # Levée par un ouvrier qui a perdu son bail : arrêt avant la section suivante, sans exports
+        self.annulation = threading.Event()
+        self.fichier: Optional[str] = None
+        self.manuscrit: Optional[Manuscrit] = None
+        self.stats: Optional[Statistiques] = None
+        self.progression: Optional[Progression] = None
+        self._span_run = None
+
+    def charger(self, fichier: str) -> Manuscrit:
+        self.fichier = fichier
+        with self.profileur.etape("chargement"):
+            self.manuscrit = charger_manuscrit(fichier, self.cache)
+        return self.manuscrit
+
+    def sections(self) -> List[Section]:
+        """Sections du mode ayant au moins min_mots mots (lecture de l'index, sans re-analyse)"""
+        with self.profileur.etape("selection"):
+            return self.manuscrit.sections(self.mode)
+
+    def estimer(self, sections: List[Section], historique: Optional[HistoriqueAppels] = None,
+                concurrence: int = 1) -> Dict:
+        """Durée et coût prévus, sans aucun appel API
+
+        Les agents d'une section s'enchaînent (concurrence 1) ; les limites des
+        fournisseurs appelés plafonnent la concurrence et, par leurs appels par
+        minute, imposent une durée minimale.
+        """
+        historique = historique or self.historique or HistoriqueAppels()
+        appels = planifier_appels(sections, self.modeles, self.mode, historique, self.compaction)
+        limites = {nom: limiteur for nom, limiteur in self.fournisseurs.limites.items()
+                   if any(appel["fournisseur"] == nom for appel in appels)}
+        concurrence = min([concurrence] + [limiteur.concurrence for limiteur in limites.values()])
+        return estimer_run(appels, historique, concurrence,
+                           {nom: limiteur.rpm for nom, limiteur in limites.items() if limiteur.rpm})
+
+    def demarrer(self, sections: List[Section]) -> Statistiques:
+        """Ouvre le journal du run, le span racine et le suivi du temps restant"""
+        self.stats = stats = Statistiques(f"rapports/{self.nom_rapport}.jsonl", self.profileur, "analyseur-v3.2",
+                                          self.historique, Flux(self.nom_rapport, self.poids))
+        stats.attente_file = self.attente_file
+        stats.resultats.evenement("debut", fichier_source=self.fichier, mode=self.mode["nom"],
+                                  nb_sections=len(sections), modeles=self.modeles, echeance=str(self.echeance))
+        self._span_run = stats.traceur.ouvrir("run", fichier=self.fichier, mode=self.mode["nom"],
+                                              nb_sections=len(sections))
+        with self.profileur.etape("planification"):
+            travaux = [[] for _ in sections]
+            for appel in planifier_appels(sections, self.modeles, self.mode, stats.historique, self.compaction):
+                travaux[appel["indice"]].append(appel)
+            stats.progression = self.progression = Progression(travaux, stats.historique)
+        return stats
+
+    def _verifier_annulation(self):
+        if self.annulation.is_set():
+            if self.stats is not None:
+                self.stats.resultats.fermer()
+            raise AnalyseAnnulee(f"Analyse de {self.fichier} annulée")
+
+    def _agent(self, agent, *args, **kwargs) -> str:
+        return agent(*args, stats=self.stats, mode=self.mode, echeance=self.echeance,
+                     fournisseurs=self.fournisseurs, **kwargs)
+
+    def analyser(self, sections: List[Section]) -> Statistiques:
+        """Analyse les sections une à une, en dégradant le run à l'approche de l'échéance"""
+        if self.stats is None:
+            self.demarrer(sections)
+        stats, echeance, progression = self.stats, self.echeance, self.progression
+        durees_sections = []
+        for i, ch in enumerate(sections, 1):
+            self._verifier_annulation()
+            duree_moyenne = sum(durees_sections[-3:]) / len(durees_sections[-3:]) if durees_sections else None
+            niveau = echeance.niveau(len(sections) - i + 1, duree_moyenne)
+
+            if niveau == NON_ANALYSEE:
+                print(f"\n⏰ Échéance atteinte : {len(sections) - i + 1} section(s) non analysée(s)")
+                for reste in sections[i - 1:]:
+                    stats.ajouter_resultat(reste.titre, MESSAGE_NON_ANALYSE, MESSAGE_NON_ANALYSE,
+                                           MESSAGE_NON_ANALYSE, NON_ANALYSEE, reste.fichier)
+                break
+
+            print(f"\n🔎 {i}/{len(sections)}: {ch.titre} ({ch.nb_mots} mots)")
+            if niveau != NORMAL:
+                print(f"   ⏳ Mode dégradé : {niveau}")
+            t_section = time.time()
+            rapide = niveau == MODELE_RAPIDE
+            span_section = stats.traceur.ouvrir("section", titre=ch.titre, numero=i, nb_mots=ch.nb_mots,
+                                                niveau_prevu=niveau)
+
+            # Texte construit ici seulement, le temps des prompts de la section
+            with self.profileur.etape("texte_section"):
+                texte = ch.texte
+            empreinte, proche = self._chercher_similaire(texte)
+            reutilisation = None
+            if proche and proche[0] >= self.similarite.seuil_reprise:
+                # Section quasi identique déjà analysée : aucun appel
+                score, source = proche
+                sci, sty, syn = (source["analyses"][tache] for tache in ("scientifique", "style", "synthese"))
+                reutilisation = {"type": REUTILISATION_IDENTIQUE, "similarite": round(score, 3),
+                                 "titre": source["titre"], "fichier": source["fichier"]}
+                print(f"   ♻️ Analyse reprise ({100 * score:.0f} % similaire à « {source['titre']} »)")
+                self._terminer_section(i, ch, sci, sty, syn, niveau, span_section, durees_sections,
+                                       t_section, reutilisation)
+                continue
+            with self.profileur.etape("compaction"):
+                texte_sci, texte_sty = textes_agents(texte, self.compaction)
+            mesure = mesurer(texte, texte_sci, texte_sty) if self.compaction else None
+            if mesure:
+                print(f"   🗜️ Texte compacté : {mesure['jetons_bruts']} → {mesure['jetons_scientifique']} jetons, "
+                      f"{mesure['caracteres_bruts']} → {mesure['caracteres_scientifique']} caractères "
+                      f"(style : {mesure['jetons_style']} jetons)")
+            if proche:
+                score, source = proche
+                modifications = passages_modifies(source["texte"], texte_sci)
+                reutilisation = {"type": REUTILISATION_REVISION, "similarite": round(score, 3),
+                                 "titre": source["titre"], "fichier": source["fichier"]}
+                print(f"   ♻️ Revue des modifications ({100 * score:.0f} % similaire à « {source['titre']} »)")
+            sans_reponse = stats.nb_sans_reponse
+            abandons = echeance.abandons
+            if proche:
+                sci = self._agent(agent_revision, "scientifique", source["analyses"]["scientifique"],
+                                  modifications, self.modeles["scientifique"], rapide=rapide)
+            else:
+                sci = self._agent(agent_scientifique, texte_sci, self.modeles["scientifique"], rapide=rapide,
+                                  nb_mots=ch.nb_mots)
+            sci_abandonne = echeance.abandons > abandons
+            progression.terminer(i - 1, "scientifique")
+            abandons = echeance.abandons
+            if proche:
+                sty = self._agent(agent_revision, "style", source["analyses"]["style"], modifications,
+                                  self.modeles["style"], rapide=rapide)
+            else:
+                sty = self._agent(agent_style, texte_sty, self.modeles["style"], rapide=rapide, nb_mots=ch.nb_mots)
+            sty_abandonne = echeance.abandons > abandons
+            progression.terminer(i - 1, "style")
+            if sci_abandonne and sty_abandonne:
+                # Échéance atteinte avant le premier appel : rien n'a été analysé
+                sci = sty = syn = MESSAGE_NON_ANALYSE
+                niveau = NON_ANALYSEE
+            elif sci_abandonne or sty_abandonne:
+                syn = "Synthèse non produite (échéance du run)."
+                niveau = INTERROMPUE
+            elif proche:
+                # Les modifications sont revues dans chaque analyse : la synthèse antérieure est gardée
+                syn = source["analyses"]["synthese"]
+            elif niveau == NORMAL and not echeance.depassee():
+                abandons = echeance.abandons
+                syn = self._agent(agent_synthese, ch.titre, [sci, sty], self.modeles["synthese"])
+                if echeance.abandons > abandons:
+                    niveau = SANS_SYNTHESE
+            else:
+                syn = "Synthèse non produite (échéance du run)."
+                if niveau == NORMAL:
+                    niveau = SANS_SYNTHESE
+
+            # Seule une analyse complète, sans texte de repli, sert de référence aux sections suivantes
+            if empreinte is not None and niveau == NORMAL and stats.nb_sans_reponse == sans_reponse:
+                self.similarite.ajouter(empreinte, self.mode["nom"], ch.titre, ch.fichier, texte_sci,
+                                        {"scientifique": sci, "style": sty, "synthese": syn})
+            del texte, texte_sci, texte_sty
+            self._terminer_section(i, ch, sci, sty, syn, niveau, span_section, durees_sections, t_section,
+                                   reutilisation, mesure)
+        return stats
+
+    def _chercher_similaire(self, texte: str) -> Tuple[Optional[List[int]], Optional[Tuple[float, Dict]]]:
+        """Signature MinHash de la section et section la plus proche déjà analysée (si l'index est actif)"""
+        if self.similarite is None:
+            return None, None
+        with self.profileur.etape("similarite"):
+            mots = mots_sans_latex(texte)
+            if len(mots) < MIN_MOTS:
+                return None, None
+            empreinte = signature(mots)
+            return empreinte, self.similarite.chercher(empreinte, self.mode["nom"])
+
+    def _terminer_section(self, i: int, ch: Section, sci: str, sty: str, syn: str, niveau: str, span_section,
+                          durees_sections: List[float], t_section: float, reutilisation: Optional[Dict],
+                          compaction: Optional[Dict] = None):
+        stats, progression = self.stats, self.progression
+        durees_sections.append(time.time() - t_section)
+        progression.terminer_section(i - 1)
+        with self.profileur.etape("journal"):
+            stats.ajouter_resultat(ch.titre, sci, sty, syn, niveau, ch.fichier, durees_sections[-1],
+                                   reutilisation, compaction)
+            stats.resultats.evenement("progression", **progression.estimation())
+        stats.traceur.fermer(span_section, degradation=niveau)
+        if self.fichier_metriques:
+            stats.metriques.ecrire_textfile(self.fichier_metriques)
+
+        print(f"   ✅ Terminé ({i}/{len(progression.travaux)}) | {progression}")
+
+    def exporter(self, otlp: Optional[str] = None) -> Dict[str, Optional[str]]:
+        """Écrit HTML, PDF, JSON, trace (et profil cProfile) ; renvoie leurs chemins"""
+        stats, profileur, mode = self.stats, self.profileur, self.mode["nom"]
+        stats.resultats.evenement("fin", statistiques=stats.obtenir_rapport())
+        chemins: Dict[str, Optional[str]] = {}
+        # JSON en dernier : il reprend le profil des autres exports
+        with stats.traceur.span("export", format="html"), profileur.etape("export_html"):
+            chemins["html"] = generer_html(stats, self.nom_rapport, self.fichier, mode)
+        with stats.traceur.span("export", format="pdf"), profileur.etape("export_pdf"):
+            chemins["pdf"] = generer_pdf(stats, self.nom_rapport, self.fichier, mode)
+        profileur.arreter()
+        chemins["prof"] = profileur.ecrire_cprofile(f"rapports/{self.nom_rapport}.prof") if profileur.actif else None
+        with stats.traceur.span("export", format="json"):
+            chemins["json"] = sauvegarder_json(stats, self.nom_rapport, self.fichier, mode, self.echeance)
+        stats.traceur.fermer(self._span_run)
+        chemins["trace"] = sauvegarder_trace(stats, self.nom_rapport, otlp)
+        if self.fichier_metriques:
+            stats.metriques.ecrire_textfile(self.fichier_metriques)
+        try:
+            stats.historique.sauvegarder()
+        except OSError as e:
+            print(f"⚠️ Historique des appels non enregistré : {e}")
+        if self.similarite is not None:
+            try:
+                self.similarite.sauvegarder()
+            except OSError as e:
+                print(f"⚠️ Index de similarité non enregistré : {e}")
+        stats.resultats.fermer()
+        chemins["journal"] = stats.resultats.chemin
+        return chemins
+
+    def executer(self, fichier: str, otlp: Optional[str] = None) -> Dict[str, Optional[str]]:
+        """Charge, analyse et exporte ; renvoie les chemins des fichiers produits"""
+        self.charger(fichier)
+        sections = self.sections()
+        self.demarrer(sections)
+        self.analyser(sections)
+        self._verifier_annulation()
+        return self.exporter(otlp)
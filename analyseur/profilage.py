@@ -0,0 +1,135 @@
+# ===============================================================
+# analyseur/profilage.py — Temps et mémoire locaux, étape par étape
+# ===============================================================
+# Chaque étape locale du pipeline (lecture, sélection des sections,
+# construction des prompts, exports…) est mesurée : temps réel, temps
+# CPU, pic mémoire (tracemalloc) et principales allocations. Les
+# allocations ne sont relevées que sur les premiers passages de chaque
+# étape, pour que le surcoût reste négligeable sur des milliers de
+# sections. cProfile peut en plus couvrir tout le run (fichier .prof
+# lisible par pstats ou snakeviz). Inactif, le profileur ne mesure rien.
+# ===============================================================
+
+import time
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Iterator
+
+# Passages de chaque étape pour lesquels les allocations sont relevées
+ECHANTILLONS = 3
+NB_ALLOCATIONS = 5
+
+
+class _Etape:
+    __slots__ = ("nb", "duree", "cpu", "pic", "allocations")
+
+    def __init__(self):
+        self.nb = 0
+        self.duree = 0.0
+        self.cpu = 0.0
+        self.pic = 0                               # octets au-delà de la mémoire à l'entrée
+        self.allocations: Dict[str, List[int]] = {}  # ligne → [octets, nombre de blocs]
+
+
+class Profileur:
+    """Minuteurs par étape, tracemalloc et cProfile optionnel"""
+
+    def __init__(self, actif: bool = False, cprofile: bool = False, echantillons: int = ECHANTILLONS):
+        self.actif = actif
+        self.echantillons = echantillons
+        self.etapes: Dict[str, _Etape] = {}
+        self._pile: List[list] = []                # [pic courant, mémoire à l'entrée] par étape ouverte
+        self._profil = cProfile.Profile() if actif and cprofile else None
+        self._tracemalloc = False
+        self.debut = time.perf_counter()
+        self.duree_locale = 0.0                    # étapes de premier niveau seulement
+
+    def demarrer(self):
+        if not self.actif:
+            return
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+            self._tracemalloc = True
+        if self._profil:
+            self._profil.enable()
+
+    def arreter(self):
+        if self._profil:
+            self._profil.disable()
+        if self._tracemalloc:
+            tracemalloc.stop()
+            self._tracemalloc = False
+
+    @contextmanager
+    def etape(self, nom: str) -> Iterator[None]:
+        if not self.actif or not tracemalloc.is_tracing():
+            yield
+            return
+        etape = self.etapes.get(nom)
+        if etape is None:
+            etape = self.etapes[nom] = _Etape()
+        # Le pic global est remis à zéro : celui de l'étape englobante est sauvegardé d'abord
+        courant, pic = tracemalloc.get_traced_memory()
+        if self._pile:
+            self._pile[-1][0] = max(self._pile[-1][0], pic)
+        tracemalloc.reset_peak()
+        self._pile.append([courant, courant])
+        cliche = tracemalloc.take_snapshot() if etape.nb < self.echantillons else None
+        t0, c0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            duree = time.perf_counter() - t0
+            etape.duree += duree
+            etape.cpu += time.process_time() - c0
+            etape.nb += 1
+            pic_etape, entree = self._pile.pop()
+            pic_etape = max(pic_etape, tracemalloc.get_traced_memory()[1])
+            etape.pic = max(etape.pic, pic_etape - entree)
+            if self._pile:
+                self._pile[-1][0] = max(self._pile[-1][0], pic_etape)
+            else:
+                self.duree_locale += duree
+            if cliche is not None:
+                self._relever(etape, cliche)
+
+    @staticmethod
+    def _relever(etape: _Etape, cliche: tracemalloc.Snapshot):
+        filtres = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        apres = tracemalloc.take_snapshot().filter_traces(filtres)
+        for difference in apres.compare_to(cliche.filter_traces(filtres), "lineno")[:NB_ALLOCATIONS]:
+            if difference.size_diff <= 0:
+                continue
+            cadre = difference.traceback[0]
+            ligne = f"{cadre.filename}:{cadre.lineno}"
+            cumul = etape.allocations.setdefault(ligne, [0, 0])
+            cumul[0] += difference.size_diff
+            cumul[1] += difference.count_diff
+
+    def ecrire_cprofile(self, chemin: str) -> Optional[str]:
+        """Statistiques cProfile au format pstats (None si cProfile n'était pas actif)"""
+        if not self._profil:
+            return None
+        self._profil.dump_stats(chemin)
+        return chemin
+
+    def rapport(self) -> Dict:
+        etapes = {}
+        for nom, etape in sorted(self.etapes.items(), key=lambda e: -e[1].duree):
+            allocations = sorted(etape.allocations.items(), key=lambda a: -a[1][0])[:NB_ALLOCATIONS]
+            etapes[nom] = {
+                "nb": etape.nb,
+                "duree_sec": round(etape.duree, 4),
+                "cpu_sec": round(etape.cpu, 4),
+                "duree_moyenne_ms": round(1000 * etape.duree / etape.nb, 3) if etape.nb else None,
+                "pic_memoire_ko": round(etape.pic / 1024, 1),
+                "allocations": [{"ligne": ligne, "ko": round(octets / 1024, 1), "blocs": blocs}
+                                for ligne, (octets, blocs) in allocations],
+            }
+        return {
+            "duree_run_sec": round(time.perf_counter() - self.debut, 2),
+            "duree_locale_sec": round(self.duree_locale, 4),
+            "echantillons_allocations": self.echantillons,
+            "etapes": etapes,
+        }
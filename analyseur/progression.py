@@ -0,0 +1,101 @@
+# ===============================================================
+# analyseur/progression.py — Temps restant estimé en cours de run
+# ===============================================================
+# Le travail restant est la liste des appels prévus pour les sections
+# non terminées, chacun dimensionné par son budget de jetons. Sa durée
+# vient du modèle de l'historique (latence + jetons / débit), corrigé
+# par fournisseur d'un facteur lissé : durée observée / durée prévue
+# de chaque appel qui se termine. Une section longue pèse donc plus
+# qu'une courte, et l'estimation ne saute pas d'une section à l'autre.
+# ===============================================================
+
+import time
+from datetime import datetime
+from typing import Optional, List, Dict
+
+from analyseur.estimation import HistoriqueAppels
+
+# Poids de la dernière observation dans le facteur de correction
+LISSAGE = 0.3
+
+
+class Progression:
+    """Temps restant d'après les jetons prévus et le débit observé par fournisseur"""
+
+    def __init__(self, travaux: List[List[Dict]], historique: Optional[HistoriqueAppels] = None,
+                 concurrence: int = 1, lissage: float = LISSAGE):
+        # travaux[i] : appels prévus de la section i ({tache, fournisseur, budget})
+        self.travaux = [[dict(appel) for appel in appels] for appels in travaux]
+        self.historique = historique or HistoriqueAppels(None)
+        self.concurrence = max(concurrence, 1)
+        self.lissage = lissage
+        self.facteurs: Dict[str, float] = {}
+        self._modeles: Dict[str, Dict] = {}
+        self._restantes = set(range(len(travaux)))
+        # Durée prévue (non corrigée) du travail restant, par fournisseur : mise à jour en O(1)
+        self._reste: Dict[str, float] = {}
+        for appels in self.travaux:
+            for appel in appels:
+                appel["prevue"] = self._prevue(appel)
+                self._reste[appel["fournisseur"]] = self._reste.get(appel["fournisseur"], 0.0) + appel["prevue"]
+        self.total = sum(self._reste.values())
+
+    def _modele(self, fournisseur: str) -> Dict:
+        if fournisseur not in self._modeles:
+            self._modeles[fournisseur] = self.historique.modele(fournisseur)
+        return self._modeles[fournisseur]
+
+    def _prevue(self, appel: Dict, jetons_sortie: Optional[int] = None) -> float:
+        """Durée prévue d'un appel, sans correction"""
+        modele = self._modele(appel["fournisseur"])
+        if jetons_sortie is None:
+            jetons_sortie = appel.get("budget", 0) * modele["remplissage"]
+        return modele["latence"] + jetons_sortie / modele["debit"]
+
+    def observer(self, fournisseur: str, duree: float, jetons_sortie: Optional[int] = None,
+                 budget: Optional[int] = None):
+        """Un appel vient de se terminer : met à jour le facteur de ce fournisseur"""
+        prevue = self._prevue({"fournisseur": fournisseur, "budget": budget or 0}, jetons_sortie)
+        if prevue <= 0:
+            return
+        rapport = duree / prevue
+        ancien = self.facteurs.get(fournisseur)
+        self.facteurs[fournisseur] = rapport if ancien is None else \
+            (1 - self.lissage) * ancien + self.lissage * rapport
+
+    def terminer(self, section: int, tache: str) -> Optional[Dict]:
+        """L'appel prévu `tache` de la section est fait (ou abandonné) ; renvoie l'appel prévu"""
+        appels = self.travaux[section]
+        for i, appel in enumerate(appels):
+            if appel["tache"] == tache:
+                self._reste[appel["fournisseur"]] -= appel["prevue"]
+                del appels[i]
+                return appel
+        return None
+
+    def terminer_section(self, section: int):
+        for appel in self.travaux[section]:
+            self._reste[appel["fournisseur"]] -= appel["prevue"]
+        self.travaux[section] = []
+        self._restantes.discard(section)
+
+    def restant(self) -> float:
+        secondes = sum(max(reste, 0.0) * self.facteurs.get(fournisseur, 1.0)
+                       for fournisseur, reste in self._reste.items())
+        return secondes / self.concurrence
+
+    def estimation(self) -> Dict:
+        restant = self.restant()
+        prevu_restant = sum(max(reste, 0.0) for reste in self._reste.values())
+        return {
+            "sections_restantes": len(self._restantes),
+            "avancement": round(1 - prevu_restant / self.total, 3) if self.total else 1.0,
+            "restant_sec": round(restant, 1),
+            "fin_prevue": datetime.fromtimestamp(time.time() + restant).strftime("%H:%M:%S"),
+            "facteurs": {f: round(v, 2) for f, v in self.facteurs.items()},
+        }
+
+    def __str__(self) -> str:
+        estimation = self.estimation()
+        return (f"{100 * estimation['avancement']:.0f} % | reste ~{estimation['restant_sec'] / 60:.1f} min "
+                f"(fin vers {estimation['fin_prevue'][:5]})")
@@ -0,0 +1,329 @@
+# ===============================================================
+# analyseur/rapport_html.py — Rapport HTML écrit au fil de l'eau
+# ===============================================================
+# L'en-tête, chaque chapitre puis le pied de page sont écrits
+# directement dans le fichier (ou tout flux texte) : aucune chaîne
+# ne grossit avec le nombre de sections. Les gabarits sont compilés
+# une fois au chargement du module ; les analyses sont reproduites
+# en entier, échappées pour le HTML.
+# ===============================================================
+
+import os
+from html import escape
+from string import Template
+from datetime import datetime
+from typing import Optional, List, Dict, Iterable, Tuple, IO
+
+from analyseur.echeance import NORMAL, SANS_SYNTHESE, MODELE_RAPIDE, NON_ANALYSEE, INTERROMPUE
+from analyseur.similarite import REUTILISATION_IDENTIQUE
+
+# Libellé affiché pour chaque niveau de dégradation
+LIBELLES_DEGRADATION = {
+    SANS_SYNTHESE: "sans synthèse",
+    MODELE_RAPIDE: "modèle rapide, sans synthèse",
+    INTERROMPUE: "interrompue par l'échéance",
+    NON_ANALYSEE: "non analysée",
+}
+
+STYLE = """
+        * {
+            margin: 0;
+            padding: 0;
+            box-sizing: border-box;
+        }
+        body {
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+            line-height: 1.6;
+            color: #333;
+            background-color: #f5f5f5;
+        }
+        .container {
+            max-width: 900px;
+            margin: 40px auto;
+            background-color: white;
+            padding: 40px;
+            box-shadow: 0 0 20px rgba(0,0,0,0.1);
+            border-radius: 8px;
+        }
+        h1 {
+            color: #1f4788;
+            border-bottom: 3px solid #1f4788;
+            padding-bottom: 15px;
+            margin-bottom: 30px;
+            font-size: 2.5em;
+        }
+        h2 {
+            color: #2e5c8a;
+            margin-top: 30px;
+            margin-bottom: 15px;
+            font-size: 1.8em;
+            border-left: 4px solid #2e5c8a;
+            padding-left: 15px;
+        }
+        h3 {
+            color: #3e6fa6;
+            margin-top: 20px;
+            margin-bottom: 10px;
+            font-size: 1.2em;
+        }
+        .metadata {
+            background-color: #e8f0f7;
+            padding: 20px;
+            border-radius: 5px;
+            margin-bottom: 30px;
+            border-left: 4px solid #1f4788;
+        }
+        .metadata p {
+            margin: 8px 0;
+            font-size: 0.95em;
+        }
+        .metadata strong {
+            color: #1f4788;
+            display: inline-block;
+            min-width: 180px;
+        }
+        .stats {
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
+            gap: 20px;
+            margin: 20px 0;
+        }
+        .stat-card {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 20px;
+            border-radius: 8px;
+            text-align: center;
+            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+        }
+        .stat-value {
+            font-size: 2em;
+            font-weight: bold;
+            margin: 10px 0;
+        }
+        .stat-label {
+            font-size: 0.9em;
+            opacity: 0.9;
+        }
+        .chapter {
+            page-break-inside: avoid;
+            margin: 30px 0;
+            padding: 20px;
+            background-color: #f9f9f9;
+            border-radius: 5px;
+            border-left: 4px solid #2e5c8a;
+        }
+        .chapter-title {
+            color: #1f4788;
+            font-size: 1.5em;
+            margin-bottom: 15px;
+        }
+        .chapter-source {
+            color: #999;
+            font-size: 0.85em;
+            margin: -10px 0 15px 0;
+        }
+        .degraded {
+            font-size: 0.6em;
+            color: #b35c00;
+            background-color: #fff1e0;
+            border-radius: 4px;
+            padding: 2px 8px;
+            vertical-align: middle;
+        }
+        .reused {
+            font-size: 0.6em;
+            color: #2e7d32;
+            background-color: #e8f5e9;
+            border-radius: 4px;
+            padding: 2px 8px;
+            vertical-align: middle;
+        }
+        .analysis-section {
+            margin: 15px 0;
+            padding: 15px;
+            background-color: white;
+            border-radius: 4px;
+            border-left: 3px solid #667eea;
+        }
+        .analysis-title {
+            color: #667eea;
+            font-weight: bold;
+            margin-bottom: 10px;
+            font-size: 1.05em;
+        }
+        .analysis-content {
+            color: #555;
+            line-height: 1.8;
+            font-size: 0.95em;
+            white-space: pre-wrap;
+        }
+        .footer {
+            margin-top: 50px;
+            padding-top: 20px;
+            border-top: 2px solid #e8f0f7;
+            text-align: center;
+            color: #999;
+            font-size: 0.9em;
+        }
+        @media print {
+            body {
+                background-color: white;
+            }
+            .container {
+                box-shadow: none;
+                margin: 0;
+                padding: 20px;
+            }
+            .chapter {
+                page-break-inside: avoid;
+            }
+        }
+"""
+
+_ENTETE = Template("""<!DOCTYPE html>
+<html lang="fr">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Rapport d'Analyse Académique</title>
+    <style>$style    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>📊 Rapport d'Analyse Académique</h1>
+
+        <div class="metadata">
+$metadonnees        </div>
+
+        <h2>Statistiques Globales</h2>
+        <div class="stats">
+$cartes        </div>
+
+        <h2>Détails des Analyses par Chapitre</h2>
+""")
+
+_METADONNEE = Template("""            <p><strong>$libelle :</strong> $valeur</p>
+""")
+
+_CARTE = Template("""            <div class="stat-card">
+                <div class="stat-label">$libelle</div>
+                <div class="stat-value">$valeur</div>
+                <div class="stat-label">$unite</div>
+            </div>
+""")
+
+_CHAPITRE = Template("""
+        <div class="chapter">
+            <div class="chapter-title">Chapitre $numero: $titre$badge</div>
+$source
+            <div class="analysis-section">
+                <div class="analysis-title">✓ Rigueur Scientifique</div>
+                <div class="analysis-content">$scientifique</div>
+            </div>
+
+            <div class="analysis-section">
+                <div class="analysis-title">✓ Style et Clarté</div>
+                <div class="analysis-content">$style</div>
+            </div>
+
+            <div class="analysis-section">
+                <div class="analysis-title">✓ Synthèse</div>
+                <div class="analysis-content">$synthese</div>
+            </div>
+        </div>
+""")
+
+_SOURCE = Template("""            <div class="chapter-source">$fichier</div>
+""")
+
+_PIED = Template("""
+        <div class="footer">
+            <p>Rapport généré automatiquement le $date</p>
+            <p>Analyseur Multi-Modèles IA $version</p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+
+def cartes_par_defaut(rapport: Dict, nb_sections: int) -> List[Tuple[str, object, str]]:
+    """Cartes de statistiques (libellé, valeur, unité) du rapport v3.2"""
+    return [
+        ("Temps Total", rapport["temps_total_min"], "minutes"),
+        ("Appels API", rapport["nb_appels"], "total"),
+        ("Taux de Succès", f"{rapport['taux_succes']}%", "réussite"),
+        ("Sections", nb_sections, "analysées"),
+    ]
+
+
+class RapportHTML:
+    """Rapport HTML écrit par morceaux dans un flux texte"""
+
+    def __init__(self, flux: IO[str], fichier_source: str, version: str = "v3.2"):
+        self.flux = flux
+        self.fichier_source = fichier_source
+        self.version = version
+        self.nb_chapitres = 0
+
+    def entete(self, mode: str, rapport: Dict, nb_sections: int,
+               cartes: Optional[List[Tuple[str, object, str]]] = None):
+        metadonnees = [
+            ("Fichier source", self.fichier_source),
+            ("Mode d'analyse", mode),
+            ("Date du rapport", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+            ("Nombre de sections", nb_sections),
+        ]
+        if "nb_sections_degradees" in rapport:
+            metadonnees.append(("Sections dégradées", rapport["nb_sections_degradees"]))
+        if rapport.get("sections_reutilisees"):
+            metadonnees.append(("Sections reprises d'analyses antérieures",
+                                sum(rapport["sections_reutilisees"].values())))
+        self.flux.write(_ENTETE.substitute(
+            style=STYLE,
+            metadonnees="".join(_METADONNEE.substitute(libelle=libelle, valeur=escape(str(valeur)))
+                                for libelle, valeur in metadonnees),
+            cartes="".join(_CARTE.substitute(libelle=libelle, valeur=escape(str(valeur)), unite=unite)
+                           for libelle, valeur, unite in cartes or cartes_par_defaut(rapport, nb_sections)),
+        ))
+
+    def chapitre(self, resultat: Dict):
+        self.nb_chapitres += 1
+        degradation = resultat.get("degradation", NORMAL)
+        badge = ""
+        if degradation != NORMAL:
+            badge = f' <span class="degraded">⏳ {LIBELLES_DEGRADATION[degradation]}</span>'
+        reutilisation = resultat.get("reutilisation")
+        if reutilisation:
+            libelle = "Reprise" if reutilisation["type"] == REUTILISATION_IDENTIQUE else "Revue des modifications"
+            badge += (f' <span class="reused">♻️ {libelle} ({100 * reutilisation["similarite"]:.0f} % '
+                      f'similaire à « {escape(reutilisation["titre"])} »)</span>')
+        source = ""
+        if "fichier" in resultat:
+            source = _SOURCE.substitute(
+                fichier=escape(os.path.basename(resultat["fichier"] or self.fichier_source)))
+        self.flux.write(_CHAPITRE.substitute(
+            numero=self.nb_chapitres,
+            titre=escape(resultat["chapitre"]),
+            badge=badge,
+            source=source,
+            scientifique=escape(resultat["scientifique"]),
+            style=escape(resultat["style"]),
+            synthese=escape(resultat["synthese"]),
+        ))
+
+    def pied(self):
+        self.flux.write(_PIED.substitute(date=datetime.now().strftime("%d/%m/%Y à %H:%M:%S"),
+                                         version=escape(self.version)))
+
+
+def ecrire_rapport_html(flux: IO[str], resultats: Iterable[Dict], fichier_source: str, mode: str,
+                        rapport: Dict, nb_sections: int, version: str = "v3.2",
+                        cartes: Optional[List[Tuple[str, object, str]]] = None):
+    """Écrit le rapport complet dans flux, un chapitre à la fois"""
+    rapport_html = RapportHTML(flux, fichier_source, version)
+    rapport_html.entete(mode, rapport, nb_sections, cartes)
+    for resultat in resultats:
+        rapport_html.chapitre(resultat)
+    rapport_html.pied()
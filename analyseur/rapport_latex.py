@@ -0,0 +1,105 @@
+# ===============================================================
+# analyseur/rapport_latex.py — Rapport LaTeX écrit au fil du run
+# ===============================================================
+# Chaque synthèse est ajoutée au fichier dès qu'elle est prête. Après
+# chaque ajout (point de contrôle), les environnements ouverts et
+# \end{document} sont écrits puis repris à l'ajout suivant : le
+# fichier compile à tout moment, même si le run est interrompu.
+# Le texte produit par les modèles est échappé en une seule passe
+# (table de traduction couvrant tous les caractères spéciaux).
+# ===============================================================
+
+from typing import Dict
+
+# Caractères spéciaux de LaTeX → forme littérale
+_ECHAPPEMENTS = str.maketrans({
+    "\\": r"\textbackslash{}",
+    "{": r"\{",
+    "}": r"\}",
+    "$": r"\$",
+    "&": r"\&",
+    "%": r"\%",
+    "#": r"\#",
+    "_": r"\_",
+    "^": r"\textasciicircum{}",
+    "~": r"\textasciitilde{}",
+})
+
+PREAMBULE = r"""\documentclass[12pt,a4paper]{report}
+\usepackage[utf8]{inputenc}
+\usepackage[french]{babel}
+\usepackage{geometry}
+\usepackage{xcolor}
+\geometry{margin=2.5cm}
+\begin{document}
+\title{%s}
+\author{%s}
+\date{\today}
+\maketitle
+
+"""
+
+FIN_DOCUMENT = "\\end{document}\n"
+
+
+def echapper_latex(texte: str) -> str:
+    """Texte brut rendu littéralement par LaTeX (une seule passe)"""
+    return texte.translate(_ECHAPPEMENTS)
+
+
+class RapportLatex:
+    """Rapport LaTeX compilable à chaque point de contrôle"""
+
+    def __init__(self, chemin: str, titre: str = "Rapport d'analyse multi-agent",
+                 auteur: str = "Généré par IA multi-modèles"):
+        self.chemin = chemin
+        self._fichier = open(chemin, "w+", encoding="utf-8", newline="\n")
+        self._fichier.write(PREAMBULE % (echapper_latex(titre), echapper_latex(auteur)))
+        self._position = self._fichier.tell()
+        self.nb_sections = 0
+        self.point_de_controle()
+
+    def _ajouter(self, texte: str):
+        """Écrit à la suite du contenu, par-dessus la clôture du dernier point de contrôle"""
+        self._fichier.seek(self._position)
+        self._fichier.write(texte)
+        self._position = self._fichier.tell()
+
+    def point_de_controle(self):
+        """Clôt le document sur disque ; le prochain ajout reprendra avant la clôture"""
+        self._fichier.seek(self._position)
+        self._fichier.write(FIN_DOCUMENT)
+        self._fichier.truncate()
+        self._fichier.flush()
+
+    def configuration(self, mode: str, modeles: Dict[str, str]):
+        self._ajouter("\\section*{Configuration utilisée}\n"
+                      f"Mode d'analyse : {echapper_latex(mode)}\n\n"
+                      "Modèles IA par tâche :\n\\begin{itemize}\n"
+                      + "".join(f"\\item {echapper_latex(tache.capitalize())} : "
+                                f"{echapper_latex(modele.upper())}\n" for tache, modele in modeles.items())
+                      + "\\end{itemize}\n\n"
+                      "\\tableofcontents\n\\newpage\n")
+        self.point_de_controle()
+
+    def partie(self, titre: str):
+        """Nouveau chapitre non numéroté du rapport (titre en LaTeX), repris dans la table des matières"""
+        self._ajouter(f"\\chapter*{{{titre}}}\n\\addcontentsline{{toc}}{{chapter}}{{{titre}}}\n")
+        self.point_de_controle()
+
+    def section(self, titre: str, texte: str):
+        """Ajoute une section : titre en LaTeX (issu du manuscrit), texte brut échappé"""
+        self._ajouter(f"\\section*{{{titre}}}\n\\addcontentsline{{toc}}{{section}}{{{titre}}}\n"
+                      f"{echapper_latex(texte)}\n\n")
+        self.nb_sections += 1
+        self.point_de_controle()
+
+    def paragraphe(self, texte: str):
+        """Ajoute du texte brut, échappé, sans titre"""
+        self._ajouter(f"{echapper_latex(texte)}\n\n")
+        self.point_de_controle()
+
+    def fermer(self):
+        if not self._fichier.closed:
+            self.point_de_controle()
+            self._fichier.close()
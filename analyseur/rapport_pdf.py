@@ -0,0 +1,68 @@
+# ===============================================================
+# analyseur/rapport_pdf.py — Rapport PDF natif
+# ===============================================================
+# Même contenu que le rapport HTML, mis en page directement en PDF
+# par analyseur.pdf : pas de navigateur, de reportlab ni de
+# processus externe. Les résultats sont lus un par un.
+# ===============================================================
+
+import os
+from datetime import datetime
+from typing import Dict, Iterable, IO
+
+from analyseur.echeance import NORMAL
+from analyseur.pdf import EcrivainPDF
+from analyseur.rapport_html import LIBELLES_DEGRADATION
+
+BLEU = (0.12, 0.28, 0.53)
+VIOLET = (0.40, 0.49, 0.92)
+GRIS = (0.6, 0.6, 0.6)
+ORANGE = (0.70, 0.36, 0.0)
+
+RUBRIQUES = (
+    ("scientifique", "Rigueur Scientifique"),
+    ("style", "Style et Clarté"),
+    ("synthese", "Synthèse"),
+)
+
+
+def ecrire_rapport_pdf(flux: IO[bytes], resultats: Iterable[Dict], fichier_source: str, mode: str,
+                       rapport: Dict, nb_sections: int, version: str = "v3.2"):
+    """Écrit le rapport complet en PDF dans un flux binaire, un chapitre à la fois"""
+    pdf = EcrivainPDF(flux, "Rapport d'Analyse Académique", f"Analyseur Multi-Modèles IA {version}")
+    pdf.paragraphe("Rapport d'Analyse Académique", 22, gras=True, couleur=BLEU)
+    pdf.espace(12)
+
+    metadonnees = [
+        ("Fichier source", fichier_source),
+        ("Mode d'analyse", mode),
+        ("Date du rapport", datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        ("Nombre de sections", nb_sections),
+    ]
+    if "nb_sections_degradees" in rapport:
+        metadonnees.append(("Sections dégradées", rapport["nb_sections_degradees"]))
+    for libelle, valeur in metadonnees:
+        pdf.paragraphe(f"{libelle} : {valeur}", 10)
+    pdf.espace(10)
+
+    pdf.paragraphe("Statistiques Globales", 15, gras=True, couleur=BLEU)
+    pdf.espace(4)
+    pdf.paragraphe(f"Temps total : {rapport['temps_total_min']} minutes  |  "
+                   f"Appels API : {rapport['nb_appels']}  |  Taux de succès : {rapport['taux_succes']}%", 10)
+    pdf.espace(10)
+
+    pdf.paragraphe("Détails des Analyses par Chapitre", 15, gras=True, couleur=BLEU)
+    for i, resultat in enumerate(resultats, 1):
+        pdf.espace(14)
+        pdf.paragraphe(f"Chapitre {i}: {resultat['chapitre']}", 13, gras=True, couleur=BLEU)
+        degradation = resultat.get("degradation", NORMAL)
+        if degradation != NORMAL:
+            pdf.paragraphe(f"Mode dégradé : {LIBELLES_DEGRADATION[degradation]}", 9, couleur=ORANGE)
+        if "fichier" in resultat:
+            pdf.paragraphe(os.path.basename(resultat["fichier"] or fichier_source), 8, couleur=GRIS)
+        for cle, titre in RUBRIQUES:
+            pdf.espace(6)
+            pdf.paragraphe(titre, 10.5, gras=True, couleur=VIOLET)
+            pdf.paragraphe(resultat[cle], 9.5, retrait=8)
+
+    pdf.fermer()
@@ -0,0 +1,115 @@
+# ===============================================================
+# analyseur/resultats.py — Résultats d'analyse stockés sur disque
+# ===============================================================
+# Chaque résultat (analyses scientifique, stylistique, synthèse) est
+# écrit en JSON Lines dès qu'il arrive ; la mémoire ne garde qu'un
+# index léger (position dans le fichier, titre, dégradation). Les
+# exports relisent le fichier ligne à ligne : la mémoire reste
+# constante quel que soit le nombre de sections.
+#
+# Le même fichier sert de journal du run : chaque ligne porte un champ
+# "evenement" (debut, appel, bascule, section, fin) et un horodatage,
+# si bien qu'un tableau de bord peut le suivre en direct (tail -f).
+# ===============================================================
+
+import os
+import json
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, List, Dict, Iterator, Tuple, IO
+
+
+# Événement des lignes de résultat (les autres lignes ne sont pas indexées)
+SECTION = "section"
+
+
+class MagasinResultats:
+    """Résultats d'analyse et événements du run en JSON Lines, avec un index en mémoire"""
+
+    def __init__(self, chemin: Optional[str] = None):
+        self.temporaire = chemin is None
+        if chemin is None:
+            descripteur, chemin = tempfile.mkstemp(prefix="resultats_", suffix=".jsonl")
+            os.close(descripteur)
+        else:
+            Path(chemin).parent.mkdir(parents=True, exist_ok=True)
+        self.chemin = chemin
+        self._fichier = open(chemin, "wb")
+        # (position de la ligne, titre, dégradation) pour chaque résultat
+        self.index: List[Tuple[int, str, str]] = []
+
+    def _ecrire(self, evenement: str, donnees: Dict) -> int:
+        position = self._fichier.tell()
+        enregistrement = {"evenement": evenement,
+                          "horodatage": datetime.now().isoformat(timespec="milliseconds")}
+        enregistrement.update(donnees)
+        ligne = json.dumps(enregistrement, ensure_ascii=False) + "\n"
+        self._fichier.write(ligne.encode("utf-8"))
+        self._fichier.flush()
+        return position
+
+    def evenement(self, evenement: str, **donnees):
+        """Ajoute une ligne de journal (appel d'agent, bascule, début/fin du run)"""
+        self._ecrire(evenement, donnees)
+
+    def ajouter(self, resultat: Dict):
+        """Écrit un résultat immédiatement (une ligne JSON)"""
+        position = self._ecrire(SECTION, resultat)
+        self.index.append((position, resultat.get("chapitre", ""), resultat.get("degradation", "")))
+
+    @staticmethod
+    def _resultat(ligne: bytes) -> Dict:
+        resultat = json.loads(ligne)
+        del resultat["evenement"], resultat["horodatage"]
+        return resultat
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Relit les résultats un par un depuis le disque (lignes de journal ignorées)"""
+        if not self._fichier.closed:
+            self._fichier.flush()
+        with open(self.chemin, "rb") as f:
+            for position, _, _ in self.index:
+                f.seek(position)
+                yield self._resultat(f.readline())
+
+    def __getitem__(self, i: int) -> Dict:
+        position = self.index[i][0]
+        if not self._fichier.closed:
+            self._fichier.flush()
+        with open(self.chemin, "rb") as f:
+            f.seek(position)
+            return self._resultat(f.readline())
+
+    def compter(self, degradation: str) -> int:
+        """Nombre de résultats ayant ce niveau de dégradation"""
+        return sum(1 for _, _, niveau in self.index if niveau == degradation)
+
+    def ecrire_json(self, flux: IO[str], indent: int = 2, niveau: int = 0):
+        """Écrit la liste des résultats en JSON dans un flux, un résultat à la fois.
+
+        niveau = profondeur d'imbrication de la liste dans le document,
+        pour une indentation identique à celle de json.dump.
+        """
+        base = " " * (indent * niveau)
+        marge = base + " " * indent
+        flux.write("[")
+        for i, resultat in enumerate(self):
+            bloc = json.dumps(resultat, ensure_ascii=False, indent=indent)
+            flux.write(("," if i else "") + "\n" + marge + bloc.replace("\n", "\n" + marge))
+        flux.write("\n" + base + "]" if self.index else "]")
+
+    def fermer(self):
+        if not self._fichier.closed:
+            self._fichier.close()
+        if self.temporaire and os.path.exists(self.chemin):
+            os.remove(self.chemin)
+
+    def __del__(self):
+        try:
+            self.fermer()
+        except Exception:
+            pass
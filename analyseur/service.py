@@ -0,0 +1,351 @@
+# ===============================================================
+# analyseur/service.py — Mode serve : analyses soumises par HTTP
+# ===============================================================
+# Un processus de longue durée garde ses clients API, son cache des
+# réponses, ses limiteurs par fournisseur, le cache des analyses LaTeX
+# l'historique des appels et, s'il est actif, l'index des sections
+# déjà analysées (analyseur/similarite.py) d'un travail à l'autre. Les manuscrits
+# arrivent par une petite API HTTP locale (JSON) ; plusieurs travaux
+# s'exécutent en parallèle, sous les mêmes limites par fournisseur.
+# Les travaux passent par la file SQLite (analyseur/file_travaux.py) :
+# d'autres processus ouvriers, sur cette machine ou sur une autre qui
+# partage le dossier, peuvent les prendre eux aussi.
+#
+#   POST /travaux                    {"fichier": chemin} ou {"nom", "contenu"},
+#                                    + "mode", "modeles", "echeance", "interactif",
+#                                    "poids" optionnels
+#   POST /travaux/<id>/relancer      remet en file un travail en lettre morte
+#   GET  /travaux                    liste des travaux (?etat=... pour filtrer)
+#   GET  /travaux/<id>               état (et avancement s'il est en cours)
+#   GET  /travaux/<id>/evenements    journal JSONL, suivi jusqu'à la fin du travail
+#   GET  /travaux/<id>/rapport.html  (ou .json, .pdf) rapport produit
+#   GET  /sante                      files, cache et fournisseurs
+# ===============================================================
+
+import os
+import json
+import time
+import uuid
+import socket
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict
+from urllib.parse import parse_qs, urlsplit
+
+from analyseur.echeance import Echeance
+from analyseur.estimation import HistoriqueAppels
+from analyseur.file_travaux import FileTravaux, FICHIER_FILE, EN_ATTENTE, EN_COURS, FACTEUR_INTERACTIF
+from analyseur.fournisseurs import Fournisseurs, Limiteur, CacheReponses
+from analyseur.manuscrit import CacheAnalyses
+from analyseur.pipeline import AnalyseAnnulee, Pipeline, MODE_RAPIDE, MODE_NORMAL, MODE_DETAILLE
+from analyseur.similarite import IndexSimilarite
+
+PORT_SERVICE = 8765
+
+MODES_PAR_NOM = {"rapide": MODE_RAPIDE, "normal": MODE_NORMAL, "detaille": MODE_DETAILLE,
+                 "détaillé": MODE_DETAILLE}
+
+# Appels simultanés par fournisseur, pour tous les travaux réunis
+LIMITES_DEFAUT = {"claude": 4, "openai": 8, "gemini": 8}
+
+# Rapports servis par GET /travaux/<id>/rapport.<format>
+TYPES_RAPPORT = {"html": "text/html; charset=utf-8", "json": "application/json; charset=utf-8",
+                 "pdf": "application/pdf"}
+
+
+def parser_limites(valeur: Optional[str]) -> Dict[str, Limiteur]:
+    """'claude=4:50,openai=8' → limiteurs (appels simultanés[:appels par minute])"""
+    limites = {nom: Limiteur(n) for nom, n in LIMITES_DEFAUT.items()}
+    for element in filter(None, (valeur or "").split(",")):
+        nom, _, reglage = element.partition("=")
+        concurrence, _, rpm = reglage.partition(":")
+        limites[nom.strip()] = Limiteur(int(concurrence), float(rpm) if rpm else None)
+    return limites
+
+
+# ===============================================================
+# OUVRIER
+# ===============================================================
+
+class Ouvrier:
+    """Fils qui prennent les travaux de la file et les exécutent, ressources partagées entre travaux"""
+
+    def __init__(self, file: FileTravaux, nb_travaux: int = 2, limites: Optional[Dict[str, Limiteur]] = None,
+                 fournisseurs: Optional[Fournisseurs] = None, intervalle: float = 2.0, reserves: int = 0,
+                 similarite: Optional[IndexSimilarite] = None):
+        self.file = file
+        self.nom = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:4]}"
+        self.fournisseurs = fournisseurs or Fournisseurs(limites=limites or parser_limites(None),
+                                                         cache=CacheReponses())
+        self.cache = CacheAnalyses()
+        self.historique = HistoriqueAppels()
+        self.similarite = similarite
+        self.nb_travaux = max(nb_travaux, 1)
+        # Places en plus, réservées aux travaux interactifs : ils n'attendent pas la fin d'un gros travail
+        self.reserves = max(reserves, 0)
+        self.intervalle = intervalle
+        self.pipelines: Dict[str, Pipeline] = {}
+        self._arret = threading.Event()
+        self._fils = [threading.Thread(target=self._boucle, args=(i >= self.nb_travaux,),
+                                       name=f"travail-{i + 1}", daemon=True)
+                      for i in range(self.nb_travaux + self.reserves)]
+        # Le battement continue tant que le processus vit, même pendant un arrêt en douceur
+        threading.Thread(target=self._battre, name="battement", daemon=True).start()
+        for fil in self._fils:
+            fil.start()
+
+    def _boucle(self, interactifs_seulement: bool = False):
+        while not self._arret.is_set():
+            travail = self.file.prendre(self.nom, interactifs_seulement)
+            if travail is None:
+                self._arret.wait(self.intervalle)
+                continue
+            self._executer(travail)
+
+    def _executer(self, travail: Dict):
+        identifiant = travail["id"]
+        poids = travail["poids"] * (FACTEUR_INTERACTIF if travail["interactif"] else 1.0)
+        attente_file = (datetime.fromisoformat(travail["debut"])
+                        - datetime.fromisoformat(travail["soumis"])).total_seconds()
+        # Fichiers propres à la tentative : un ouvrier qui a perdu son bail n'écrit pas dans ceux de la suivante
+        nom_rapport = f"travail_{identifiant}_{travail['tentatives']}"
+        pipeline = Pipeline(MODES_PAR_NOM[travail["mode"]], travail.get("modeles"),
+                            Echeance.parser(travail.get("echeance")), self.fournisseurs,
+                            nom_rapport=nom_rapport, cache=self.cache, historique=self.historique,
+                            poids=poids, attente_file=attente_file, similarite=self.similarite)
+        self.pipelines[identifiant] = pipeline
+        self.file.battre(identifiant, self.nom, journal=os.path.abspath(f"rapports/{nom_rapport}.jsonl"))
+        print(f"▶️ Travail {identifiant} ({travail['mode']}, poids {poids:g}, tentative {travail['tentatives']}, "
+              f"{attente_file:.0f}s en file) : {travail['fichier']}")
+        try:
+            chemins = pipeline.executer(travail["fichier"])
+        except AnalyseAnnulee:
+            print(f"⏹️ Travail {identifiant} arrêté après la perte de son bail : rien n'est écrit")
+        except Exception as e:
+            print(f"❌ Travail {identifiant} en échec : {e}")
+            self.file.echouer(identifiant, self.nom, str(e))
+        else:
+            chemins = {format: os.path.abspath(chemin) if chemin else None for format, chemin in chemins.items()}
+            if self.file.terminer(identifiant, self.nom, chemins):
+                attente = sum(sec for sec, _ in pipeline.stats.attentes.values())
+                print(f"✅ Travail {identifiant} terminé ({attente:.0f}s d'attente de places fournisseurs)")
+            else:
+                print(f"⚠️ Travail {identifiant} terminé après la perte de son bail : résultat non enregistré")
+        finally:
+            self.pipelines.pop(identifiant, None)
+
+    def _battre(self):
+        while True:
+            time.sleep(self.file.bail / 4)
+            for identifiant, pipeline in list(self.pipelines.items()):
+                avancement = pipeline.progression.estimation() if pipeline.progression else None
+                try:
+                    if not self.file.battre(identifiant, self.nom, avancement) and not pipeline.annulation.is_set():
+                        print(f"⚠️ Bail perdu pour le travail {identifiant} (repris par un autre ouvrier) : "
+                              f"arrêt avant la section suivante")
+                        pipeline.annulation.set()
+                except Exception as e:
+                    print(f"⚠️ Battement impossible ({identifiant}) : {e}")
+
+    def en_cours(self) -> int:
+        return len(self.pipelines)
+
+    def sante(self) -> Dict:
+        cache = self.fournisseurs.cache
+        return {
+            "ouvrier": self.nom,
+            "en_cours": self.en_cours(),
+            "places": {"generales": self.nb_travaux, "interactives": self.reserves},
+            "cache_reponses": {"taille": len(cache), "trouvees": cache.nb_trouves,
+                               "manquees": cache.nb_manques} if cache is not None else None,
+            "limites": {nom: {"concurrence": l.concurrence, "rpm": l.rpm, "attente_sec": round(l.attente, 1)}
+                        for nom, l in self.fournisseurs.limites.items()},
+            "fournisseurs": self.fournisseurs.disponibilites(),
+            "sections_indexees": len(self.similarite) if self.similarite is not None else None,
+        }
+
+    def attendre(self):
+        """Bloque jusqu'à Ctrl+C ; un second Ctrl+C quitte sans attendre les travaux en cours"""
+        try:
+            while not self._arret.is_set():
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        try:
+            if self.en_cours():
+                print(f"⏸️ Arrêt après les {self.en_cours()} travail(aux) en cours (Ctrl+C pour quitter)")
+            self.arreter()
+        except KeyboardInterrupt:
+            print("⏹️ Arrêt immédiat : les baux expireront et les travaux seront repris")
+
+    def arreter(self, attendre: bool = True):
+        """Plus de nouveau travail ; attend (ou non) la fin des travaux en cours"""
+        self._arret.set()
+        if attendre:
+            for fil in self._fils:
+                fil.join()
+
+
+# ===============================================================
+# SERVICE
+# ===============================================================
+
+class Service:
+    """Serveur HTTP local sur la file des travaux, avec (ou sans) ouvrier dans le même processus"""
+
+    def __init__(self, port: int = PORT_SERVICE, hote: str = "127.0.0.1", nb_travaux: int = 2,
+                 limites: Optional[Dict[str, Limiteur]] = None, file: Optional[FileTravaux] = None,
+                 fournisseurs: Optional[Fournisseurs] = None, reserves: int = 0,
+                 similarite: Optional[IndexSimilarite] = None):
+        self.file = file or FileTravaux(FICHIER_FILE)
+        # nb_travaux = 0 : API seule, les travaux sont exécutés par des processus `worker`
+        self.ouvrier = Ouvrier(self.file, nb_travaux, limites, fournisseurs, reserves=reserves,
+                               similarite=similarite) if nb_travaux > 0 else None
+        self._serveur = ThreadingHTTPServer((hote, port), self._gestionnaire())
+        self._serveur.daemon_threads = True
+        self.adresse = f"http://{hote}:{self._serveur.server_port}"
+        threading.Thread(target=self._serveur.serve_forever, name="http", daemon=True).start()
+
+    def etat(self, identifiant: str) -> Optional[Dict]:
+        """Travail enregistré ; avancement à jour s'il s'exécute dans ce processus"""
+        travail = self.file.obtenir(identifiant)
+        pipeline = self.ouvrier.pipelines.get(identifiant) if self.ouvrier else None
+        if travail and pipeline and pipeline.progression:
+            travail["avancement"] = pipeline.progression.estimation()
+        return travail
+
+    def sante(self) -> Dict:
+        sante = {"file": self.file.compter()}
+        if self.ouvrier:
+            sante.update(self.ouvrier.sante())
+        return sante
+
+    def suivre(self, identifiant: str, intervalle: float = 0.5):
+        """Lignes du journal de la tentative en cours, jusqu'à sa fin (générateur)"""
+        position = 0
+        reste = b""
+        while True:
+            travail = self.file.obtenir(identifiant)
+            if travail is None:
+                return
+            finie = travail["etat"] not in (EN_ATTENTE, EN_COURS)
+            journal = travail.get("journal")
+            if journal and os.path.exists(journal) and travail["etat"] != EN_ATTENTE:
+                with open(journal, "rb") as f:
+                    f.seek(position)
+                    bloc = f.read()
+                position += len(bloc)
+                *lignes, reste = (reste + bloc).split(b"\n")
+                for ligne in lignes:
+                    yield ligne + b"\n"
+            if finie:
+                return
+            time.sleep(intervalle)
+
+    def _gestionnaire(self):
+        service = self
+
+        class Gestionnaire(BaseHTTPRequestHandler):
+            def _json(self, code: int, donnees):
+                corps = json.dumps(donnees, ensure_ascii=False, indent=2).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def do_POST(self):
+                parties = [p for p in urlsplit(self.path).path.split("/") if p]
+                if len(parties) == 3 and parties[0] == "travaux" and parties[2] == "relancer":
+                    if service.file.relancer(parties[1]):
+                        self._json(200, service.file.obtenir(parties[1]))
+                    else:
+                        self.send_error(409, "Travail inconnu ou pas en lettre morte")
+                    return
+                if parties != ["travaux"]:
+                    self.send_error(404)
+                    return
+                try:
+                    longueur = int(self.headers.get("Content-Length", 0))
+                    demande = json.loads(self.rfile.read(longueur) or b"{}")
+                    travail = service.file.soumettre(
+                        demande.get("fichier"), demande.get("mode", "normal"), demande.get("modeles"),
+                        demande.get("echeance"), demande.get("nom"), demande.get("contenu"),
+                        bool(demande.get("interactif")), demande.get("poids"))
+                except (ValueError, TypeError, AttributeError) as e:
+                    self._json(400, {"erreur": str(e)})
+                    return
+                self._json(201, travail)
+
+            def do_GET(self):
+                adresse = urlsplit(self.path)
+                parties = [p for p in adresse.path.split("/") if p]
+                if parties == ["sante"]:
+                    self._json(200, service.sante())
+                elif parties == ["travaux"]:
+                    etat = parse_qs(adresse.query).get("etat", [None])[0]
+                    self._json(200, service.file.lister(etat))
+                elif len(parties) >= 2 and parties[0] == "travaux":
+                    travail = service.etat(parties[1])
+                    if travail is None:
+                        self.send_error(404, "Travail inconnu")
+                    elif len(parties) == 2:
+                        self._json(200, travail)
+                    elif parties[2:] == ["evenements"]:
+                        self._evenements(parties[1])
+                    elif len(parties) == 3 and parties[2].startswith("rapport."):
+                        self._rapport(travail, parties[2].split(".", 1)[1])
+                    else:
+                        self.send_error(404)
+                else:
+                    self.send_error(404)
+
+            def _evenements(self, identifiant: str):
+                # HTTP/1.0 : le flux se termine à la fermeture de la connexion
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+                self.end_headers()
+                try:
+                    for ligne in service.suivre(identifiant):
+                        self.wfile.write(ligne)
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def _rapport(self, travail: Dict, format: str):
+                chemin = travail.get("chemins", {}).get(format)
+                if format not in TYPES_RAPPORT or not chemin or not os.path.exists(chemin):
+                    self.send_error(404, "Rapport indisponible")
+                    return
+                with open(chemin, "rb") as f:
+                    corps = f.read()
+                self.send_response(200)
+                self.send_header("Content-Type", TYPES_RAPPORT[format])
+                self.send_header("Content-Length", str(len(corps)))
+                self.end_headers()
+                self.wfile.write(corps)
+
+            def log_message(self, *args):
+                pass
+
+        return Gestionnaire
+
+    def attendre(self):
+        """Bloque jusqu'à Ctrl+C, puis arrête le serveur et l'ouvrier"""
+        try:
+            if self.ouvrier:
+                self.ouvrier.attendre()
+            else:
+                while True:
+                    time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        self.arreter(attendre=False)
+
+    def arreter(self, attendre: bool = True):
+        """Plus de nouvelle requête ni de nouveau travail pris par ce processus"""
+        self._serveur.shutdown()
+        self._serveur.server_close()
+        if self.ouvrier:
+            self.ouvrier.arreter(attendre)
@@ -0,0 +1,204 @@
+# ===============================================================
+# analyseur/similarite.py — Sections quasi identiques déjà analysées
+# ===============================================================
+# Le texte d'une section, débarrassé du LaTeX (commentaires, maths,
+# commandes, références), est découpé en bardeaux de quelques mots.
+# Une signature MinHash résume cet ensemble : la part de composantes
+# égales entre deux signatures estime leur similarité de Jaccard. Un
+# index LSH (signature coupée en bandes) ne compare une section
+# qu'aux candidates qui partagent au moins une bande.
+# Au-dessus du seuil de reprise, l'analyse gardée est reprise telle
+# quelle ; entre les deux seuils, seuls les passages modifiés sont
+# soumis aux agents (revue différentielle).
+# ===============================================================
+
+import os
+import re
+import json
+import time
+import random
+import difflib
+import hashlib
+import threading
+import zlib
+from typing import Optional, List, Dict, Tuple
+
+from analyseur.manuscrit import DOSSIER_CACHE
+
+FICHIER_SIMILARITE = os.path.join(DOSSIER_CACHE, "similarite.json")
+
+# Signature de 128 composantes, 32 bandes de 4 : une paire à 60 % de
+# Jaccard devient candidate avec une probabilité de 98 %, à 30 % de 23 %
+NB_PERMUTATIONS = 128
+NB_BANDES = 32
+TAILLE_BARDEAU = 5
+
+# Similarité minimale pour reprendre l'analyse telle quelle, puis pour une revue différentielle
+SEUIL_REPRISE = 0.9
+SEUIL_REVISION = 0.6
+
+# Types de reprise notés dans les résultats : analyse reprise telle quelle, ou revue des modifications
+REUTILISATION_IDENTIQUE = "identique"
+REUTILISATION_REVISION = "revision"
+
+# Sections trop courtes pour une comparaison fiable (boilerplate d'une ligne)
+MIN_MOTS = 40
+
+# Sections gardées au plus (les plus anciennes partent en premier)
+TAILLE_INDEX = 2000
+
+# Passages modifiés envoyés au plus dans une revue différentielle
+MAX_MODIFICATIONS = 4000
+
+_PREMIER = (1 << 61) - 1
+_ALEA = random.Random(20251028)
+_PERMUTATIONS = [(_ALEA.randrange(1, _PREMIER), _ALEA.randrange(0, _PREMIER)) for _ in range(NB_PERMUTATIONS)]
+
+_COMMENTAIRE = re.compile(r'(?<!\\)%[^\n]*')
+_MATHS = re.compile(r'\$\$.*?\$\$|\\\[.*?\\\]|\$[^$]*\$|\\begin\{(equation|align|gather|multline)\*?\}.*?'
+                    r'\\end\{\1\*?\}', re.S)
+_REFERENCES = re.compile(r'\\(?:label|ref|eqref|pageref|cref|Cref|cite[a-z]*)\*?(?:\[[^\]]*\])*\{[^}]*\}')
+_COMMANDE = re.compile(r'\\[A-Za-z@]+\*?')
+_MOT = re.compile(r'\w+')
+_PHRASE = re.compile(r'(?<=[.!?])\s+|\n\s*\n')
+
+
+def mots_sans_latex(texte: str) -> List[str]:
+    """Mots d'un texte LaTeX, en minuscules, sans commentaires, maths, références ni commandes"""
+    texte = _COMMENTAIRE.sub(" ", texte)
+    texte = _MATHS.sub(" ", texte)
+    texte = _REFERENCES.sub(" ", texte)
+    texte = _COMMANDE.sub(" ", texte)
+    return _MOT.findall(texte.lower())
+
+
+def signature(mots: List[str], taille: int = TAILLE_BARDEAU) -> List[int]:
+    """Signature MinHash de l'ensemble des bardeaux de `taille` mots consécutifs"""
+    bardeaux = {zlib.crc32(" ".join(mots[i:i + taille]).encode("utf-8"))
+                for i in range(max(len(mots) - taille + 1, 1))}
+    return [min((a * h + b) % _PREMIER for h in bardeaux) for a, b in _PERMUTATIONS]
+
+
+def similarite(signature_a: List[int], signature_b: List[int]) -> float:
+    """Jaccard estimé : part des composantes égales"""
+    return sum(a == b for a, b in zip(signature_a, signature_b)) / len(signature_a)
+
+
+def _bandes(sig: List[int]) -> List[str]:
+    lignes = len(sig) // NB_BANDES
+    return [f"{i}:{hash(tuple(sig[i * lignes:(i + 1) * lignes]))}" for i in range(NB_BANDES)]
+
+
+def passages_modifies(ancien: str, nouveau: str, limite: int = MAX_MODIFICATIONS) -> str:
+    """Phrases ajoutées ou réécrites dans la nouvelle version (puis supprimées), au plus `limite` caractères"""
+    anciennes = [p.strip() for p in _PHRASE.split(ancien) if p.strip()]
+    nouvelles = [p.strip() for p in _PHRASE.split(nouveau) if p.strip()]
+    ajouts, retraits = [], []
+    for operation, a1, a2, n1, n2 in difflib.SequenceMatcher(None, anciennes, nouvelles,
+                                                             autojunk=False).get_opcodes():
+        if operation in ("replace", "insert"):
+            ajouts.extend(nouvelles[n1:n2])
+        if operation in ("replace", "delete"):
+            retraits.extend(anciennes[a1:a2])
+    texte = "\n".join(f"+ {p}" for p in ajouts) + "\n" + "\n".join(f"- {p}" for p in retraits)
+    return texte.strip()[:limite]
+
+
+def parser_seuils(valeur: Optional[str]) -> Tuple[float, float]:
+    """'0.9:0.6' → (seuil de reprise, seuil de revue différentielle)"""
+    if not valeur:
+        return SEUIL_REPRISE, SEUIL_REVISION
+    reprise, _, revision = valeur.partition(":")
+    reprise = float(reprise)
+    revision = float(revision) if revision else min(SEUIL_REVISION, reprise)
+    if not 0 < revision <= reprise <= 1:
+        raise ValueError(f"Seuils de similarité invalides : {valeur} (attendu 0 < révision ≤ reprise ≤ 1)")
+    return reprise, revision
+
+
+class IndexSimilarite:
+    """Analyses de sections déjà faites, retrouvées par similarité (MinHash + LSH), sûr entre fils
+
+    Le fichier JSON est relu et fusionné avant chaque écriture : plusieurs
+    ouvriers peuvent le partager.
+    """
+
+    def __init__(self, chemin: Optional[str] = FICHIER_SIMILARITE, seuil_reprise: float = SEUIL_REPRISE,
+                 seuil_revision: float = SEUIL_REVISION, taille: int = TAILLE_INDEX):
+        self.chemin = chemin
+        self.seuil_reprise = seuil_reprise
+        self.seuil_revision = seuil_revision
+        self.taille = taille
+        self.entrees: Dict[str, Dict] = {}
+        self._bandes: Dict[str, set] = {}
+        self._verrou = threading.Lock()
+        for identifiant, entree in self._lire().items():
+            self._indexer(identifiant, entree)
+
+    def _lire(self) -> Dict[str, Dict]:
+        if not self.chemin or not os.path.exists(self.chemin):
+            return {}
+        try:
+            with open(self.chemin, encoding="utf-8") as f:
+                return json.load(f).get("sections", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _indexer(self, identifiant: str, entree: Dict):
+        self.entrees[identifiant] = entree
+        for bande in _bandes(entree["signature"]):
+            self._bandes.setdefault(bande, set()).add(identifiant)
+
+    def _oublier(self, identifiant: str):
+        entree = self.entrees.pop(identifiant)
+        for bande in _bandes(entree["signature"]):
+            self._bandes[bande].discard(identifiant)
+            if not self._bandes[bande]:
+                del self._bandes[bande]
+
+    def chercher(self, sig: List[int], mode: str) -> Optional[Tuple[float, Dict]]:
+        """Section la plus proche déjà analysée dans ce mode, si elle dépasse le seuil de révision"""
+        with self._verrou:
+            candidates = set().union(*(self._bandes.get(bande, ()) for bande in _bandes(sig)))
+            meilleure = None
+            for identifiant in candidates:
+                entree = self.entrees[identifiant]
+                if entree["mode"] != mode:
+                    continue
+                score = similarite(sig, entree["signature"])
+                if score >= self.seuil_revision and (meilleure is None or score > meilleure[0]):
+                    meilleure = (score, entree)
+            return meilleure
+
+    def ajouter(self, sig: List[int], mode: str, titre: str, fichier: Optional[str], texte: str,
+                analyses: Dict[str, str]):
+        identifiant = hashlib.sha1(json.dumps([mode, sig]).encode("utf-8")).hexdigest()
+        with self._verrou:
+            if identifiant in self.entrees:
+                self._oublier(identifiant)
+            self._indexer(identifiant, {"signature": sig, "mode": mode, "titre": titre, "fichier": fichier,
+                                        "texte": texte, "analyses": analyses, "date": time.time()})
+            while len(self.entrees) > self.taille:
+                self._oublier(min(self.entrees, key=lambda i: self.entrees[i]["date"]))
+
+    def sauvegarder(self):
+        if not self.chemin:
+            return
+        dossier = os.path.dirname(self.chemin)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        with self._verrou:
+            # Sections ajoutées entre-temps par d'autres processus
+            for identifiant, entree in self._lire().items():
+                if identifiant not in self.entrees:
+                    self._indexer(identifiant, entree)
+            while len(self.entrees) > self.taille:
+                self._oublier(min(self.entrees, key=lambda i: self.entrees[i]["date"]))
+            sections = dict(self.entrees)
+        temporaire = f"{self.chemin}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporaire, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "sections": sections}, f, ensure_ascii=False)
+        os.replace(temporaire, self.chemin)
+
+    def __len__(self) -> int:
+        return len(self.entrees)
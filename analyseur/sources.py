@@ -0,0 +1,117 @@
+# ===============================================================
+# analyseur/sources.py — Lecture des fichiers sources LaTeX
+# ===============================================================
+# Le fichier est lu une seule fois en octets (projeté en mémoire au-
+# delà de SEUIL_MMAP), l'encodage est déterminé sur un échantillon
+# (BOM, option de \usepackage[...]{inputenc}, sondage des octets
+# invalides), puis le tout est décodé en une fois. Les sections sont
+# ensuite extraites par positions dans ce texte.
+# ===============================================================
+
+import re
+import mmap
+import codecs
+import os
+from typing import Optional, Tuple
+
+# Taille de l'échantillon servant à la détection
+TAILLE_ECHANTILLON = 64 * 1024
+
+# Au-delà de cette taille, le fichier est projeté en mémoire plutôt que lu
+SEUIL_MMAP = 1024 * 1024
+
+# L'ordre compte : le BOM UTF-32 LE commence comme le BOM UTF-16 LE
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+# Options de inputenc → encodage Python
+OPTIONS_INPUTENC = {
+    "utf8": "utf-8",
+    "utf8x": "utf-8",
+    "latin1": "latin-1",
+    "latin9": "iso8859-15",
+    "latin2": "iso8859-2",
+    "ansinew": "cp1252",
+    "cp1252": "cp1252",
+    "cp1250": "cp1250",
+    "cp850": "cp850",
+    "applemac": "mac_roman",
+}
+
+_INPUTENC = re.compile(rb'\\usepackage\s*\[([^\]]*)\]\s*\{inputenc\}')
+
+# Octets sans caractère en cp1252 : leur présence désigne latin-1
+_INDEFINIS_CP1252 = re.compile(rb'[\x81\x8d\x8f\x90\x9d]')
+
+
+def _sonder(octets) -> str:
+    """Encodage d'un extrait sans indication : UTF-8 s'il est valide, sinon cp1252 ou latin-1"""
+    try:
+        # Décodeur incrémental : une séquence coupée en fin d'extrait n'est pas une erreur
+        codecs.getincrementaldecoder("utf-8")().decode(octets, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        pass
+    return "latin-1" if _INDEFINIS_CP1252.search(octets) else "cp1252"
+
+
+def detecter_encodage(octets) -> Tuple[str, str]:
+    """(encodage, origine) d'après le début du fichier ; origine = bom, inputenc ou sondage"""
+    echantillon = bytes(octets[:TAILLE_ECHANTILLON])
+    for bom, encodage in BOMS:
+        if echantillon.startswith(bom):
+            return encodage, "bom"
+    declaration = _INPUTENC.search(echantillon)
+    if declaration:
+        for option in declaration.group(1).split(b","):
+            encodage = OPTIONS_INPUTENC.get(option.strip().decode("ascii", "ignore"))
+            if encodage:
+                return encodage, "inputenc"
+    return _sonder(echantillon), "sondage"
+
+
+def _decoder(octets, encodage: Optional[str]) -> Tuple[str, str]:
+    origine = "imposé"
+    if encodage is None:
+        encodage, origine = detecter_encodage(octets)
+    try:
+        texte = str(octets, encodage)
+    except UnicodeDecodeError as erreur:
+        if origine == "imposé":
+            raise
+        # Octets invalides malgré le BOM, la déclaration inputenc ou l'échantillon :
+        # on sonde autour de l'erreur (le BOM UTF-8 éventuel n'est pas du texte)
+        debut = len(codecs.BOM_UTF8) if encodage == "utf-8-sig" else 0
+        zone = octets[max(erreur.start - TAILLE_ECHANTILLON // 2, 0):erreur.end + TAILLE_ECHANTILLON // 2]
+        encodage = _sonder(bytes(zone))
+        if debut:
+            octets = octets[debut:]
+        try:
+            texte = str(octets, encodage)
+        except UnicodeDecodeError:
+            encodage = "latin-1"
+            texte = str(octets, encodage)
+    if "\r" in texte:
+        # Même normalisation des fins de ligne que open() en mode texte
+        texte = texte.replace("\r\n", "\n").replace("\r", "\n")
+    return texte, encodage
+
+
+def charger_source(chemin: str, encodage: Optional[str] = None) -> Tuple[str, str]:
+    """(texte, encodage) d'un fichier LaTeX, lu une seule fois et décodé une seule fois"""
+    with open(chemin, "rb") as f:
+        taille = os.fstat(f.fileno()).st_size
+        if taille < SEUIL_MMAP:
+            return _decoder(f.read(), encodage)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as projection:
+            return _decoder(projection, encodage)
+
+
+def lire_source(chemin: str, encodage: Optional[str] = None) -> str:
+    """Texte d'un fichier LaTeX (encodage détecté si non précisé)"""
+    return charger_source(chemin, encodage)[0]
@@ -0,0 +1,169 @@
+# ===============================================================
+# analyseur/traces.py — Spans du run (run → section → agent → tentative)
+# ===============================================================
+# Chaque étape mesurée ouvre un span (nom, début, fin, attributs) ;
+# le span parent est suivi par une variable de contexte, valable
+# aussi bien entre fils qu'entre tâches asyncio. En fin de run, les
+# spans sont exportés au format Chrome trace-event (JSON lisible par
+# Perfetto ou chrome://tracing) et, si demandé, envoyés en OTLP/HTTP
+# (JSON) à un collecteur local, sans dépendance supplémentaire.
+# ===============================================================
+
+import os
+import json
+import time
+import threading
+import contextvars
+import urllib.request
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Iterator, IO
+
+# Collecteur OpenTelemetry local (OTLP/HTTP)
+OTLP_DEFAUT = "http://localhost:4318/v1/traces"
+
+_COURANT: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("span_courant", default=None)
+
+
+class Span:
+    """Intervalle de temps nommé, avec ses attributs et son parent"""
+
+    __slots__ = ("nom", "identifiant", "parent", "debut", "fin", "fil", "attributs", "_jeton")
+
+    def __init__(self, nom: str, identifiant: int, parent: Optional["Span"], attributs: Dict):
+        self.nom = nom
+        self.identifiant = identifiant
+        self.parent = parent
+        self.debut = time.time_ns()
+        self.fin: Optional[int] = None
+        self.fil = threading.get_native_id()
+        self.attributs = attributs
+        self._jeton = None
+
+    @property
+    def duree(self) -> float:
+        """Durée en secondes (jusqu'à maintenant si le span est ouvert)"""
+        return ((self.fin or time.time_ns()) - self.debut) / 1e9
+
+    def definir(self, **attributs):
+        self.attributs.update(attributs)
+
+    def __repr__(self) -> str:
+        return f"Span({self.nom}, {self.duree:.3f}s, {self.attributs})"
+
+
+class Traceur:
+    """Collecte les spans d'un run et les exporte"""
+
+    def __init__(self, service: str = "analyseur"):
+        self.service = service
+        self.spans: List[Span] = []
+        self.identifiant_trace = os.urandom(16).hex()
+        self._suivant = 0
+        self._verrou = threading.Lock()
+        self.debut = time.time_ns()
+
+    def ouvrir(self, nom: str, **attributs) -> Span:
+        """Ouvre un span enfant du span courant ; il devient le span courant"""
+        with self._verrou:
+            self._suivant += 1
+            span = Span(nom, self._suivant, _COURANT.get(), attributs)
+            self.spans.append(span)
+        span._jeton = _COURANT.set(span)
+        return span
+
+    def fermer(self, span: Span, **attributs):
+        span.fin = time.time_ns()
+        span.attributs.update(attributs)
+        if span._jeton is not None:
+            try:
+                _COURANT.reset(span._jeton)
+            except ValueError:
+                # Fermé depuis un autre contexte : le parent redevient courant
+                _COURANT.set(span.parent)
+            span._jeton = None
+
+    @contextmanager
+    def span(self, nom: str, **attributs) -> Iterator[Span]:
+        span = self.ouvrir(nom, **attributs)
+        try:
+            yield span
+        except BaseException as e:
+            span.attributs.setdefault("erreur", f"{type(e).__name__}: {e}"[:200])
+            raise
+        finally:
+            self.fermer(span)
+
+    # ---------------------------------------------------------------
+    # Export Chrome trace-event
+    # ---------------------------------------------------------------
+
+    def ecrire_chrome(self, flux: IO[str]):
+        """Événements complets ('X'), horodatés en µs depuis le début du run"""
+        pid = os.getpid()
+        fils = sorted({span.fil for span in self.spans})
+        flux.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+        evenements = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+                       "args": {"name": self.service}}]
+        evenements += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": fil,
+                        "args": {"name": f"fil {i}"}} for i, fil in enumerate(fils)]
+        for i, evenement in enumerate(evenements):
+            flux.write(("" if i == 0 else ",\n") + json.dumps(evenement, ensure_ascii=False))
+        maintenant = time.time_ns()
+        for span in self.spans:
+            arguments = dict(span.attributs, span=span.identifiant)
+            if span.parent is not None:
+                arguments["parent"] = span.parent.identifiant
+            evenement = {"name": span.nom, "cat": span.nom, "ph": "X", "pid": pid, "tid": span.fil,
+                         "ts": (span.debut - self.debut) / 1000,
+                         "dur": ((span.fin or maintenant) - span.debut) / 1000,
+                         "args": arguments}
+            flux.write(",\n" + json.dumps(evenement, ensure_ascii=False, default=str))
+        flux.write("\n]}\n")
+
+    # ---------------------------------------------------------------
+    # Export OTLP/HTTP (JSON)
+    # ---------------------------------------------------------------
+
+    @staticmethod
+    def _valeur_otlp(valeur) -> Dict:
+        if isinstance(valeur, bool):
+            return {"boolValue": valeur}
+        if isinstance(valeur, int):
+            return {"intValue": str(valeur)}
+        if isinstance(valeur, float):
+            return {"doubleValue": valeur}
+        return {"stringValue": str(valeur)}
+
+    def _identifiant_span(self, span: Span) -> str:
+        return f"{span.identifiant:016x}"
+
+    def donnees_otlp(self) -> Dict:
+        maintenant = time.time_ns()
+        spans = []
+        for span in self.spans:
+            donnees = {
+                "traceId": self.identifiant_trace,
+                "spanId": self._identifiant_span(span),
+                "name": span.nom,
+                "kind": 1,
+                "startTimeUnixNano": str(span.debut),
+                "endTimeUnixNano": str(span.fin or maintenant),
+                "attributes": [{"key": cle, "value": self._valeur_otlp(valeur)}
+                               for cle, valeur in span.attributs.items() if valeur is not None],
+                "status": {"code": 2 if "erreur" in span.attributs else 1},
+            }
+            if span.parent is not None:
+                donnees["parentSpanId"] = self._identifiant_span(span.parent)
+            spans.append(donnees)
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.service}}]},
+            "scopeSpans": [{"scope": {"name": "analyseur.traces"}, "spans": spans}],
+        }]}
+
+    def envoyer_otlp(self, url: str = OTLP_DEFAUT, delai: float = 5.0):
+        """Envoie tous les spans au collecteur (lève OSError si injoignable)"""
+        corps = json.dumps(self.donnees_otlp(), ensure_ascii=False).encode("utf-8")
+        requete = urllib.request.Request(url, data=corps, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(requete, timeout=delai) as reponse:
+            reponse.read()
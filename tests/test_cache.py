@@ -0,0 +1,45 @@
+# ===============================================================
+# Tests du cache d'analyses (analyseur/manuscrit.py)
+# ===============================================================
+
+import os
+
+import pytest
+
+from analyseur.manuscrit import CacheAnalyses, charger_manuscrit
+
+MODE = {"niveaux": ["chapter", "section"], "min_mots": 0}
+SOURCE = "\\chapter{Un}\nintro\n\\input{chap}\n\\section{Fin}\nconclusion ici\n"
+CHAPITRE = "\\section{Inclus}\ntexte du fichier inclus\n"
+
+
+def _projet(dossier):
+    (dossier / "main.tex").write_text(SOURCE, encoding="utf-8")
+    (dossier / "chap.tex").write_text(CHAPITRE, encoding="utf-8")
+    return str(dossier / "main.tex")
+
+
+def test_reutilisation_depuis_le_disque(tmp_path):
+    principal = _projet(tmp_path)
+    premier = CacheAnalyses(str(tmp_path / "cache"))
+    attendues = [(s.titre, s.nb_mots, s.texte) for s in charger_manuscrit(principal, premier).sections(MODE)]
+    assert premier.nb_relus == 2
+
+    second = CacheAnalyses(str(tmp_path / "cache"))
+    manuscrit = charger_manuscrit(principal, second)
+    assert (second.nb_relus, second.nb_reutilises) == (0, 2)
+    assert [(s.titre, s.nb_mots, s.texte) for s in manuscrit.sections(MODE)] == attendues
+
+
+def test_fichier_modifie_apres_lecture_du_cache(tmp_path):
+    principal = _projet(tmp_path)
+    charger_manuscrit(principal, CacheAnalyses(str(tmp_path / "cache")))
+    sections = charger_manuscrit(principal, CacheAnalyses(str(tmp_path / "cache"))).sections(MODE)
+
+    # Le texte n'est relu qu'à la demande : entre-temps le fichier change
+    inclus = tmp_path / "chap.tex"
+    infos = os.stat(inclus)
+    inclus.write_text("\\section{Autre}\nun texte complètement différent\n", encoding="utf-8")
+    os.utime(inclus, ns=(infos.st_atime_ns, infos.st_mtime_ns + 10**9))
+    with pytest.raises(RuntimeError):
+        [s.texte for s in sections]
@@ -0,0 +1,61 @@
+# ===============================================================
+# Tests de la compaction du texte des sections (analyseur/compaction.py)
+# ===============================================================
+
+from analyseur.compaction import MARQUEUR_EQUATION, compacter, mesurer
+from analyseur.pipeline import MODE_NORMAL, planifier_appels
+from analyseur.estimation import HistoriqueAppels
+from analyseur.latex import Section, analyser_document
+
+SECTION = r"""\section{Méthode}\label{sec:methode}
+% TODO : reprendre ce paragraphe
+Le schéma   est stable~\cite[p.~3]{dupont2020} (voir la figure~\ref{fig:maillage}).   % vérifié
+
+\begin{figure}[htbp]
+  \centering
+  \includegraphics[width=0.8\linewidth]{maillage.pdf}
+  \caption[Maillage]{Maillage \emph{adaptatif} du domaine.}\label{fig:maillage}
+\end{figure}
+
+
+
+\begin{itemize}
+  \item premier point ;
+  \item[b)] second point.
+\end{itemize}
+La solution vérifie $u \geq 0$ et
+\begin{equation}\label{eq:chaleur}
+\partial_t u = \Delta u
+\end{equation}
+donc 50\% de la masse est conservée.
+"""
+
+
+def test_compacter():
+    texte = compacter(SECTION)
+    assert texte == ("\\section{Méthode}\n"
+                     "Le schéma est stable [cit.] (voir la figure [réf.]).\n\n"
+                     "[Figure : Maillage \\emph{adaptatif} du domaine.]\n\n"
+                     "- premier point ;\n"
+                     "- b) : second point.\n"
+                     "La solution vérifie $u \\geq 0$ et\n"
+                     "\\begin{equation}\n\\partial_t u = \\Delta u\n\\end{equation}\n"
+                     "donc 50\\% de la masse est conservée.")
+    # Idempotente, et les équations hors texte ne disparaissent que pour l'agent de style
+    assert compacter(texte) == texte
+    style = compacter(texte, maths=False)
+    assert MARQUEUR_EQUATION in style and "\\partial_t" not in style and "$u \\geq 0$" in style
+
+
+def test_mesure_et_planification():
+    mesure = mesurer(SECTION, compacter(SECTION), compacter(SECTION, maths=False))
+    assert mesure["jetons_bruts"] > mesure["jetons_scientifique"] > mesure["jetons_style"]
+    assert mesure["caracteres_bruts"] > mesure["caracteres_scientifique"]
+
+    document = analyser_document(SECTION * 5)
+    sections = [Section("section", "Méthode", [(document, 0, len(document.contenu))], 250)]
+    compacts = planifier_appels(sections, {"scientifique": "claude", "style": "openai", "synthese": "claude"},
+                                MODE_NORMAL, HistoriqueAppels(None))
+    bruts = planifier_appels(sections, {"scientifique": "claude", "style": "openai", "synthese": "claude"},
+                             MODE_NORMAL, HistoriqueAppels(None), compaction=False)
+    assert sum(a["jetons_entree"] for a in compacts) < sum(a["jetons_entree"] for a in bruts)
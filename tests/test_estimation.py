@@ -0,0 +1,93 @@
+# ===============================================================
+# Tests de l'estimation de durée et de coût (analyseur/estimation.py)
+# ===============================================================
+
+import pytest
+
+from analyseur.budgets import jetons_texte
+from analyseur.estimation import A_PRIORI, POIDS_MAX, REMPLISSAGE, HistoriqueAppels, estimer_run, fourchette
+from analyseur.fournisseurs import Fournisseurs, Limiteur
+from analyseur.latex import Section, analyser_document
+from analyseur.pipeline import MODE_NORMAL, Pipeline
+
+
+def test_a_priori_sans_historique(tmp_path):
+    historique = HistoriqueAppels(str(tmp_path / "absent.json"))
+    historique.observer("claude", 10.0, 400, 1000)
+    modele = historique.modele("claude")
+    assert modele == {"latence": A_PRIORI["claude"]["latence"], "debit": A_PRIORI["claude"]["debit"],
+                      "remplissage": REMPLISSAGE, "observations": 0}
+
+
+def test_calibration_et_persistance(tmp_path):
+    chemin = str(tmp_path / "rapports" / "historique.json")
+    historique = HistoriqueAppels(chemin)
+    # Durée = 1,5 s + jetons / 40 ; la moitié du budget est consommée
+    for jetons in (200, 400, 600, 800, 1000, 1200):
+        historique.observer("openai", 1.5 + jetons / 40, jetons, 2 * jetons)
+    historique.observer("openai", 3.0, None)
+    historique.sauvegarder()
+
+    modele = HistoriqueAppels(chemin).modele("openai")
+    assert modele["observations"] == 6
+    assert modele["latence"] == pytest.approx(1.5)
+    assert modele["debit"] == pytest.approx(40)
+    assert modele["remplissage"] == pytest.approx(0.5)
+
+
+def test_regression_mal_posee():
+    historique = HistoriqueAppels(None)
+    for _ in range(10):
+        historique.observer("gemini", 12.0, 500)
+    modele = historique.modele("gemini")
+    assert modele["latence"] == A_PRIORI["gemini"]["latence"]
+    assert modele["latence"] + 500 / modele["debit"] == pytest.approx(12.0)
+
+
+def test_poids_borne():
+    historique = HistoriqueAppels(None)
+    for i in range(POIDS_MAX + 500):
+        historique.observer("claude", 2.0 + (i % 7), 100 * (i % 7))
+    assert historique.sommes["claude"]["n"] <= POIDS_MAX
+    assert historique.modele("claude")["debit"] == pytest.approx(100)
+
+
+def test_estimer_run():
+    historique = HistoriqueAppels(None)
+    appels = [{"fournisseur": "claude", "jetons_entree": 1000, "budget": 1000}] * 4 + \
+             [{"fournisseur": "gemini", "jetons_entree": 2000, "budget": 500}] * 2
+    estimation = estimer_run(appels, historique)
+    claude = estimation["par_fournisseur"]["claude"]
+    duree_claude = 4 * (A_PRIORI["claude"]["latence"] + 1000 * REMPLISSAGE / A_PRIORI["claude"]["debit"])
+    assert claude["nb_appels"] == 4
+    assert claude["duree_sec"] == pytest.approx(duree_claude, abs=0.1)
+    assert claude["cout_usd"] == pytest.approx((4000 * 3.0 + 4 * 700 * 15.0) / 1e6, abs=1e-4)
+    assert estimation["nb_appels"] == 6
+    assert estimation["calibration"]["gemini"]["observations"] == 0
+
+    parallele = estimer_run(appels, historique, concurrence=2)
+    assert parallele["duree_sec"] == pytest.approx(estimation["duree_sec"] / 2, abs=0.1)
+    limite = estimer_run(appels, historique, concurrence=8, limites_rpm={"claude": 2})
+    assert limite["duree_sec"] == 120.0
+
+
+def test_estimation_du_pipeline_sous_limites():
+    document = analyser_document("Le schéma numérique converge vers la solution exacte. " * 60)
+    sections = [Section("section", f"Partie {n}", [(document, 0, len(document.contenu))], 480) for n in range(5)]
+    modeles = {"scientifique": "claude", "style": "openai", "synthese": "claude"}
+    historique = HistoriqueAppels(None)
+    libre = Pipeline(MODE_NORMAL, modeles, fournisseurs=Fournisseurs()).estimer(sections, historique)
+
+    # 10 appels Claude à 2 par minute : 5 minutes au moins ; une place Claude plafonne la concurrence
+    limites = {"claude": Limiteur(1, rpm=2), "openai": Limiteur(8)}
+    pipeline = Pipeline(MODE_NORMAL, modeles, fournisseurs=Fournisseurs(limites=limites))
+    assert pipeline.estimer(sections, historique)["duree_sec"] == 300.0 > libre["duree_sec"]
+    assert pipeline.estimer(sections, historique, concurrence=4)["duree_sec"] == 300.0
+    pipeline.fournisseurs.limites["claude"] = Limiteur(2)
+    assert pipeline.estimer(sections, historique, concurrence=4)["duree_sec"] == pytest.approx(
+        libre["duree_sec"] / 2, abs=0.1)
+
+
+def test_utilitaires():
+    assert jetons_texte("un deux trois quatre") == 7
+    assert fourchette(600) == (7.5, 12.5)
@@ -0,0 +1,119 @@
+# ===============================================================
+# Tests de la file SQLite des travaux (analyseur/file_travaux.py)
+# ===============================================================
+
+import multiprocessing
+import sqlite3
+import time
+
+from analyseur.file_travaux import ABANDONNE, ECHEC, EN_ATTENTE, EN_COURS, TERMINE, FileTravaux
+
+
+def _file(tmp_path, **options):
+    (tmp_path / "these.tex").write_text(r"\chapter{Un} texte", encoding="utf-8")
+    return FileTravaux(str(tmp_path / "travaux.sqlite3"), **options), str(tmp_path / "these.tex")
+
+
+def test_bail_et_fin(tmp_path):
+    file, fichier = _file(tmp_path)
+    premier = file.soumettre(fichier, "rapide", {"style": "openai"})
+    second = file.soumettre(nom="envoi", contenu=r"\chapter{Deux}")
+    assert second["fichier"].endswith("envoi.tex") and premier["modeles"] == {"style": "openai"}
+
+    travail = file.prendre("a")
+    assert (travail["id"], travail["etat"], travail["tentatives"]) == (premier["id"], EN_COURS, 1)
+    assert file.prendre("b")["id"] == second["id"]
+    assert file.prendre("c") is None
+
+    assert file.battre(premier["id"], "a", {"avancement": 0.5}, journal="/tmp/j.jsonl")
+    assert not file.battre(premier["id"], "b")
+    assert file.obtenir(premier["id"])["avancement"] == {"avancement": 0.5}
+    assert file.terminer(premier["id"], "a", {"json": "/tmp/r.json"})
+    assert file.obtenir(premier["id"])["chemins"] == {"json": "/tmp/r.json"}
+    assert file.compter() == {TERMINE: 1, EN_COURS: 1}
+
+
+
+def test_interactif_prioritaire(tmp_path):
+    file, fichier = _file(tmp_path)
+    lot = file.soumettre(fichier, "detaille")
+    urgent = file.soumettre(fichier, "rapide", interactif=True)
+    assert (lot["poids"], urgent["poids"], urgent["interactif"]) == (0.5, 2.0, True)
+
+    # Une place réservée ne prend que les travaux interactifs
+    assert file.prendre("reserve", interactifs_seulement=True)["id"] == urgent["id"]
+    assert file.prendre("reserve", interactifs_seulement=True) is None
+    assert file.prendre("a")["id"] == lot["id"]
+
+
+def test_migration_ancienne_base(tmp_path):
+    chemin = str(tmp_path / "ancienne.sqlite3")
+    connexion = sqlite3.connect(chemin)
+    connexion.execute("CREATE TABLE travaux (id TEXT PRIMARY KEY, etat TEXT NOT NULL, fichier TEXT NOT NULL, "
+                      "mode TEXT NOT NULL, modeles TEXT, echeance TEXT, soumis REAL NOT NULL, "
+                      "disponible_a REAL NOT NULL, tentatives INTEGER NOT NULL DEFAULT 0, ouvrier TEXT, "
+                      "bail_expire REAL, debut REAL, fin REAL, erreur TEXT, journal TEXT, chemins TEXT, "
+                      "avancement TEXT)")
+    connexion.execute("INSERT INTO travaux (id, etat, fichier, mode, soumis, disponible_a) "
+                      "VALUES ('ancien', ?, 'these.tex', 'normal', 1, 1)", (EN_ATTENTE,))
+    connexion.commit()
+    connexion.close()
+
+    travail = FileTravaux(chemin).prendre("a")
+    assert (travail["id"], travail["poids"], travail["interactif"]) == ("ancien", 1.0, False)
+
+def test_relance_puis_lettre_morte(tmp_path):
+    file, fichier = _file(tmp_path, tentatives_max=2, delai_relance=0.05)
+    identifiant = file.soumettre(fichier)["id"]
+
+    file.prendre("a")
+    assert file.echouer(identifiant, "a", "boum")
+    assert file.obtenir(identifiant)["etat"] == ECHEC
+    # Relance différée
+    assert file.prendre("a") is None
+    time.sleep(0.06)
+    assert file.prendre("a")["tentatives"] == 2
+    file.echouer(identifiant, "a", "encore")
+    assert file.obtenir(identifiant)["etat"] == ABANDONNE
+    assert file.prendre("a") is None
+
+    assert file.relancer(identifiant)
+    assert file.obtenir(identifiant)["etat"] == EN_ATTENTE
+    assert file.prendre("a")["tentatives"] == 1
+
+
+def test_bail_expire(tmp_path):
+    file, fichier = _file(tmp_path, bail=0.05, delai_relance=0)
+    identifiant = file.soumettre(fichier)["id"]
+    file.prendre("disparu")
+    time.sleep(0.06)
+    # Un autre ouvrier reprend le travail ; l'ancien ne peut plus rien enregistrer
+    assert file.prendre("b")["ouvrier"] == "b"
+    assert not file.terminer(identifiant, "disparu", {})
+    assert file.terminer(identifiant, "b", {})
+
+
+def _prendre_tout(chemin, ouvrier, sortie):
+    file = FileTravaux(chemin)
+    pris = []
+    while True:
+        travail = file.prendre(ouvrier)
+        if travail is None:
+            break
+        pris.append(travail["id"])
+    sortie.put(pris)
+
+
+def test_plusieurs_processus(tmp_path):
+    file, fichier = _file(tmp_path)
+    ids = {file.soumettre(fichier)["id"] for _ in range(30)}
+    sortie = multiprocessing.Queue()
+    processus = [multiprocessing.Process(target=_prendre_tout, args=(file.chemin, f"p{i}", sortie))
+                 for i in range(3)]
+    for p in processus:
+        p.start()
+    pris = [i for _ in processus for i in sortie.get(timeout=30)]
+    for p in processus:
+        p.join()
+    # Chaque travail est pris exactement une fois
+    assert sorted(pris) == sorted(ids)
@@ -0,0 +1,44 @@
+# ===============================================================
+# Tests de l'index des mots (analyseur/latex.py, IndexMots)
+# ===============================================================
+
+import random
+
+from analyseur.latex import analyser_document
+
+MORCEAUX = ["mot ", "autre\n", "x", "é ", "  ", "\\emph{gras}", "\\cite{a,b} ", "{", "}",
+            "% commentaire\n", "\\section{Titre} ", "\\subsection*[c]{Sous titre}\n",
+            "\\paragraph{P} ", "\\chapter{C}\n", "\\textbf", "{x y}", "\\'e"]
+
+
+def _documents(nombre: int, taille: int):
+    aleatoire = random.Random(28)
+    for _ in range(nombre):
+        yield "".join(aleatoire.choice(MORCEAUX) for _ in range(aleatoire.randint(0, taille)))
+
+
+def test_mots_entre_egal_aux_comptes_des_noeuds():
+    for source in _documents(500, 400):
+        document = analyser_document(source)
+        index = document.index
+        assert index.mots_entre(0, len(source)) == document.racine.nb_mots
+        for noeud in document:
+            assert index.mots_entre(noeud.debut, noeud.fin) == noeud.nb_mots, (source, noeud)
+            assert index.mots_entre(noeud.debut, noeud.fin_propre) == noeud.nb_mots_propres, (source, noeud)
+
+
+def test_mots_avant_texte_brut():
+    # Sans commande, un mot commencé avant l'offset compte : même résultat que split()
+    aleatoire = random.Random(29)
+    source = "".join(aleatoire.choice(["mot ", "a", "bc\n", "  ", "é"]) for _ in range(5000))
+    index = analyser_document(source).index
+    for offset in list(range(0, 600)) + aleatoire.sample(range(len(source) + 1), 500):
+        assert index.mots_avant(offset) == len(source[:offset].split()), offset
+
+
+def test_mots_avant_croissant():
+    for source in _documents(50, 2000):
+        index = analyser_document(source).index
+        comptes = [index.mots_avant(offset) for offset in range(len(source) + 1)]
+        assert comptes == sorted(comptes)
+        assert comptes[-1] == index.total
@@ -0,0 +1,110 @@
+# ===============================================================
+# Tests du lexer LaTeX (analyseur/latex.py)
+# ===============================================================
+
+import re
+import time
+
+from analyseur.latex import analyser_document, compter_mots, extraire_chapitres
+from analyseur.manuscrit import CacheAnalyses, charger_manuscrit
+
+MODE_SECTIONS = {"niveaux": ["chapter", "section", "subsection"], "min_mots": 0}
+
+
+def compter_mots_reference(txt: str) -> int:
+    """compter_mots d'origine (expressions régulières), avant le lexer"""
+    txt = re.sub(r'\\[a-zA-Z]+\{[^}]*\}', '', txt)
+    txt = re.sub(r'\\[a-zA-Z]+', '', txt)
+    return len(txt.split())
+
+
+def test_titres_variantes():
+    document = analyser_document(
+        "\\part{P}\n\\chapter*{Intro}\ntexte\n"
+        "\\section[Court]{Un titre {imbriqué} long}\ncorps\n"
+        "\\subsection {Espacé}\n\\subsubsection{S3}\n\\paragraph{P4}\n\\subparagraph{P5}\nfin\n")
+    noeuds = [(n.type, n.titre, n.titre_court, n.etoile) for n in document]
+    assert noeuds == [
+        ("part", "P", None, False),
+        ("chapter", "Intro", None, True),
+        ("section", "Un titre {imbriqué} long", "Court", False),
+        ("subsection", "Espacé", None, False),
+        ("subsubsection", "S3", None, False),
+        ("paragraph", "P4", None, False),
+        ("subparagraph", "P5", None, False),
+    ]
+    section = [n for n in document if n.type == "section"][0]
+    assert [e.type for e in section.enfants] == ["subsection"]
+
+
+def test_titres_ignores_dans_arguments_et_commentaires():
+    document = analyser_document("% \\section{Commentée}\n\\emph{\\section{Dedans}}\n\\section{Vraie}\nmot\n")
+    assert [n.titre for n in document] == ["Vraie"]
+
+
+def test_titres_non_comptes():
+    assert compter_mots("\\section{Trois mots ici}\nun deux\n") == 2
+
+
+def test_compter_mots_comme_reference():
+    textes = [
+        "Un texte simple, sans commande.",
+        "Avec \\emph{emphase} et \\cite{ref} au milieu.",
+        "colle\\emph{x}suite puis \\LaTeX fin",
+        "\\textbf{gras}\n\n\\section{Titre} deux mots\n",
+        "  espaces   multiples\tet\ttabulations\n",
+        "accents : équation, thèse, où ça ?",
+        "",
+    ]
+    for texte in textes:
+        assert compter_mots(texte) == compter_mots_reference(texte), texte
+
+
+def test_commentaires_non_comptes():
+    assert compter_mots("un % deux trois\nquatre \\% cinq") == 3
+
+
+def test_section_garde_les_sous_titres_non_retenus():
+    source = ("\\section{A}\nalpha\n\\subsubsection{A1}\nbeta gamma\n\\paragraph{A2}\ndelta\n"
+              "\\subsection{B}\nepsilon\n\\section{C}\nzeta\n")
+    sections = extraire_chapitres(source, MODE_SECTIONS)
+    assert [(s.titre, s.nb_mots) for s in sections] == [("A", 4), ("B", 1), ("C", 1)]
+    assert "delta" in sections[0].texte and "epsilon" not in sections[0].texte
+
+    imbriquees = extraire_chapitres(source, MODE_SECTIONS, imbrique=True)
+    assert [(s.titre, s.nb_mots) for s in imbriquees] == [("A", 5), ("B", 1), ("C", 1)]
+
+
+def test_manuscrit_identique_au_fichier_seul(tmp_path):
+    source = ("\\chapter{Un}\nintro\n\\section{A}\nalpha\n\\subsubsection{A1}\nbeta\n"
+              "\\section{B}\ngamma \\emph{x} delta\n\\chapter{Deux}\nfin\n")
+    fichier = tmp_path / "main.tex"
+    fichier.write_text(source, encoding="utf-8")
+    manuscrit = charger_manuscrit(str(fichier), CacheAnalyses(None))
+    for imbrique in (False, True):
+        attendues = extraire_chapitres(source, MODE_SECTIONS, imbrique)
+        obtenues = manuscrit.sections(MODE_SECTIONS, imbrique)
+        assert [(s.titre, s.nb_mots, s.texte) for s in obtenues] == \
+               [(s.titre, s.nb_mots, s.texte) for s in attendues]
+
+
+def test_longue_fin_sans_commande_lineaire():
+    # Une version quadratique du lexer ne termine pas en temps raisonnable ici
+    source = "\\section{Début}\n" + "mot " * (10 * 1024 * 1024 // 4)
+    t = time.perf_counter()
+    document = analyser_document(source)
+    assert time.perf_counter() - t < 2.0
+    assert document.racine.nb_mots == 10 * 1024 * 1024 // 4
+
+
+def test_titres_non_fermes_lineaires():
+    # Chaque titre non fermé n'est exploré que jusqu'au titre suivant (ou une ligne vide)
+    source = "\\section{Titre \\emph{a} " * 20000
+    t = time.perf_counter()
+    document = analyser_document(source)
+    assert time.perf_counter() - t < 1.0
+    assert document.racine.enfants == []
+
+    # Une accolade fermée après une ligne vide ne termine pas le titre
+    document = analyser_document("\\section{Début \\emph{x}\n\nTexte} suite\n\\section{Suite}\nFin.")
+    assert [noeud.titre for noeud in document] == ["Suite"]
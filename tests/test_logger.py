@@ -0,0 +1,46 @@
+# ===============================================================
+# Tests du journal à fil d'écriture (analyseur/logger.py)
+# ===============================================================
+
+import json
+import re
+import threading
+
+from analyseur.logger import Logger
+
+
+def test_format_texte(tmp_path):
+    chemin = tmp_path / "analyse.log"
+    logger = Logger(str(chemin), signaux=False)
+    logger.log("Analyse du fichier : these.tex")
+    logger.vider()
+    assert re.search(r"\n\[\d\d:\d\d:\d\d\] Analyse du fichier : these.tex\n$", chemin.read_text(encoding="utf-8"))
+    logger.fin()
+    lignes = chemin.read_text(encoding="utf-8").splitlines()
+    assert lignes[1] == "LOG D'ANALYSE MULTI-AGENT"
+    assert lignes[-2].startswith("Fin : ") and lignes[-1].startswith("Durée totale : ")
+
+
+def test_fils_concurrents_en_json(tmp_path):
+    chemin = tmp_path / "analyse.jsonl"
+    logger = Logger(str(chemin), structure=True, taille_lot=64, signaux=False)
+
+    def travailleur(numero):
+        for i in range(500):
+            logger.log(f"appel {i}", travailleur=numero, i=i)
+
+    fils = [threading.Thread(target=travailleur, args=(n,), name=f"agent-{n}") for n in range(8)]
+    for fil in fils:
+        fil.start()
+    for fil in fils:
+        fil.join()
+    logger.fin()
+
+    enregistrements = [json.loads(ligne) for ligne in chemin.read_text(encoding="utf-8").splitlines()]
+    assert enregistrements[-1]["message"] == "fin"
+    appels = enregistrements[:-1]
+    assert len(appels) == 8 * 500
+    for numero in range(8):
+        propres = [e["i"] for e in appels if e["travailleur"] == numero]
+        assert propres == list(range(500))
+        assert {e["fil"] for e in appels if e["travailleur"] == numero} == {f"agent-{numero}"}
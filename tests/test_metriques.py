@@ -0,0 +1,123 @@
+# ===============================================================
+# Tests des histogrammes et de l'export Prometheus (analyseur/metriques.py)
+# ===============================================================
+
+import json
+import urllib.request
+
+import pytest
+
+from analyseur.metriques import (INTERVALLES_MAX, Esquisse, Histogramme, Metriques, ServeurMetriques,
+                                 fusionner_latences, latences_rapports)
+
+
+def test_quantiles_interpoles():
+    histogramme = Histogramme((1.0, 2.0, 4.0))
+    for valeur in (0.5, 1.5, 1.5, 3.0):
+        histogramme.observer(valeur)
+    # rang 2 sur 4 : milieu du seuil ]1, 2] qui contient 2 valeurs → 1.5
+    assert histogramme.quantile(0.5) == 1.5
+    assert histogramme.quantile(1.0) == 4.0
+    assert histogramme.resume() == {"nb": 4, "moyenne": 1.625, "p50": 1.5, "p90": 3.2, "p99": 3.92}
+    assert Histogramme().quantile(0.5) is None
+
+
+def test_au_dela_du_dernier_seuil():
+    histogramme = Histogramme((1.0,))
+    histogramme.observer(50.0)
+    assert histogramme.comptes == [0, 1]
+    assert histogramme.quantile(0.99) == 1.0
+
+
+def test_agregation_par_etiquette():
+    metriques = Metriques()
+    metriques.observer("appel_duree_secondes", 0.3, fournisseur="claude", tache="style")
+    metriques.observer("appel_duree_secondes", 0.7, fournisseur="claude", tache="synthese")
+    metriques.observer("appel_duree_secondes", 3.0, fournisseur="gemini", tache="style")
+    par_fournisseur = metriques.agreger("appel_duree_secondes", "fournisseur")
+    assert {api: h.nombre for api, h in par_fournisseur.items()} == {"claude": 2, "gemini": 1}
+    par_tache = metriques.agreger("appel_duree_secondes", "tache")
+    assert par_tache["style"].somme == 3.3
+
+
+def test_texte_prometheus():
+    metriques = Metriques()
+    metriques.incrementer("appels_total", fournisseur="openai", resultat="succes")
+    metriques.incrementer("appels_total", fournisseur="openai", resultat="succes")
+    metriques.jauge("appels_en_cours", 1, fournisseur="openai")
+    metriques.jauge("appels_en_cours", -1, fournisseur="openai")
+    metriques.incrementer("sections_total", degradation='a"b\\c')
+    metriques.observer("appel_duree_secondes", 0.4, fournisseur="openai")
+    texte = metriques.texte_prometheus()
+    lignes = texte.splitlines()
+    assert "# TYPE analyseur_appels_total counter" in lignes
+    assert 'analyseur_appels_total{fournisseur="openai",resultat="succes"} 2' in lignes
+    assert 'analyseur_appels_en_cours{fournisseur="openai"} 0' in lignes
+    assert 'analyseur_sections_total{degradation="a\\"b\\\\c"} 1' in lignes
+    assert "# TYPE analyseur_appel_duree_secondes histogram" in lignes
+    assert 'analyseur_appel_duree_secondes_bucket{fournisseur="openai",le="0.25"} 0' in lignes
+    assert 'analyseur_appel_duree_secondes_bucket{fournisseur="openai",le="0.5"} 1' in lignes
+    assert 'analyseur_appel_duree_secondes_bucket{fournisseur="openai",le="+Inf"} 1' in lignes
+    assert 'analyseur_appel_duree_secondes_count{fournisseur="openai"} 1' in lignes
+    assert metriques.total("appels_total", resultat="succes") == 2
+    assert texte.endswith("\n")
+
+
+def test_textfile_et_serveur(tmp_path):
+    metriques = Metriques()
+    metriques.incrementer("reprises_total", fournisseur="claude", tache="style")
+    chemin = tmp_path / "analyseur.prom"
+    metriques.ecrire_textfile(str(chemin))
+    assert chemin.read_text(encoding="utf-8") == metriques.texte_prometheus()
+    assert [f.name for f in tmp_path.iterdir()] == ["analyseur.prom"]
+
+    serveur = ServeurMetriques(metriques, 0)
+    try:
+        with urllib.request.urlopen(serveur.adresse, timeout=5) as reponse:
+            assert reponse.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            corps = reponse.read().decode("utf-8")
+    finally:
+        serveur.arreter()
+    assert 'analyseur_reprises_total{fournisseur="claude",tache="style"} 1' in corps
+
+
+def test_esquisse_precision_relative():
+    esquisse = Esquisse()
+    valeurs = [0.05 * 1.003 ** i for i in range(3000)]
+    for valeur in valeurs:
+        esquisse.ajouter(valeur)
+    for q in (0.5, 0.9, 0.99):
+        attendu = valeurs[int(q * (len(valeurs) - 1))]
+        assert abs(esquisse.quantile(q) - attendu) <= 0.01 * attendu
+    assert esquisse.quantile(0.0) == valeurs[0] and esquisse.quantile(1.0) == valeurs[-1]
+
+
+def test_esquisse_memoire_bornee():
+    esquisse = Esquisse()
+    for i in range(-3000, 3000, 3):
+        esquisse.ajouter(1.05 ** i)
+    assert len(esquisse.comptes) <= INTERVALLES_MAX
+    assert esquisse.nombre == 2000
+    assert esquisse.quantile(0.99) == pytest.approx(1.05 ** 2937, rel=0.01)
+
+
+def test_esquisse_fusion_et_json(tmp_path):
+    rapports = []
+    for n, decalage in ((300, 0.0), (700, 1.0)):
+        esquisse = Esquisse()
+        for i in range(n):
+            esquisse.ajouter(decalage + i / n)
+        chemin = tmp_path / f"run{n}.json"
+        chemin.write_text(json.dumps({"statistiques": {"esquisses_latence": {
+            "claude": {"style": esquisse.en_dict()}}}}), encoding="utf-8")
+        rapports.append(str(chemin))
+    esquisse = latences_rapports(rapports)["claude"]["style"]
+    assert esquisse.nombre == 1000
+    assert (esquisse.min, esquisse.max) == (0.0, 1 + 699 / 700)
+    assert esquisse.zeros == 1
+    assert esquisse.quantile(0.3) == pytest.approx(1.0, rel=0.01)
+
+    fusion = fusionner_latences([{"gemini": {"synthese": Esquisse().en_dict()}}])
+    assert fusion["gemini"]["synthese"].resume()["p50"] is None
+    with pytest.raises(ValueError):
+        Esquisse(0.01).fusionner(Esquisse(0.02))
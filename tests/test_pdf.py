@@ -0,0 +1,66 @@
+# ===============================================================
+# Tests de l'écriture PDF native (analyseur/pdf.py, rapport_pdf.py)
+# ===============================================================
+
+import io
+import re
+import zlib
+
+from analyseur.pdf import EcrivainPDF, vers_winansi
+from analyseur.rapport_pdf import ecrire_rapport_pdf
+from analyseur.resultats import MagasinResultats
+
+RAPPORT = {"temps_total_min": 1.5, "nb_appels": 6, "taux_succes": 100.0, "nb_sections_degradees": 1}
+ANALYSE = ("Analyse (détaillée) \\ avec « guillemets » — œuvre, émoji 🚀 ✓. " * 40
+           + "\n\n- point 1\n- " + "x" * 400)
+
+
+def _structure(pdf: bytes):
+    """Vérifie xref, trailer et flux ; renvoie (nombre d'objets, nombre de pages)"""
+    assert pdf.startswith(b"%PDF-1.4\n") and pdf.endswith(b"%%EOF\n")
+    debut_xref = int(re.search(rb"startxref\n(\d+)\n%%EOF\n$", pdf).group(1))
+    assert pdf[debut_xref:].startswith(b"xref\n")
+    nb_objets = int(re.match(rb"xref\n0 (\d+)\n", pdf[debut_xref:]).group(1))
+    entrees = pdf[debut_xref:].split(b"\n")[2:2 + nb_objets]
+    assert entrees[0] == b"0000000000 65535 f "
+    for numero, entree in enumerate(entrees[1:], 1):
+        assert len(entree) == 19 and entree.endswith(b" 00000 n ")
+        offset = int(entree[:10])
+        assert pdf[offset:].startswith(b"%d 0 obj\n" % numero), numero
+    assert re.search(rb"trailer\n<< /Size %d /Root 1 0 R" % nb_objets, pdf)
+
+    for flux in re.finditer(rb"/Length (\d+) /Filter /FlateDecode >>\nstream\n", pdf):
+        longueur = int(flux.group(1))
+        fin = flux.end() + longueur
+        assert pdf[fin:fin + 10] == b"\nendstream"
+        zlib.decompress(pdf[flux.end():fin])
+
+    pages = re.findall(rb"/Type /Page /Parent", pdf)
+    assert int(re.search(rb"/Count (\d+)", pdf).group(1)) == len(pages)
+    return nb_objets, len(pages)
+
+
+def test_document_vide():
+    flux = io.BytesIO()
+    EcrivainPDF(flux, "Titre").fermer()
+    assert _structure(flux.getvalue()) == (8, 1)
+
+
+def test_rapport_multipage(tmp_path):
+    magasin = MagasinResultats(str(tmp_path / "run.jsonl"))
+    for i in range(40):
+        magasin.ajouter({"chapitre": f"Chapitre {i} : Été", "fichier": "/these/chap.tex",
+                         "scientifique": ANALYSE, "style": ANALYSE, "synthese": ANALYSE,
+                         "degradation": "normal" if i % 7 else "sans_synthese"})
+    flux = io.BytesIO()
+    ecrire_rapport_pdf(flux, magasin, "these.tex", "Normal", RAPPORT, len(magasin))
+    magasin.fermer()
+
+    nb_objets, nb_pages = _structure(flux.getvalue())
+    assert nb_pages > 40
+    # Objet 0 libre, catalogue, pages, 2 polices, contenu + page par page, informations
+    assert nb_objets == 5 + 2 * nb_pages + 1
+
+
+def test_winansi():
+    assert vers_winansi("Été « œuvre » — ✓ 🚀 ﬁ") == "Été « œuvre » —   fi"
@@ -0,0 +1,180 @@
+# ===============================================================
+# Tests du cœur importable (analyseur/pipeline.py, analyseur/fournisseurs.py)
+# ===============================================================
+
+import json
+import os
+import subprocess
+import sys
+
+from analyseur.fournisseurs import Fournisseurs, FournisseursHTTP
+from analyseur.pipeline import MODE_NORMAL, Pipeline
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MANUSCRIT = r"""\documentclass{book}
+\begin{document}
+\chapter{Introduction}
+""" + "Le modèle numérique est présenté ici avec soin. " * 20 + r"""
+\section{Méthode}
+""" + "Les équations sont discrétisées par éléments finis. " * 20 + r"""
+\end{document}
+"""
+
+
+class FournisseursFactices(Fournisseurs):
+    """Répond sans réseau ; Gemini est indisponible"""
+
+    def __init__(self):
+        super().__init__()
+        self.appels = []
+
+    def _construire(self, nom):
+        if nom == "gemini":
+            raise RuntimeError("pas de clé")
+        return object()
+
+    def appeler(self, nom, system_prompt, echanges, temperature, max_tokens, delai=None, rapide=False,
+                modele=None, flux=None):
+        self.client(nom)
+        self.appels.append(nom)
+        return f"Réponse {nom} ({len(self.appels)})", False, {"modele": nom, "jetons_entree": 100,
+                                                               "jetons_sortie": 50}
+
+
+def test_import_sans_effet_de_bord():
+    code = ("import sys, analyseur, analyseur.pipeline\n"
+            "assert not {'openai', 'anthropic', 'google'} & set(sys.modules)\n"
+            "assert not analyseur.pipeline.FOURNISSEURS_DEFAUT._clients\n")
+    sortie = subprocess.run([sys.executable, "-c", code], cwd=RACINE, capture_output=True, text=True)
+    assert sortie.returncode == 0, sortie.stderr
+    assert sortie.stdout == ""
+
+
+def test_scripts_sans_effet_de_bord():
+    # La démo et le script autonome ne sont que des points d'entrée sur le cœur
+    code = ("import sys, runpy\n"
+            "runpy.run_path('agent_multi_models_demo.py')\n"
+            "runpy.run_path('agent_standalone.py')\n"
+            "runpy.run_path('agent_multi_models.py')\n"
+            "assert not {'openai', 'anthropic', 'google'} & set(sys.modules)\n")
+    sortie = subprocess.run([sys.executable, "-c", code], cwd=RACINE, capture_output=True, text=True)
+    assert sortie.returncode == 0, sortie.stderr
+    assert sortie.stdout == ""
+
+
+def test_script_v21_delegue_au_pipeline(monkeypatch):
+    import runpy
+    from analyseur import pipeline
+    v21 = runpy.run_path(os.path.join(RACINE, "agent_multi_models.py"))
+    # Mêmes agents que v3.2 : budgets de sortie par tâche, pas 4000 jetons fixes
+    assert v21["agent_scientifique"] is pipeline.agent_scientifique
+    assert "safe_call_unified" not in v21
+    assert v21["fournisseurs"].modeles["claude"] == v21["MODELES_V21"]["claude"]
+    # Reprises par safe_call_unified seulement, délais d'appel bornés par l'échéance
+    assert v21["fournisseurs"].max_retries == 0
+    assert not v21["echeance_option"]().active()
+    monkeypatch.setattr(sys, "argv", ["agent_multi_models.py", "--deadline", "+60s"])
+    assert v21["echeance_option"]().active()
+
+
+def test_script_v21_progression(tmp_path, monkeypatch):
+    import builtins
+    import runpy
+    from analyseur.progression import Progression
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "these.tex").write_text(MANUSCRIT, encoding="utf-8")
+    reponses = iter(["2", "O", "these.tex", "O"])
+    monkeypatch.setattr(builtins, "input", lambda *_: next(reponses))
+    monkeypatch.setattr(sys, "argv", ["agent_multi_models.py"])
+    demandes, prevus, observes = [], [], []
+
+    def appeler(self, nom, system_prompt, echanges, temperature, max_tokens, delai, rapide, modele):
+        demandes.append(max_tokens)
+        return "Analyse", False, {"modele": nom, "jetons_entree": 100, "jetons_sortie": 40}
+
+    initialiser, observer = Progression.__init__, Progression.observer
+
+    def suivre(self, travaux, *args, **kwargs):
+        prevus.extend(appel["budget"] for appels in travaux for appel in appels)
+        initialiser(self, travaux, *args, **kwargs)
+
+    def observer_appel(self, fournisseur, duree, jetons_sortie=None, budget=None):
+        observes.append((jetons_sortie, budget))
+        observer(self, fournisseur, duree, jetons_sortie, budget)
+
+    monkeypatch.setattr(Fournisseurs, "_construire", lambda self, nom: nom)
+    monkeypatch.setattr(Fournisseurs, "_appeler", appeler)
+    monkeypatch.setattr(Progression, "__init__", suivre)
+    monkeypatch.setattr(Progression, "observer", observer_appel)
+    runpy.run_path(os.path.join(RACINE, "agent_multi_models.py"), run_name="__main__")
+
+    # Le suivi du temps restant prévoit les max_tokens réellement demandés (plan exclu)
+    # et corrige son débit avec les jetons de sortie renvoyés
+    assert prevus == demandes[1:]
+    assert observes == [(40, budget) for budget in demandes[1:]]
+
+
+def test_fournisseur_indisponible():
+    fournisseurs = FournisseursFactices()
+    assert fournisseurs.disponibilites() == {"claude": True, "gemini": False, "openai": True}
+    assert fournisseurs.erreurs == {"gemini": "pas de clé"}
+
+
+def test_fournisseurs_http(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "cle-claude")
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("GEMINI_API_KEY", raising=False)
+    requetes = []
+
+    def poster(url, entetes, corps, delai):
+        requetes.append((url, entetes, corps, delai))
+        return {"content": [{"text": "Analyse"}], "stop_reason": "end_turn",
+                "usage": {"input_tokens": 12, "output_tokens": 3}}
+
+    fournisseurs = FournisseursHTTP(cache=None)
+    monkeypatch.setattr(fournisseurs, "_poster", poster)
+    assert fournisseurs.disponibilites() == {"claude": True, "gemini": False, "openai": False}
+    assert fournisseurs.erreurs["openai"] == "OPENAI_API_KEY non définie"
+
+    texte, tronque, infos = fournisseurs.appeler("claude", "Système", [{"role": "user", "content": "Texte"}],
+                                                 0.2, 800, delai=30)
+    assert (texte, tronque, infos["jetons_sortie"]) == ("Analyse", False, 3)
+    url, entetes, corps, delai = requetes[0]
+    assert entetes["x-api-key"] == "cle-claude" and delai == 30
+    assert corps["max_tokens"] == 800 and corps["system"] == "Système"
+
+
+def test_demo(tmp_path, monkeypatch):
+    import runpy
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "these.tex").write_text(MANUSCRIT, encoding="utf-8")
+    demo = runpy.run_path(os.path.join(RACINE, "agent_multi_models_demo.py"))
+    pipeline = Pipeline(MODE_NORMAL, fournisseurs=demo["FournisseursDemo"](), nom_rapport="demo")
+    pipeline.executer("these.tex")
+    resultat = pipeline.stats.resultats[0]
+    assert resultat["scientifique"] == demo["ANALYSE_SCIENTIFIQUE"]
+    assert resultat["style"] == demo["ANALYSE_STYLE"] and resultat["synthese"] == demo["SYNTHESE"]
+    assert pipeline.stats.obtenir_rapport()["taux_succes"] == 100
+
+
+def test_run_complet(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "these.tex").write_text(MANUSCRIT, encoding="utf-8")
+    fournisseurs = FournisseursFactices()
+    pipeline = Pipeline(MODE_NORMAL, fournisseurs=fournisseurs, nom_rapport="essai")
+    assert pipeline.modeles["style"] == "openai"
+
+    chemins = pipeline.executer("these.tex")
+
+    assert [s["chapitre"] for s in pipeline.stats.resultats] == ["Introduction", "Méthode"]
+    assert fournisseurs.appels.count("openai") == 2 and fournisseurs.appels.count("claude") == 4
+    assert pipeline.progression.estimation()["avancement"] == 1.0
+    with open(chemins["json"], encoding="utf-8") as f:
+        rapport = json.load(f)
+    assert rapport["statistiques"]["nb_appels"] == 6
+    assert rapport["statistiques"]["compaction"]["jetons_bruts"] == sum(
+        r["compaction"]["jetons_bruts"] for r in pipeline.stats.resultats)
+    assert chemins["prof"] is None
+    assert os.path.exists("rapports/historique_appels.json")
+    assert os.path.exists(chemins["journal"]) and os.path.exists(chemins["trace"])
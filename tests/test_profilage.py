@@ -0,0 +1,56 @@
+# ===============================================================
+# Tests du profileur par étape (analyseur/profilage.py)
+# ===============================================================
+
+import pstats
+import tracemalloc
+
+from analyseur.profilage import Profileur
+
+
+def test_inactif_ne_mesure_rien():
+    profileur = Profileur()
+    profileur.demarrer()
+    with profileur.etape("chargement"):
+        donnees = [0] * 1000
+    profileur.arreter()
+    assert donnees and profileur.etapes == {}
+    assert not tracemalloc.is_tracing()
+    assert profileur.ecrire_cprofile("inutile.prof") is None
+
+
+def test_pic_et_allocations():
+    profileur = Profileur(actif=True, echantillons=2)
+    profileur.demarrer()
+    try:
+        for _ in range(5):
+            with profileur.etape("export"):
+                with profileur.etape("prompt"):
+                    tampon = bytearray(400_000)
+                    del tampon
+                conserve = [str(i) for i in range(2000)]
+    finally:
+        profileur.arreter()
+    assert not tracemalloc.is_tracing()
+    rapport = profileur.rapport()
+    export, prompt = rapport["etapes"]["export"], rapport["etapes"]["prompt"]
+    assert export["nb"] == prompt["nb"] == 5
+    # Le pic de l'étape imbriquée remonte à l'étape englobante
+    assert prompt["pic_memoire_ko"] >= 390
+    assert export["pic_memoire_ko"] >= prompt["pic_memoire_ko"]
+    # Allocations relevées sur les deux premiers passages seulement
+    assert any("test_profilage.py" in a["ligne"] for a in export["allocations"])
+    assert len(export["allocations"]) <= 5
+    assert rapport["duree_locale_sec"] <= export["duree_sec"] + 1e-3
+    assert conserve
+
+
+def test_cprofile(tmp_path):
+    profileur = Profileur(actif=True, cprofile=True)
+    profileur.demarrer()
+    with profileur.etape("selection"):
+        sorted(range(10_000), key=lambda x: -x)
+    profileur.arreter()
+    chemin = profileur.ecrire_cprofile(str(tmp_path / "run.prof"))
+    fonctions = {cle[2] for cle in pstats.Stats(chemin).stats}
+    assert "<lambda>" in fonctions
@@ -0,0 +1,55 @@
+# ===============================================================
+# Tests du temps restant estimé (analyseur/progression.py)
+# ===============================================================
+
+import pytest
+
+from analyseur.estimation import A_PRIORI, REMPLISSAGE
+from analyseur.progression import Progression
+
+
+def _duree(fournisseur, budget):
+    return A_PRIORI[fournisseur]["latence"] + budget * REMPLISSAGE / A_PRIORI[fournisseur]["debit"]
+
+
+def _section(budget):
+    return [{"tache": "scientifique", "fournisseur": "claude", "budget": budget},
+            {"tache": "style", "fournisseur": "gemini", "budget": budget}]
+
+
+def test_poids_des_sections():
+    travaux = [_section(200), _section(2000)]
+    progression = Progression(travaux)
+    assert progression.restant() == pytest.approx(sum(_duree(f, b) for f in ("claude", "gemini")
+                                                      for b in (200, 2000)))
+    # La courte section terminée, il reste la longue : pas une extrapolation de la dernière
+    progression.terminer_section(0)
+    assert progression.restant() == pytest.approx(_duree("claude", 2000) + _duree("gemini", 2000))
+    assert progression.estimation()["sections_restantes"] == 1
+    assert "prevue" not in travaux[0][0]
+
+
+def test_correction_par_fournisseur():
+    progression = Progression([_section(1000), _section(1000), _section(1000)], lissage=0.5)
+    # Claude deux fois plus lent que prévu, d'après ses jetons réels
+    progression.observer("claude", 2 * (A_PRIORI["claude"]["latence"] + 500 / A_PRIORI["claude"]["debit"]),
+                         jetons_sortie=500)
+    assert progression.facteurs["claude"] == pytest.approx(2)
+    prevu = progression.terminer(0, "scientifique")
+    assert prevu["budget"] == 1000
+    assert progression.terminer(0, "scientifique") is None
+    progression.observer("claude", 3 * _duree("claude", 1000), budget=1000)
+    facteur = progression.facteurs["claude"]
+    restant_claude = 2 * _duree("claude", 1000) * facteur
+    restant_gemini = 3 * _duree("gemini", 1000)
+    assert progression.restant() == pytest.approx(restant_claude + restant_gemini)
+
+
+def test_concurrence_et_fin():
+    progression = Progression([_section(500)] * 4, concurrence=2)
+    assert progression.restant() == pytest.approx(2 * (_duree("claude", 500) + _duree("gemini", 500)))
+    for section in range(4):
+        progression.terminer_section(section)
+    estimation = progression.estimation()
+    assert estimation["avancement"] == 1.0 and estimation["restant_sec"] == 0
+    assert str(progression).startswith("100 % | reste ~0.0 min")
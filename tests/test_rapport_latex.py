@@ -0,0 +1,35 @@
+# ===============================================================
+# Tests du rapport LaTeX incrémental (analyseur/rapport_latex.py)
+# ===============================================================
+
+from analyseur.rapport_latex import RapportLatex, echapper_latex
+
+
+def test_echappement_complet():
+    assert echapper_latex(r"a_b 50% & #1 $x^2$ {y} ~z \cmd") == (
+        r"a\_b 50\% \& \#1 \$x\textasciicircum{}2\$ \{y\} \textasciitilde{}z \textbackslash{}cmd")
+
+
+def test_document_clos_a_chaque_point_de_controle(tmp_path):
+    chemin = tmp_path / "rapport.tex"
+    rapport = RapportLatex(str(chemin))
+    assert chemin.read_text(encoding="utf-8").endswith("\\maketitle\n\n\\end{document}\n")
+
+    rapport.configuration("Normal", {"synthese": "claude"})
+    rapport.partie("Rapport global")
+    for i in range(3):
+        rapport.section(f"Section {i}", f"Synthèse {i} : 100% & _fini_")
+        contenu = chemin.read_text(encoding="utf-8")
+        assert contenu.count("\\end{document}") == 1 and contenu.endswith("\\end{document}\n")
+        assert contenu.count("\\begin{itemize}") == contenu.count("\\end{itemize}")
+        assert f"Synthèse {i} : 100\\% \\& \\_fini\\_" in contenu
+    rapport.fermer()
+
+    contenu = chemin.read_text(encoding="utf-8")
+    assert [contenu.index(f"\\section*{{Section {i}}}") for i in range(3)] == sorted(
+        contenu.index(f"\\section*{{Section {i}}}") for i in range(3))
+    assert rapport.nb_sections == 3
+    # Titres étoilés : la table des matières n'a que les entrées ajoutées explicitement
+    assert "\\tableofcontents" in contenu
+    assert "\\chapter*{Rapport global}\n\\addcontentsline{toc}{chapter}{Rapport global}" in contenu
+    assert contenu.count("\\addcontentsline{toc}{section}") == 3
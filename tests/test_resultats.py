@@ -0,0 +1,71 @@
+# ===============================================================
+# Tests du magasin de résultats (analyseur/resultats.py)
+# ===============================================================
+
+import io
+import json
+
+import pytest
+
+from analyseur.resultats import MagasinResultats
+
+
+def _resultat(i: int) -> dict:
+    return {
+        "chapitre": f"Chapitre {i} — « accents » et \"guillemets\"",
+        "scientifique": "Ligne 1\nLigne 2\t\\ équation",
+        "style": "",
+        "synthese": "ok" * i,
+        "degradation": "normal" if i % 2 else "sans_synthese",
+        "fichier": None,
+        "duree": i / 3,
+    }
+
+
+@pytest.fixture
+def magasin(tmp_path):
+    magasin = MagasinResultats(str(tmp_path / "run.jsonl"))
+    yield magasin
+    magasin.fermer()
+
+
+@pytest.mark.parametrize("nombre", [0, 1, 5])
+def test_ecrire_json_identique_a_json_dump(magasin, nombre):
+    resultats = [_resultat(i) for i in range(nombre)]
+    for resultat in resultats:
+        magasin.ajouter(resultat)
+    magasin.evenement("appel", api="claude", succes=True)
+
+    flux = io.StringIO()
+    magasin.ecrire_json(flux)
+    assert flux.getvalue() == json.dumps(resultats, ensure_ascii=False, indent=2)
+
+
+def test_ecrire_json_imbrique(magasin):
+    resultats = [_resultat(i) for i in range(3)]
+    for resultat in resultats:
+        magasin.ajouter(resultat)
+    entete = {"metadata": {"fichier_source": "these.tex"}}
+
+    flux = io.StringIO()
+    texte = json.dumps(entete, ensure_ascii=False, indent=2)
+    flux.write(texte[:-2] + ',\n  "resultats": ')
+    magasin.ecrire_json(flux, indent=2, niveau=1)
+    flux.write("\n}")
+    attendu = json.dumps(dict(entete, resultats=resultats), ensure_ascii=False, indent=2)
+    assert flux.getvalue() == attendu
+
+
+def test_journal_et_relecture(magasin):
+    magasin.evenement("debut", mode="Normal")
+    magasin.ajouter(_resultat(1))
+    magasin.evenement("appel", api="gemini", succes=False)
+    magasin.ajouter(_resultat(2))
+
+    assert len(magasin) == 2
+    assert list(magasin) == [_resultat(1), _resultat(2)]
+    assert magasin[1] == _resultat(2)
+    assert magasin.compter("sans_synthese") == 1
+    with open(magasin.chemin, encoding="utf-8") as f:
+        evenements = [json.loads(ligne)["evenement"] for ligne in f]
+    assert evenements == ["debut", "section", "appel", "section"]
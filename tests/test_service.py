@@ -0,0 +1,205 @@
+# ===============================================================
+# Tests du mode serve (analyseur/service.py) et des ressources partagées
+# ===============================================================
+
+import json
+import threading
+import time
+import urllib.request
+
+from analyseur.fournisseurs import CacheReponses, Flux, Fournisseurs, Limiteur
+from analyseur.file_travaux import EN_COURS, TERMINE, FileTravaux
+from analyseur.service import Ouvrier, Service, parser_limites
+
+MANUSCRIT = r"""\documentclass{book}
+\begin{document}
+\chapter{Introduction}
+""" + "Le modèle numérique est présenté ici avec soin. " * 30 + r"""
+\chapter{Résultats}
+""" + "Les simulations confirment la convergence attendue. " * 30 + r"""
+\end{document}
+"""
+
+
+class FournisseursFactices(Fournisseurs):
+    """SDK remplacés : chaque appel brut est compté et dure un peu"""
+
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.nb_bruts = 0
+        self.simultanes = 0
+        self.max_simultanes = 0
+        self._compteur = threading.Lock()
+
+    def _construire(self, nom):
+        return object()
+
+    def _appeler(self, nom, system_prompt, echanges, temperature, max_tokens, delai, rapide, modele):
+        with self._compteur:
+            self.nb_bruts += 1
+            self.simultanes += 1
+            self.max_simultanes = max(self.max_simultanes, self.simultanes)
+        time.sleep(0.02)
+        with self._compteur:
+            self.simultanes -= 1
+        return f"Analyse par {nom}", False, {"modele": nom, "jetons_entree": 80, "jetons_sortie": 40}
+
+
+def _requete(url, donnees=None):
+    corps = json.dumps(donnees).encode("utf-8") if donnees is not None else None
+    with urllib.request.urlopen(urllib.request.Request(url, corps), timeout=10) as reponse:
+        return reponse.status, reponse.read()
+
+
+def test_cache_des_reponses():
+    fournisseurs = FournisseursFactices(cache=CacheReponses(taille=1))
+    echanges = [{"role": "user", "content": "texte"}]
+    assert fournisseurs.appeler("claude", "sys", echanges, 0.3, 100)[2].get("cache") is None
+    assert fournisseurs.appeler("claude", "sys", echanges, 0.3, 100)[2]["cache"] is True
+    assert fournisseurs.nb_bruts == 1
+    # Taille 1 : une autre réponse évince la première
+    fournisseurs.appeler("claude", "sys", echanges, 0.5, 100)
+    fournisseurs.appeler("claude", "sys", echanges, 0.3, 100)
+    assert fournisseurs.nb_bruts == 3
+
+
+def test_limiteur_partage_entre_fils():
+    fournisseurs = FournisseursFactices(limites={"claude": Limiteur(2)})
+    fils = [threading.Thread(target=fournisseurs.appeler,
+                             args=("claude", "sys", [{"role": "user", "content": str(i)}], 0.3, 100))
+            for i in range(8)]
+    for fil in fils:
+        fil.start()
+    for fil in fils:
+        fil.join()
+    assert fournisseurs.nb_bruts == 8
+    assert fournisseurs.max_simultanes <= 2
+
+
+def test_parser_limites():
+    limites = parser_limites("claude=2:30,openai=16")
+    assert (limites["claude"].concurrence, limites["claude"].rpm) == (2, 30.0)
+    assert limites["openai"].concurrence == 16 and limites["gemini"].concurrence == 8
+
+
+def test_service_http(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    fournisseurs = FournisseursFactices(limites={"claude": Limiteur(1)}, cache=CacheReponses())
+    service = Service(0, nb_travaux=2, file=FileTravaux("travaux.sqlite3"), fournisseurs=fournisseurs)
+    try:
+        ids = []
+        for _ in range(2):
+            code, corps = _requete(f"{service.adresse}/travaux",
+                                   {"nom": "these.tex", "contenu": MANUSCRIT, "mode": "rapide",
+                                    "modeles": {"scientifique": "claude", "style": "openai",
+                                                "synthese": "claude"}})
+            assert code == 201
+            ids.append(json.loads(corps)["id"])
+
+        # Le flux d'événements se termine avec le travail
+        _, flux = _requete(f"{service.adresse}/travaux/{ids[0]}/evenements")
+        evenements = [json.loads(ligne)["evenement"] for ligne in flux.decode("utf-8").splitlines()]
+        assert evenements[0] == "debut" and evenements[-1] == "fin"
+
+        for identifiant in ids:
+            for _ in range(100):
+                travail = json.loads(_requete(f"{service.adresse}/travaux/{identifiant}")[1])
+                if travail["etat"] == TERMINE:
+                    break
+                time.sleep(0.05)
+            assert travail["etat"] == TERMINE, travail
+            rapport = json.loads(_requete(f"{service.adresse}/travaux/{identifiant}/rapport.json")[1])
+            assert len(rapport["resultats"]) == 2
+            # Une réponse reprise du cache compte comme un succès
+            assert rapport["statistiques"]["taux_succes"] == 100
+
+        # Même manuscrit soumis deux fois : la plupart des réponses viennent du cache partagé
+        assert fournisseurs.nb_bruts < 12
+        assert fournisseurs.max_simultanes <= 2
+        sante = json.loads(_requete(f"{service.adresse}/sante")[1])
+        assert sante["cache_reponses"]["trouvees"] > 0
+        assert sante["file"] == {TERMINE: 2}
+        assert len(json.loads(_requete(f"{service.adresse}/travaux?etat={TERMINE}")[1])) == 2
+    finally:
+        service.arreter()
+
+
+def test_bail_perdu_en_cours_de_run(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    chapitres = "".join(f"\\chapter{{Partie {n}}}\n" + f"Le schéma {n} converge vers la solution exacte. " * 30
+                        for n in range(6))
+    (tmp_path / "these.tex").write_text("\\documentclass{book}\n\\begin{document}\n" + chapitres
+                                        + "\\end{document}\n", encoding="utf-8")
+    file = FileTravaux("travaux.sqlite3", bail=0.4)
+    identifiant = file.soumettre("these.tex", "rapide")["id"]
+    ouvrier = Ouvrier(file, 1, fournisseurs=FournisseursFactices(), intervalle=0.05)
+    try:
+        for _ in range(200):
+            pipeline = ouvrier.pipelines.get(identifiant)
+            if pipeline and pipeline.stats and len(pipeline.stats.resultats) >= 1:
+                break
+            time.sleep(0.01)
+        # Bail expiré et repris par un autre ouvrier pendant l'analyse
+        file._transaction(lambda c: c.execute("UPDATE travaux SET ouvrier = 'autre', tentatives = 2 WHERE id = ?",
+                                              (identifiant,)))
+        for _ in range(200):
+            if not ouvrier.en_cours():
+                break
+            time.sleep(0.02)
+        assert ouvrier.en_cours() == 0
+    finally:
+        ouvrier.arreter()
+
+    # Arrêt avant la fin, sans rapport ni changement d'état du travail repris
+    assert pipeline.annulation.is_set() and len(pipeline.stats.resultats) < 6
+    for format in ("html", "pdf", "json", "trace.json"):
+        assert not (tmp_path / "rapports" / f"travail_{identifiant}_1.{format}").exists()
+    travail = file.obtenir(identifiant)
+    assert (travail["etat"], travail["ouvrier"], travail["chemins"]) == (EN_COURS, "autre", {})
+
+
+def _ordre_de_service(appels):
+    """Occupe l'unique place, met les appels en file dans l'ordre donné, puis relâche"""
+    limiteur = Limiteur(1)
+    ordre = []
+
+    def appel(flux, nom):
+        limiteur.acquerir(flux, 1000)
+        ordre.append(nom)
+        limiteur.liberer()
+
+    limiteur.acquerir()
+    fils = []
+    for i, (flux, nom) in enumerate(appels):
+        fils.append(threading.Thread(target=appel, args=(flux, nom)))
+        fils[-1].start()
+        while len(limiteur._file) < i + 1:
+            time.sleep(0.001)
+    limiteur.liberer()
+    for fil in fils:
+        fil.join()
+    return ordre
+
+
+def test_partage_equitable():
+    gros, petit = Flux("gros"), Flux("petit")
+    # Le gros travail a déjà trois appels en attente quand le petit arrive
+    ordre = _ordre_de_service([(gros, "g1"), (gros, "g2"), (gros, "g3"), (petit, "p1")])
+    assert ordre == ["g1", "p1", "g2", "g3"]
+
+
+def test_poids():
+    lourd, leger = Flux("lourd", poids=4), Flux("leger", poids=1)
+    ordre = _ordre_de_service([(lourd, "L")] * 4 + [(leger, "l")] * 4)
+    # Poids 4 : quatre appels servis pour un
+    assert "".join(ordre) == "LlLLLlll"
+
+
+def test_attente_hors_latence():
+    from analyseur.pipeline import Statistiques
+    stats = Statistiques()
+    stats.ajouter_appel("claude", 5.0, True, "style", infos={"attente_sec": 2.0, "jetons_sortie": 10})
+    rapport = stats.obtenir_rapport()
+    assert rapport["attente_fournisseurs"] == {"claude": {"sec": 2.0, "nb": 1}}
+    assert rapport["latences_par_fournisseur"]["claude"]["max"] == 3.0
+    stats.resultats.fermer()
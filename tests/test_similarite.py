@@ -0,0 +1,99 @@
+# ===============================================================
+# Tests de l'index des sections quasi identiques (analyseur/similarite.py)
+# ===============================================================
+
+import pytest
+
+from analyseur.fournisseurs import Fournisseurs
+from analyseur.pipeline import MODE_RAPIDE, Pipeline
+from analyseur.similarite import (IndexSimilarite, mots_sans_latex, parser_seuils, passages_modifies,
+                                  signature, similarite)
+
+
+def _paragraphe(graine: int, nb: int = 30, modifiees=()) -> str:
+    return " ".join(f"La mesure {graine} numéro {n} donne un écart de {n * 7 + graine} pour cent."
+                    if n not in modifiees else f"Cette phrase {n} a été entièrement réécrite par l'auteur."
+                    for n in range(nb))
+
+
+def _manuscrit(methodes: str) -> str:
+    return ("\\documentclass{book}\n\\begin{document}\n\\chapter{Méthodes}\n" + methodes
+            + "\n\\chapter{Résultats}\n" + _paragraphe(2) + "\n\\end{document}\n")
+
+
+class FournisseursFactices(Fournisseurs):
+    """Répond sans réseau et garde les prompts reçus"""
+
+    def __init__(self):
+        super().__init__()
+        self.prompts = []
+
+    def _construire(self, nom):
+        return object()
+
+    def appeler(self, nom, system_prompt, echanges, temperature, max_tokens, delai=None, rapide=False,
+                modele=None, flux=None):
+        self.prompts.append(echanges[0]["content"])
+        return f"Analyse {len(self.prompts)}", False, {"modele": nom, "jetons_entree": 100, "jetons_sortie": 50}
+
+
+def test_signature_ignore_le_latex():
+    texte = _paragraphe(1)
+    annote = texte.replace("pour cent.", "pour cent~\\cite{dupont}. % à vérifier\n", 3) + " $x^2$ \\label{sec:m}"
+    assert mots_sans_latex("\\textbf{Deux} mots % commentaire") == ["deux", "mots"]
+    assert similarite(signature(mots_sans_latex(texte)), signature(mots_sans_latex(annote))) == 1.0
+
+    proche = signature(mots_sans_latex(_paragraphe(1, modifiees=(4, 15, 22))))
+    autre = signature(mots_sans_latex(_paragraphe(9)))
+    assert 0.6 <= similarite(signature(mots_sans_latex(texte)), proche) < 0.9
+    assert similarite(signature(mots_sans_latex(texte)), autre) < 0.2
+
+
+def test_passages_modifies():
+    ancien = "Première phrase. Deuxième phrase. Troisième phrase."
+    nouveau = "Première phrase. Deuxième phrase revue. Troisième phrase."
+    assert passages_modifies(ancien, nouveau) == "+ Deuxième phrase revue.\n- Deuxième phrase."
+
+
+def test_parser_seuils():
+    assert parser_seuils(None) == (0.9, 0.6)
+    assert parser_seuils("0.95:0.7") == (0.95, 0.7)
+    assert parser_seuils("0.5") == (0.5, 0.5)
+    with pytest.raises(ValueError):
+        parser_seuils("0.5:0.8")
+
+
+def test_reprise_et_revue(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    index = IndexSimilarite(str(tmp_path / "similarite.json"))
+
+    def executer(source: str):
+        (tmp_path / "these.tex").write_text(source, encoding="utf-8")
+        fournisseurs = FournisseursFactices()
+        pipeline = Pipeline(MODE_RAPIDE, {"scientifique": "claude", "style": "openai", "synthese": "claude"},
+                            fournisseurs=fournisseurs, similarite=index)
+        pipeline.executer("these.tex")
+        return fournisseurs.prompts, list(pipeline.stats.resultats), pipeline.stats.obtenir_rapport()
+
+    prompts, _, _ = executer(_manuscrit(_paragraphe(1)))
+    assert len(prompts) == 6 and len(index) == 2
+
+    # Même texte, annoté autrement : rien n'est renvoyé aux modèles
+    prompts, resultats, rapport = executer(_manuscrit(_paragraphe(1) + " % relu\n\\label{ch:methodes}"))
+    assert prompts == []
+    assert [r["reutilisation"]["type"] for r in resultats] == ["identique", "identique"]
+    assert resultats[0]["synthese"] == "Analyse 3"
+    assert rapport["sections_reutilisees"] == {"identique": 2}
+
+    # Trois phrases réécrites : revue des seules modifications, synthèse gardée
+    prompts, resultats, rapport = executer(_manuscrit(_paragraphe(1, modifiees=(4, 15, 22))))
+    assert len(prompts) == 2 and all("Modifications :" in prompt for prompt in prompts)
+    assert "+ Cette phrase 15 a été entièrement réécrite" in prompts[0]
+    assert "La mesure 1 numéro 10 " not in prompts[0]
+    assert resultats[0]["reutilisation"]["type"] == "revision"
+    assert resultats[0]["scientifique"].startswith("Analyse 1\n\nRévision")
+    assert rapport["sections_reutilisees"] == {"revision": 1, "identique": 1}
+
+    # L'index survit au processus
+    index.sauvegarder()
+    assert len(IndexSimilarite(str(tmp_path / "similarite.json"))) == 3
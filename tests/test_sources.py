@@ -0,0 +1,63 @@
+# ===============================================================
+# Tests de la lecture des sources (analyseur/sources.py)
+# ===============================================================
+
+import codecs
+
+import pytest
+
+from analyseur.sources import SEUIL_MMAP, TAILLE_ECHANTILLON, charger_source
+
+TEXTE = "\\section{Thèse}\nÉquations déjà vérifiées, où ça ?\n"
+
+
+def _ecrire(dossier, octets: bytes) -> str:
+    chemin = dossier / "source.tex"
+    chemin.write_bytes(octets)
+    return str(chemin)
+
+
+@pytest.mark.parametrize("encodage, attendu", [
+    ("utf-8", "utf-8"),
+    ("cp1252", "cp1252"),
+    ("utf-8-sig", "utf-8-sig"),
+    ("utf-16", "utf-16"),
+])
+def test_detection(tmp_path, encodage, attendu):
+    texte, detecte = charger_source(_ecrire(tmp_path, TEXTE.encode(encodage)))
+    assert (texte, detecte) == (TEXTE, attendu)
+
+
+def test_inputenc_et_fins_de_ligne(tmp_path):
+    source = "\\usepackage[latin1]{inputenc}\r\n" + TEXTE.replace("\n", "\r\n")
+    texte, encodage = charger_source(_ecrire(tmp_path, source.encode("latin-1")))
+    assert encodage == "latin-1"
+    assert texte == source.replace("\r\n", "\n")
+
+
+def test_inputenc_contredit_par_le_fichier(tmp_path):
+    # Déclaré utf8, mais écrit en cp1252 au-delà de l'échantillon
+    debut = "\\usepackage[utf8]{inputenc}\n" + "a" * TAILLE_ECHANTILLON
+    octets = debut.encode("ascii") + TEXTE.encode("cp1252")
+    texte, encodage = charger_source(_ecrire(tmp_path, octets))
+    assert encodage == "cp1252"
+    assert texte == debut + TEXTE
+
+
+def test_bom_utf8_contredit_par_le_fichier(tmp_path):
+    octets = codecs.BOM_UTF8 + b"texte " + TEXTE.encode("cp1252")
+    texte, encodage = charger_source(_ecrire(tmp_path, octets))
+    assert encodage == "cp1252"
+    assert texte == "texte " + TEXTE
+
+
+def test_grand_fichier_projete(tmp_path):
+    octets = b"mot " * (SEUIL_MMAP // 4) + TEXTE.encode("latin-1") + b"\x81"
+    texte, encodage = charger_source(_ecrire(tmp_path, octets))
+    assert encodage == "latin-1"
+    assert texte.endswith(TEXTE + "\x81")
+
+
+def test_encodage_impose_non_contourne(tmp_path):
+    with pytest.raises(UnicodeDecodeError):
+        charger_source(_ecrire(tmp_path, TEXTE.encode("cp1252")), "utf-8")
@@ -0,0 +1,106 @@
+# ===============================================================
+# Tests des spans et de leurs exports (analyseur/traces.py)
+# ===============================================================
+
+import io
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from analyseur.traces import Traceur
+
+
+def _run(traceur: Traceur):
+    run = traceur.ouvrir("run", mode="Normal")
+    with traceur.span("section", titre="Intro"):
+        with traceur.span("agent", tache="style") as agent:
+            with traceur.span("tentative", fournisseur="gemini", tentative=1) as tentative:
+                tentative.definir(jetons_entree=120, jetons_sortie=80)
+            agent.definir(bascule=False)
+    traceur.fermer(run)
+    return run
+
+
+def test_imbrication():
+    traceur = Traceur()
+    run = _run(traceur)
+    section, agent, tentative = traceur.spans[1:]
+    assert (section.parent, agent.parent, tentative.parent) == (run, section, agent)
+    assert tentative.attributs == {"fournisseur": "gemini", "tentative": 1,
+                                   "jetons_entree": 120, "jetons_sortie": 80}
+    assert all(span.fin is not None for span in traceur.spans)
+
+
+def test_parents_propres_a_chaque_fil():
+    traceur = Traceur()
+    run = traceur.ouvrir("run")
+
+    def section(numero):
+        with traceur.span("section", numero=numero):
+            with traceur.span("agent", numero=numero):
+                pass
+
+    fils = [threading.Thread(target=section, args=(n,)) for n in range(4)]
+    for fil in fils:
+        fil.start()
+    for fil in fils:
+        fil.join()
+    traceur.fermer(run)
+    for span in traceur.spans:
+        if span.nom == "agent":
+            assert span.parent.nom == "section" and span.parent.attributs == span.attributs
+            assert span.parent.parent is None     # le contexte d'un nouveau fil part de zéro
+
+
+def test_erreur_enregistree():
+    traceur = Traceur()
+    try:
+        with traceur.span("tentative"):
+            raise TimeoutError("délai dépassé")
+    except TimeoutError:
+        pass
+    assert traceur.spans[0].attributs["erreur"] == "TimeoutError: délai dépassé"
+
+
+def test_export_chrome():
+    traceur = Traceur()
+    _run(traceur)
+    flux = io.StringIO()
+    traceur.ecrire_chrome(flux)
+    evenements = json.loads(flux.getvalue())["traceEvents"]
+    complets = [e for e in evenements if e["ph"] == "X"]
+    assert [e["name"] for e in complets] == ["run", "section", "agent", "tentative"]
+    for parent, enfant in zip(complets, complets[1:]):
+        assert parent["ts"] <= enfant["ts"]
+        assert enfant["ts"] + enfant["dur"] <= parent["ts"] + parent["dur"] + 1e-3
+        assert enfant["args"]["parent"] == parent["args"]["span"]
+
+
+def test_envoi_otlp():
+    recu = []
+
+    class Collecteur(BaseHTTPRequestHandler):
+        def do_POST(self):
+            recu.append((self.path, json.loads(self.rfile.read(int(self.headers["Content-Length"])))))
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    serveur = HTTPServer(("127.0.0.1", 0), Collecteur)
+    fil = threading.Thread(target=serveur.handle_request)
+    fil.start()
+    traceur = Traceur("test")
+    _run(traceur)
+    traceur.envoyer_otlp(f"http://127.0.0.1:{serveur.server_port}/v1/traces")
+    fil.join()
+    serveur.server_close()
+
+    chemin, donnees = recu[0]
+    assert chemin == "/v1/traces"
+    spans = donnees["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    assert [s["name"] for s in spans] == ["run", "section", "agent", "tentative"]
+    assert len({s["traceId"] for s in spans}) == 1
+    assert spans[3]["parentSpanId"] == spans[2]["spanId"]
+    assert {"key": "jetons_entree", "value": {"intValue": "120"}} in spans[3]["attributes"]